@@ -1 +1,9 @@
 BASE_API = "api"
+
+# Maximum number of records of a CreateBatch/UpdateBatch request
+MAX_BATCH_SIZE = 1000
+# The whole batch is rejected when one record fails
+BATCH_MODE_ATOMIC = "atomic"
+# The records that fail are reported and the others are saved
+BATCH_MODE_BEST_EFFORT = "best_effort"
+BATCH_MODES = [BATCH_MODE_ATOMIC, BATCH_MODE_BEST_EFFORT]
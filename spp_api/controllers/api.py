@@ -11,12 +11,14 @@ import uuid
 
 import werkzeug
 
-from odoo import http
+from odoo import api, http
 from odoo.http import request
-from odoo.osv.expression import OR
+from odoo.osv.expression import AND, OR
+from odoo.tools import date_utils
 
 from odoo.addons.spp_base_api.lib.pinguin import error_response
 
+from ..config import BATCH_MODE_ATOMIC, BATCH_MODES, MAX_BATCH_SIZE
 from ..tools import datetime_format
 from . import pinguin
 from .pinguin import CODE__obj_not_found, successful_response
@@ -35,6 +37,8 @@ _logger = logging.getLogger(__name__)
 #################################################################
 
 API_ENDPOINT = "/api"
+# Number of records read at once by the streaming (NDJSON) mode of ReadMulti
+STREAM_CHUNK_SIZE = 1000
 
 
 def create_api_log(func):
@@ -73,12 +77,17 @@ def create_api_log(func):
         response = func(self, *args, **kwargs)
 
         # Response Log
-        json_response = json.loads(response.response[0])
-        reply_id = isinstance(json_response, dict) and json_response.get("reply_id", None) or self.get_reply_id()
         response_log_val = initial_val.copy()
         response_log_val["http_type"] = "response"
-        response_log_val["reply_id"] = reply_id
-        response_log_val["response_data"] = response.response[0].decode("utf-8")
+        if response.is_streamed:
+            # The body of a streamed response is not produced yet
+            response_log_val["reply_id"] = self.get_reply_id()
+            response_log_val["response_data"] = response.content_type
+        else:
+            json_response = json.loads(response.response[0])
+            reply_id = isinstance(json_response, dict) and json_response.get("reply_id", None) or self.get_reply_id()
+            response_log_val["reply_id"] = reply_id
+            response_log_val["response_data"] = response.response[0].decode("utf-8")
 
         request.env["spp_api.log"].create(response_log_val)
         del response_log_val
@@ -98,6 +107,8 @@ class ApiV1Controller(http.Controller):
         - `GET      .../<model>`               -> `ReadMulti`
         - `GET      .../<model>/<id>`          -> `ReadOne`
         - `DELETE   .../<model>/<id>`          -> `UnlinkOne`
+        - `POST     .../<model>/batch`         -> `CreateBatch`
+        - `PUT      .../<model>/batch`         -> `UpdateBatch`
 
         Auxiliary Methods:
         - `PATCH    .../<model>/<id>/<method>`               -> `Call Method on Singleton Record`
@@ -112,6 +123,8 @@ class ApiV1Controller(http.Controller):
     _api_endpoint_model = _api_endpoint + "/<model>"
     # ReadOne # UpdateOne # UnlinkOne
     _api_endpoint_model_id = _api_endpoint + "/<model>/<int:id>"
+    # CreateBatch # UpdateBatch
+    _api_endpoint_model_batch = _api_endpoint + "/<model>/batch"
     # Call Method on Singleton Record
     _api_endpoint_model_id_method = _api_endpoint + "/<model>/<int:id>/call/<method_name>"
     # Call Method on RecordSet
@@ -139,6 +152,96 @@ class ApiV1Controller(http.Controller):
 
         return records
 
+    def stream_records(self, path, records, kwargs):
+        """Stream all the records matching the search kwargs as NDJSON, one record per line.
+
+        The records are read by chunks of STREAM_CHUNK_SIZE ordered by id, each chunk starting after
+        the last id of the previous one, so the memory used does not depend on the number of records.
+        The body is produced after the request cursor is closed, so it is read with a new cursor.
+        """
+        registry = request.env.registry
+        uid = records.env.uid
+        context = dict(records.env.context)
+        model = records._name
+        path_id = path.id
+        domain = kwargs.get("domain") or []
+        fields = kwargs.get("fields")
+
+        def generate():
+            with registry.cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                stream_path = env["spp_api.path"].sudo().browse(path_id)
+                last_id = 0
+                while True:
+                    records_data = env[model].search_read(
+                        AND([domain, [("id", ">", last_id)]]),
+                        fields=fields,
+                        order="id",
+                        limit=STREAM_CHUNK_SIZE,
+                    )
+                    if not records_data:
+                        break
+                    last_id = records_data[-1]["id"]
+                    for record_data in stream_path._get_response_treatment(records_data):
+                        yield json.dumps(record_data, default=date_utils.json_default) + "\n"
+                    if len(records_data) < STREAM_CHUNK_SIZE:
+                        break
+                    # Drop the records read so far from the cache
+                    env.invalidate_all()
+
+        return werkzeug.wrappers.Response(
+            generate(),
+            status=200,
+            content_type="application/x-ndjson; charset=utf-8",
+            direct_passthrough=True,
+        )
+
+    def get_batch(self, kwargs):
+        """Return the records and the mode of a batch request.
+
+        They are read from the parameters, or from the JSON body of the request.
+        """
+        body = request.httprequest.get_json(silent=True) or {}
+        items = kwargs.pop("records", body.get("records"))
+        mode = kwargs.pop("mode", body.get("mode", BATCH_MODE_ATOMIC))
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise werkzeug.exceptions.HTTPException(
+                response=error_response(400, "Bad Request", "records must be a list of objects.")
+            )
+        if len(items) > MAX_BATCH_SIZE:
+            raise werkzeug.exceptions.HTTPException(
+                response=error_response(400, "Bad Request", f"records cannot contain more than {MAX_BATCH_SIZE} items.")
+            )
+        if mode not in BATCH_MODES:
+            raise werkzeug.exceptions.HTTPException(
+                response=error_response(400, "Bad Request", f"mode must be one of: {', '.join(BATCH_MODES)}")
+            )
+        return items, mode
+
+    def run_batch(self, cr, operations, mode):
+        """Run the operations of a batch and return the result of each one.
+
+        :param cr: The cursor the savepoints are created on.
+        :param list operations: One function per record, returning the id of the record it saved.
+        :param str mode: In atomic mode, all the operations are rolled back when one of them fails.
+        """
+        if mode == BATCH_MODE_ATOMIC:
+            try:
+                with cr.savepoint():
+                    ids = [operation() for operation in operations]
+            except Exception as e:
+                raise werkzeug.exceptions.HTTPException(response=error_response(400, "Batch rejected", str(e))) from e
+            return [{"index": index, "status": "ok", "id": id} for index, id in enumerate(ids)]
+
+        results = []
+        for index, operation in enumerate(operations):
+            try:
+                with cr.savepoint():
+                    results.append({"index": index, "status": "ok", "id": operation()})
+            except Exception as e:
+                results.append({"index": index, "status": "error", "error": str(e)})
+        return results
+
     def get_record(self, model, id, path, kwargs):
         records = self.get_records(model, kwargs)
         read_domain = path.eval_domain(path.filter_domain)
@@ -171,15 +274,58 @@ class ApiV1Controller(http.Controller):
 
         return successful_response(201, response)
 
+    # CreateBatch
+    @pinguin.route(_api_endpoint_model_batch, methods=["POST"], type="apijson", auth="none", csrf=False)
+    @create_api_log
+    def create_batch__POST(self, namespace, version, model, **kw):
+        path = kw.get("path")
+        del kw["path"]
+
+        items, mode = self.get_batch(kw)
+        records = self.get_records(path.model, kw)
+
+        try:
+            vals_list = [path.post_treatment_values(item) for item in items]
+            # Create all the records at once, one by one only to find which ones fail
+            with records.env.cr.savepoint():
+                results = [
+                    {"index": index, "status": "ok", "id": record.id}
+                    for index, record in enumerate(records.create(vals_list))
+                ]
+        except Exception as e:
+            if mode == BATCH_MODE_ATOMIC:
+                raise werkzeug.exceptions.HTTPException(response=error_response(400, "Batch rejected", str(e))) from e
+            results = self.run_batch(
+                records.env.cr,
+                [functools.partial(self._create_batch_item, path, records, item) for item in items],
+                mode,
+            )
+
+        response = {
+            "results": results,
+            "timestamp": datetime_format(datetime.datetime.now()),
+            "reply_id": self.get_reply_id(),
+        }
+
+        return successful_response(201, response)
+
+    def _create_batch_item(self, path, records, item):
+        return records.create(path.post_treatment_values(item)).id
+
     # ReadMulti (optional: filters, offset, limit, order, include_fields, exclude_fields):
     @pinguin.route(_api_endpoint_model, methods=["GET"], type="apijson", auth="none", csrf=False)
     @create_api_log
     def read_multi__GET(self, namespace, version, model, **kw):
         path = kw.get("path")
         del kw["path"]
+        # The query parameters that are not Python literals, like "false", are left as strings
+        stream = str(kw.pop("stream", "")).lower() in ("1", "true")
 
         kw = path.search_treatment_kwargs(kw)
         records = self.get_records(path.model, kw)
+        if stream:
+            # Export the whole filtered domain as NDJSON instead of one page
+            return self.stream_records(path, records, kw)
         records_data = records.search_read(**kw)
         records_all = records.search_count(kw.get("domain"))
         records_data = path._get_response_treatment(records_data)
@@ -235,6 +381,42 @@ class ApiV1Controller(http.Controller):
 
         return successful_response(200, response)
 
+    # UpdateBatch
+    @pinguin.route(_api_endpoint_model_batch, methods=["PUT"], type="apijson", auth="none", csrf=False)
+    @create_api_log
+    def update_batch__PUT(self, namespace, version, model, **kw):
+        path = kw.get("path")
+        del kw["path"]
+
+        items, mode = self.get_batch(kw)
+        records = self.get_records(path.model, kw)
+
+        # Find all the records of the batch allowed by the path at once
+        ids = [item.get("id") for item in items if isinstance(item.get("id"), int)]
+        domain = AND([path.eval_domain(path.filter_domain), [("id", "in", ids)]])
+        objs = {obj.id: obj for obj in records.search(domain)}
+
+        results = self.run_batch(
+            records.env.cr,
+            [functools.partial(self._update_batch_item, path, objs, item) for item in items],
+            mode,
+        )
+
+        response = {
+            "results": results,
+            "timestamp": datetime_format(datetime.datetime.now()),
+            "reply_id": self.get_reply_id(),
+        }
+
+        return successful_response(200, response)
+
+    def _update_batch_item(self, path, objs, item):
+        obj = objs.get(item.get("id"))
+        if not obj:
+            raise werkzeug.exceptions.NotFound(CODE__obj_not_found[2])
+        obj.write(path.post_treatment_values(item))
+        return obj.id
+
     # UnlinkOne
     @pinguin.route(_api_endpoint_model_id, methods=["DELETE"], type="apijson", auth="none", csrf=False)
     @create_api_log
@@ -33,4 +33,7 @@ class ApiJsonRequest(Dispatcher):
         else:
             result = endpoint(**self.request.params)
 
+        # Streamed responses (NDJSON exports) are written as they are produced
+        if result.is_streamed:
+            return result
         return self.request.make_json_response(result.json, status=result.status)
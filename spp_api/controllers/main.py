@@ -10,7 +10,6 @@ import werkzeug
 
 from odoo import http
 from odoo.http import request
-from odoo.tools import date_utils
 
 from odoo.addons.web.controllers.utils import ensure_db
 
@@ -90,6 +89,10 @@ class OAS(http.Controller):
         if namespace.token != kwargs.get("token"):
             raise werkzeug.exceptions.Forbidden()
 
+        oas_json, etag = namespace.get_oas_json(version)
+        if http.request.httprequest.if_none_match.contains(etag):
+            return self._not_modified_response(etag)
+
         response_params = {"headers": [("Content-Type", "application/json")]}
         if "download" in kwargs:
             response_params = {
@@ -100,9 +103,9 @@ class OAS(http.Controller):
                 "direct_passthrough": True,
             }
 
-        return werkzeug.wrappers.Response(
-            json.dumps(namespace.get_oas(version), default=date_utils.json_default), status=200, **response_params
-        )
+        response = werkzeug.wrappers.Response(oas_json, status=200, **response_params)
+        self._set_cache_headers(response, etag)
+        return response
 
     @http.route(
         "/" + BASE_API + "/swagger-doc/<namespace_name>/<version>",
@@ -121,8 +124,23 @@ class OAS(http.Controller):
             raise werkzeug.exceptions.NotFound()
         if namespace.token != kwargs.get("token"):
             raise werkzeug.exceptions.Forbidden()
-        namespace_oas_data = json.dumps(namespace.get_oas(version), default=date_utils.json_default)
+        namespace_oas_data, etag = namespace.get_oas_json(version)
+        if http.request.httprequest.if_none_match.contains(etag):
+            return self._not_modified_response(etag)
+
         html_template_dir = join(dirname(dirname(realpath(__file__))), "templates")
         with open(join(html_template_dir, "index.html")) as file:
             return_html = file.read() % namespace_oas_data
-        return werkzeug.wrappers.Response(return_html, status=200, mimetype="text/html")
+        response = werkzeug.wrappers.Response(return_html, status=200, mimetype="text/html")
+        self._set_cache_headers(response, etag)
+        return response
+
+    def _set_cache_headers(self, response, etag):
+        # Clients may keep the document but must check it is still current
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+
+    def _not_modified_response(self, etag):
+        response = werkzeug.wrappers.Response(status=304)
+        self._set_cache_headers(response, etag)
+        return response
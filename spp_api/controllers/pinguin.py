@@ -146,8 +146,9 @@ def authenticate_token_for_user(token):
     :raise: werkzeug.exceptions.HTTPException if user not found.
     """
     _logger.info("authenticate_token_for_user: %s", token)
-    user = request.env["res.users"].sudo().search([("openapi_token", "=", token)])
-    if user.exists():
+    user_id = request.env["res.users"].sudo()._get_openapi_token_user_id(token)
+    user = request.env["res.users"].sudo().browse(user_id)
+    if user_id:
         # copy-pasted from odoo.http.py:OpenERPSession.authenticate()
         request.session.uid = user.id
         request.session.login = user.login
@@ -287,14 +288,8 @@ def get_openapi_path(namespace, version, model, method_name):
 
     # TODO: Handle custom functions
 
-    domain_path = [
-        ("namespace_id.name", "=", namespace),
-        ("namespace_id.version_name", "=", version),
-        ("name", "=", model),
-        ("method", "=", http_method),
-    ]
-    _logger.info("get_openapi_path: %s", domain_path)
-    path = request.env["spp_api.path"].sudo().search(domain_path, limit=1)
+    path_model = request.env["spp_api.path"].sudo()
+    path = path_model.browse(path_model._get_path_id(namespace, version, model, http_method))
 
     _logger.info("get_openapi_path: %s", path)
     if not path:
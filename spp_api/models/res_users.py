@@ -3,7 +3,7 @@
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
 import uuid
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 
 
 class ResUsers(models.Model):
@@ -18,6 +18,33 @@ class ResUsers(models.Model):
         help="Authentication token for access to API (/api).",
     )
 
+    # Fields changing the user returned for an OpenAPI token
+    OPENAPI_TOKEN_FIELDS = {"openapi_token", "active"}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        users = super().create(vals_list)
+        if any(self.OPENAPI_TOKEN_FIELDS & set(vals) for vals in vals_list):
+            self.env.registry.clear_cache()
+        return users
+
+    def write(self, vals):
+        res = super().write(vals)
+        if self.OPENAPI_TOKEN_FIELDS & set(vals):
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache("token")
+    def _get_openapi_token_user_id(self, token):
+        """Return the id of the active user owning the OpenAPI token, cached per worker."""
+        return self.sudo().search([("openapi_token", "=", token)], limit=1).id or None
+
     def reset_openapi_token(self):
         for record in self:
             record.write({"openapi_token": self._get_unique_openapi_token()})
@@ -22,6 +22,22 @@ class SPPAPIField(models.Model):
     required = fields.Boolean()
     default_value = fields.Char()
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        res = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return res
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
     @api.onchange("field_id")
     def on_field_id_change(self):
         self.required = self.field_id.required
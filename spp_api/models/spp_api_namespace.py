@@ -5,14 +5,19 @@
 # Copyright 2021 Denis Mudarisov <https://github.com/trojikman>
 # License LGPL-3.0 or later (http://www.gnu.org/licenses/lgpl.html).
 import collections
+import hashlib
+import json
 import logging
 import urllib.parse as urlparse
 import uuid
 
-from odoo import api, fields, models
+from odoo import api, fields, models, tools
+from odoo.tools import date_utils
 
 from odoo.addons.spp_base_api.lib import pinguin
 
+from ..tools import get_ormcache_stats
+
 _logger = logging.getLogger(__name__)
 
 
@@ -91,11 +96,39 @@ class Namespace(models.Model):
     @api.model
     def create(self, vals):
         vals = self._fix_name(vals)
-        return super().create(vals)
+        res = super().create(vals)
+        self.env.registry.clear_cache()
+        return res
 
     def write(self, vals):
         vals = self._fix_name(vals)
-        return super().write(vals)
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    def get_api_cache_stats(self):
+        """Return the hit and miss counters of the token and path caches of the API router."""
+        return {
+            "token_user": get_ormcache_stats(self.env["res.users"], "_get_openapi_token_user_id"),
+            "path": get_ormcache_stats(self.env["spp_api.path"], "_get_path_id"),
+        }
+
+    @tools.ormcache("self.id", "version")
+    def get_oas_json(self, version):
+        """
+        Return the OAS document of the namespace as JSON, with its ETag.
+
+        The document is cached per worker until the namespace, its paths, their fields, aliases or
+        function parameters change.
+        """
+        oas_json = json.dumps(self.get_oas(version), default=date_utils.json_default)
+        return oas_json, hashlib.sha256(oas_json.encode()).hexdigest()
 
     def get_oas(self, version):
         current_host = self.env["ir.config_parameter"].sudo().get_param("web.base.url")
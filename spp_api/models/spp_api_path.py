@@ -1,12 +1,11 @@
 import logging
+from copy import deepcopy
 
-# from copy import deepcopy
-from datetime import date, datetime
-
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import ValidationError
 from odoo.tools import safe_eval
 
+from ..config import BATCH_MODE_ATOMIC, BATCH_MODES, MAX_BATCH_SIZE
 from ..tools import datetime_format
 
 # Field type mapping for Swagger
@@ -31,6 +30,31 @@ SWAGGER_FIELD_MAPPING = {
 
 MAX_LIMIT = 500
 
+# Transformations applied to the values of the fields in responses
+RESPONSE_KEEP = "keep"
+RESPONSE_VARCHAR = "varchar"
+RESPONSE_X2MANY = "x2many"
+RESPONSE_NULL = "null"
+RESPONSE_DATETIME = "datetime"
+RESPONSE_MANY2ONE = "many2one"
+RESPONSE_TRANSFORMATIONS = {
+    "char": RESPONSE_VARCHAR,
+    "text": RESPONSE_VARCHAR,
+    "html": RESPONSE_VARCHAR,
+    "selection": RESPONSE_VARCHAR,
+    "reference": RESPONSE_VARCHAR,
+    "one2many": RESPONSE_X2MANY,
+    "many2many": RESPONSE_X2MANY,
+    "date": RESPONSE_NULL,
+    "binary": RESPONSE_NULL,
+    "integer": RESPONSE_NULL,
+    "float": RESPONSE_NULL,
+    "monetary": RESPONSE_NULL,
+    "datetime": RESPONSE_DATETIME,
+    "many2one": RESPONSE_MANY2ONE,
+    "many2one_reference": RESPONSE_MANY2ONE,
+}
+
 _logger = logging.getLogger(__name__)
 
 
@@ -145,11 +169,32 @@ class SPPAPIPath(models.Model):
     @api.model
     def create(self, values):
         self._update_values(values)
-        return super().create(values)
+        res = super().create(values)
+        self.env.registry.clear_cache()
+        return res
 
     def write(self, values):
         self._update_values(values)
-        return super().write(values)
+        res = super().write(values)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache("namespace", "version", "model", "method")
+    def _get_path_id(self, namespace, version, model, method):
+        """Return the id of the path serving `method` on `model` in the namespace version, cached per worker."""
+        domain = [
+            ("namespace_id.name", "=", namespace),
+            ("namespace_id.version_name", "=", version),
+            ("name", "=", model),
+            ("method", "=", method),
+        ]
+        return self.sudo().search(domain, limit=1).id or None
 
     def get_oas_part(self):
         self = self.sudo()
@@ -277,6 +322,9 @@ class SPPAPIPath(models.Model):
             post_path = f"/{self.name}"
             if post_path not in swagger_paths:
                 swagger_paths.setdefault(post_path, {})
+            swagger_paths[f"/{self.name}/batch"] = {
+                "post": self._get_oas_batch_values(values, "201", _("Result of the creation of each record.")),
+            }
             # Create element
             definition = {
                 "description": _("Identifier of the resource created."),
@@ -308,6 +356,9 @@ class SPPAPIPath(models.Model):
             put_path = "/{}/{}".format(self.name, "{Id}")
             if put_path not in swagger_paths:
                 swagger_paths.setdefault(put_path, {})
+            swagger_paths[f"/{self.name}/batch"] = {
+                "put": self._get_oas_batch_values(values, "200", _("Result of the update of each record.")),
+            }
             # Update element
             definition = {
                 "description": _("Return a boolean if update is a success."),
@@ -538,6 +589,26 @@ class SPPAPIPath(models.Model):
             "type": "integer",
         }
 
+    def _stream_parameter(self):
+        """
+        Generates a dictionary containing the information of the 'stream'
+        parameter used in the API.
+
+        :return: A dictionary with the 'stream' parameter information.
+        :rtype: dict
+        """
+        self.ensure_one()
+        return {
+            "name": "stream",
+            "in": "query",
+            "description": _(
+                "Return all the records matching the domain as NDJSON (one JSON object per line) "
+                "instead of one page. Offset and limit are ignored."
+            ),
+            "required": False,
+            "type": "boolean",
+        }
+
     def _order_parameter(self):
         """
         Generates a dictionary containing the information of the 'order'
@@ -600,6 +671,7 @@ class SPPAPIPath(models.Model):
             self._offset_parameter(),
             self._limit_parameter(),
             self._order_parameter(),
+            self._stream_parameter(),
             self._context_parameter(),
         ]
 
@@ -794,6 +866,105 @@ class SPPAPIPath(models.Model):
             ]
         )
 
+    # Batch
+    def _get_oas_batch_values(self, values, code, description):
+        """
+        Generates the operation of the CreateBatch/UpdateBatch endpoint from
+        the default values of the path operations.
+
+        :param values: The default values of the path operations.
+        :param code: The HTTP status code of a successful response.
+        :param description: The description of the successful response.
+        :return: A dictionary with the batch operation.
+        :rtype: dict
+        """
+        self.ensure_one()
+        batch_values = deepcopy(values)
+        responses = batch_values["responses"]
+        del responses["200"]
+        responses[code] = {
+            "description": description,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "results": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "index": {"type": "integer"},
+                                "status": {"type": "string", "enum": ["ok", "error"]},
+                                "id": {"type": "integer"},
+                                "error": {"type": "string"},
+                            },
+                        },
+                    },
+                    "reply_id": {
+                        "type": "string",
+                    },
+                    "timestamp": {
+                        "type": "string",
+                    },
+                },
+            },
+        }
+        responses["400"] = {
+            "description": "Bad request",
+            "schema": {"$ref": "#/definitions/ApiErrorResponse"},
+        }
+        batch_values.update(
+            consumes=["application/json"],
+            parameters=self._batch_parameters(),
+        )
+        return batch_values
+
+    def _batch_parameters(self):
+        self.ensure_one()
+        item_properties = {}
+        item_required = []
+        if self.method == "put":
+            item_properties["id"] = {"type": "integer", "description": "ID"}
+            item_required.append("id")
+        for values in self._post_properties():
+            field_name = values.pop("name")
+            values.pop("in")
+            if values.pop("required"):
+                item_required.append(field_name)
+            item_properties[field_name] = values
+        item = {"type": "object", "properties": item_properties}
+        if item_required:
+            item["required"] = item_required
+        body = {
+            "name": "body",
+            "in": "body",
+            "required": True,
+            "schema": {
+                "type": "object",
+                "required": ["records"],
+                "properties": {
+                    "records": {
+                        "type": "array",
+                        "maxItems": MAX_BATCH_SIZE,
+                        "items": item,
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": BATCH_MODES,
+                        "default": BATCH_MODE_ATOMIC,
+                        "description": _(
+                            "atomic: the whole batch is rejected when one record fails. "
+                            "best_effort: the records that fail are reported and the others are saved."
+                        ),
+                    },
+                },
+            },
+        }
+        return [
+            body,
+            self._request_id_parameter(),
+            self._context_parameter(),
+        ]
+
     # Delete
     def _delete_parameters(self):
         self.ensure_one()
@@ -995,20 +1166,49 @@ class SPPAPIPath(models.Model):
             )
         return field_alias
 
+    @tools.ormcache("self.id")
+    def _get_response_plan(self):
+        """
+        Compile how each field of the path model is transformed in responses.
+
+        :return: a dictionary mapping each field name to a tuple (output key, transformation)
+        """
+        self.ensure_one()
+        # The first alias of a field wins, path aliases are ordered before global ones
+        aliases = {}
+        for field_alias in self.env["spp_api.field.alias"].sudo().search(self._get_related_field_alias_domain()):
+            aliases.setdefault(field_alias.field_id.name, field_alias.alias_name)
+
+        plan = {}
+        for name, field in self.env[self.model]._fields.items():
+            transformation = RESPONSE_TRANSFORMATIONS.get(field.type, RESPONSE_KEEP)
+            plan[name] = (aliases.get(name, name), transformation)
+        return plan
+
     def _get_response_treatment(self, response_data):
         if isinstance(response_data, dict):
             response_data = [response_data]
         self.ensure_one()
-        field_aliases = self.env["spp_api.field.alias"].sudo().search(self._get_related_field_alias_domain())
+        plan = self._get_response_plan()
+        result = []
         for element in response_data:
-            self._format_datetime(element)
-            self._adjust_null_value_fields(element)
-            self._adjust_many2one_fields(element)
-            for field_alias in field_aliases:
-                if field_alias.field_id.name not in element.keys():
-                    continue
-                element[field_alias.alias_name] = element.pop(field_alias.field_id.name)
-        return response_data
+            row = {}
+            for key, value in element.items():
+                output_key, transformation = plan.get(key, (key, RESPONSE_KEEP))
+                if not value:
+                    if transformation == RESPONSE_VARCHAR:
+                        value = ""
+                    elif transformation == RESPONSE_X2MANY:
+                        value = []
+                    elif transformation != RESPONSE_KEEP:
+                        value = None
+                elif transformation == RESPONSE_DATETIME:
+                    value = datetime_format(value)
+                elif transformation == RESPONSE_MANY2ONE and type(value) in (list, tuple) and len(value) == 2:
+                    value = value[0]
+                row[output_key] = value
+            result.append(row)
+        return result
 
     def _fields_alias_treatment(self, post_values):
         res = {}
@@ -1028,46 +1228,3 @@ class SPPAPIPath(models.Model):
                 res[key] = value
 
         return res
-
-    @api.model
-    def _format_datetime(self, element):
-        for key in element:
-            if not isinstance(element[key], date) or not isinstance(element[key], datetime):
-                continue
-            element[key] = datetime_format(element[key])
-
-    def _adjust_null_value_fields(self, element):
-        VARCHAR_TYPES = ["char", "text", "html", "selection", "reference"]
-        NULL_TYPES = [
-            "date",
-            "datetime",
-            "binary",
-            "many2one",
-            "many2one_reference",
-            "integer",
-            "float",
-            "monetary",
-        ]
-        X_TO_MANY_TYPES = ["one2many", "many2many"]
-
-        model_sudo = self.env[self.model].sudo()
-        for key in element:
-            if element[key]:
-                continue
-            field_type = model_sudo._fields[key].type
-            if field_type == "boolean":
-                continue
-            if field_type in VARCHAR_TYPES:
-                element[key] = ""
-            if field_type in X_TO_MANY_TYPES:
-                element[key] = []
-            if field_type in NULL_TYPES:
-                element[key] = None
-
-    def _adjust_many2one_fields(self, element):
-        model_sudo = self.env[self.model].sudo()
-        for key in element:
-            if model_sudo._fields[key].type not in ("many2one", "many2one_reference"):
-                continue
-            if element[key] and type(element[key]) in (list, tuple) and len(element[key]) == 2:
-                element[key] = element[key][0]
@@ -8,3 +8,4 @@ from . import test_spp_api_fields
 from . import test_spp_api_log
 from . import test_spp_api_namespace
 from . import common
+from . import test_api_controller
@@ -0,0 +1,180 @@
+import inspect
+import json
+from unittest.mock import patch
+
+from werkzeug.exceptions import HTTPException
+
+from ..controllers.api import MAX_BATCH_SIZE, ApiV1Controller
+from .common import Common
+
+
+class TestApiController(Common):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.controller = ApiV1Controller()
+        cls.get_path = cls.env["spp_api.path"].create(
+            {
+                "name": "res.partner",
+                "model_id": cls.env.ref("base.model_res_partner").id,
+                "namespace_id": cls.namespace_id.id,
+                "description": "GET res.partner",
+                "method": "get",
+                "field_ids": [(6, 0, [cls.env.ref("base.field_res_partner__name").id])],
+            }
+        )
+        write_paths = {}
+        for method in ("post", "put"):
+            write_paths[method] = cls.env["spp_api.path"].create(
+                {
+                    "name": "res.partner",
+                    "model_id": cls.env.ref("base.model_res_partner").id,
+                    "namespace_id": cls.namespace_id.id,
+                    "description": f"{method.upper()} res.partner",
+                    "method": method,
+                    "api_field_ids": [
+                        (0, 0, {"field_id": cls.env.ref("base.field_res_partner__name").id}),
+                        (0, 0, {"field_id": cls.env.ref("base.field_res_partner__type").id}),
+                    ],
+                }
+            )
+        cls.post_path = write_paths["post"]
+        cls.put_path = write_paths["put"]
+        cls.partners = cls.env["res.partner"].create([{"name": "API Controller [TEST]"} for _i in range(3)])
+
+    def setUp(self):
+        super().setUp()
+        # Let the streamed responses read the test data with their own cursor
+        self.registry.enter_test_mode(self.cr)
+        self.addCleanup(self.registry.leave_test_mode)
+        request_patcher = patch("odoo.addons.spp_api.controllers.api.request")
+        self.request = request_patcher.start()
+        self.addCleanup(request_patcher.stop)
+        self.request.env = self.env
+
+    def call(self, method, body=None, **kw):
+        """Call a controller method without its routing, authentication and logging"""
+        self.request.httprequest.get_json.return_value = body
+        return inspect.unwrap(getattr(ApiV1Controller, method))(
+            self.controller, self.namespace_id.name, self.namespace_id.version_name, "res.partner", **kw
+        )
+
+    def test_01_read_multi_stream(self):
+        for stream in ("1", 1, "true", True, "True"):
+            response = self.call("read_multi__GET", path=self.get_path, name="API Controller [TEST]", stream=stream)
+            self.assertEqual(response.content_type, "application/x-ndjson; charset=utf-8")
+            lines = "".join(response.response).splitlines()
+            self.assertEqual([json.loads(line)["id"] for line in lines], self.partners.ids)
+
+    def test_02_read_multi_no_stream(self):
+        for stream in ("0", 0, "false", False, "False", ""):
+            response = self.call("read_multi__GET", path=self.get_path, name="API Controller [TEST]", stream=stream)
+            self.assertEqual(response.content_type, "application/json; charset=utf-8")
+            data = json.loads(response.get_data())
+            self.assertEqual(data["count"], 3)
+            self.assertEqual(sorted(result["id"] for result in data["results"]), self.partners.ids)
+
+    def assertBadRequest(self, method, body, path):
+        with self.assertRaises(HTTPException) as error:
+            self.call(method, body=body, path=path)
+        self.assertEqual(error.exception.response.status_code, 400)
+        return json.loads(error.exception.response.get_data())
+
+    def test_03_create_batch_atomic(self):
+        body = {"records": [{"name": "Batch 1 [TEST]"}, {"name": "Batch 2 [TEST]", "type": "other"}]}
+        response = self.call("create_batch__POST", body=body, path=self.post_path)
+        self.assertEqual(response.status_code, 201)
+        results = json.loads(response.get_data())["results"]
+        self.assertEqual([result["status"] for result in results], ["ok", "ok"])
+        partners = self.env["res.partner"].browse([result["id"] for result in results])
+        self.assertEqual(partners.mapped("name"), ["Batch 1 [TEST]", "Batch 2 [TEST]"])
+
+        # One invalid record rolls back the whole batch
+        body = {"records": [{"name": "Batch 3 [TEST]"}, {"name": "Batch 4 [TEST]", "type": "wrong"}]}
+        data = self.assertBadRequest("create_batch__POST", body, self.post_path)
+        self.assertEqual(data["error"], "Batch rejected")
+        self.assertFalse(self.env["res.partner"].search([("name", "in", ["Batch 3 [TEST]", "Batch 4 [TEST]"])]))
+
+    def test_04_create_batch_best_effort(self):
+        body = {
+            "mode": "best_effort",
+            "records": [{"name": "Batch 1 [TEST]"}, {"name": "Batch 2 [TEST]", "type": "wrong"}],
+        }
+        response = self.call("create_batch__POST", body=body, path=self.post_path)
+        self.assertEqual(response.status_code, 201)
+        results = json.loads(response.get_data())["results"]
+        self.assertEqual([result["status"] for result in results], ["ok", "error"])
+        self.assertEqual(results[1]["index"], 1)
+        self.assertTrue(results[1]["error"])
+        self.assertEqual(self.env["res.partner"].browse(results[0]["id"]).name, "Batch 1 [TEST]")
+        self.assertFalse(self.env["res.partner"].search([("name", "=", "Batch 2 [TEST]")]))
+
+    def test_05_update_batch_atomic(self):
+        partner_1, partner_2 = self.partners[:2]
+        body = {"records": [{"id": partner_1.id, "name": "Updated 1 [TEST]"}, {"id": 0, "name": "Updated 2 [TEST]"}]}
+        data = self.assertBadRequest("update_batch__PUT", body, self.put_path)
+        self.assertEqual(data["error"], "Batch rejected")
+        self.assertEqual(partner_1.name, "API Controller [TEST]")
+
+        body["records"][1]["id"] = partner_2.id
+        response = self.call("update_batch__PUT", body=body, path=self.put_path)
+        self.assertEqual(response.status_code, 200)
+        results = json.loads(response.get_data())["results"]
+        self.assertEqual([result["id"] for result in results], [partner_1.id, partner_2.id])
+        self.assertEqual((partner_1 | partner_2).mapped("name"), ["Updated 1 [TEST]", "Updated 2 [TEST]"])
+
+    def test_06_update_batch_best_effort(self):
+        partner_1, partner_2 = self.partners[:2]
+        body = {
+            "mode": "best_effort",
+            "records": [
+                {"id": partner_1.id, "name": "Updated 1 [TEST]"},
+                {"id": partner_2.id, "type": "wrong"},
+                {"id": 0, "name": "Updated 3 [TEST]"},
+            ],
+        }
+        response = self.call("update_batch__PUT", body=body, path=self.put_path)
+        results = json.loads(response.get_data())["results"]
+        self.assertEqual([result["status"] for result in results], ["ok", "error", "error"])
+        self.assertEqual(partner_1.name, "Updated 1 [TEST]")
+        self.assertEqual(partner_2.type, "contact")
+
+    def test_07_batch_invalid_request(self):
+        for method, path in (("create_batch__POST", self.post_path), ("update_batch__PUT", self.put_path)):
+            # Empty or malformed body
+            for body in (None, {}, {"records": "wrong"}, {"records": [1, 2]}, {"records": {"name": "Wrong"}}):
+                data = self.assertBadRequest(method, body, path)
+                self.assertEqual(data["error_description"], "records must be a list of objects.")
+            # Unknown mode
+            data = self.assertBadRequest(method, {"records": [], "mode": "wrong"}, path)
+            self.assertIn("mode must be one of", data["error_description"])
+            # Batch size limit
+            data = self.assertBadRequest(method, {"records": [{}] * (MAX_BATCH_SIZE + 1)}, path)
+            self.assertIn(str(MAX_BATCH_SIZE), data["error_description"])
+            # An empty batch does nothing
+            response = self.call(method, body={"records": []}, path=path)
+            self.assertEqual(json.loads(response.get_data())["results"], [])
+
+    def test_08_oas_batch_paths(self):
+        oas_json, _etag = self.namespace_id.get_oas_json(self.namespace_id.version_name)
+        batch_path = json.loads(oas_json)["paths"]["/res.partner/batch"]
+        self.assertEqual(set(batch_path), {"post", "put"})
+        for method, code in (("post", "201"), ("put", "200")):
+            operation = batch_path[method]
+            self.assertEqual(operation["consumes"], ["application/json"])
+            self.assertIn("results", operation["responses"][code]["schema"]["properties"])
+            self.assertIn("400", operation["responses"])
+            body = next(parameter for parameter in operation["parameters"] if parameter["in"] == "body")
+            properties = body["schema"]["properties"]
+            self.assertEqual(properties["records"]["maxItems"], MAX_BATCH_SIZE)
+            self.assertEqual(properties["mode"]["enum"], ["atomic", "best_effort"])
+            self.assertTrue({"name", "type"} <= set(properties["records"]["items"]["properties"]))
+        put_item = batch_path["put"]["parameters"][0]["schema"]["properties"]["records"]["items"]
+        self.assertIn("id", put_item["required"])
+        post_item = batch_path["post"]["parameters"][0]["schema"]["properties"]["records"]["items"]
+        self.assertNotIn("id", post_item["properties"])
+
+        # The single record paths are unchanged
+        paths = self.post_path.get_oas_paths_part()
+        self.assertIn("200", paths["/res.partner"]["post"]["responses"])
+        self.assertNotIn("201", paths["/res.partner"]["post"]["responses"])
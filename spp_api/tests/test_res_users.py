@@ -36,3 +36,18 @@ class TestResUser(TransactionCase):
         self.env["res.users"].reset_all_openapi_tokens()
 
         self.assertIsNotNone(self.user.openapi_token)
+
+    def test_04_openapi_token_user_cache(self):
+        users = self.env["res.users"]
+        token = self.user.openapi_token
+        self.assertEqual(users._get_openapi_token_user_id(token), self.user.id)
+
+        stats = self.env["spp_api.namespace"].get_api_cache_stats()["token_user"]
+        with self.assertQueryCount(0):
+            self.assertEqual(users._get_openapi_token_user_id(token), self.user.id)
+        new_stats = self.env["spp_api.namespace"].get_api_cache_stats()["token_user"]
+        self.assertEqual(new_stats["hit"], stats["hit"] + 1)
+
+        self.user.reset_openapi_token()
+        self.assertIsNone(users._get_openapi_token_user_id(token))
+        self.assertEqual(users._get_openapi_token_user_id(self.user.openapi_token), self.user.id)
@@ -101,3 +101,17 @@ class TestSppApiFieldPath(Common):
                 "2023-11-13 13:12:00",
                 "Get values should be treated correctly!",
             )
+
+    def test_06_get_response_treatment_plan(self):
+        res = self.test_get_path._get_response_treatment(
+            [{"name": False, "parent_id": (1, "Parent"), "child_ids": False, "active": False, "write_date": False}]
+        )
+        self.assertEqual(
+            res,
+            [{"name": "", "parent_id": 1, "child_ids": [], "active": False, "last_updated": None}],
+            "Get values should be treated correctly!",
+        )
+
+        self.test_get_field_alias.write({"alias_name": "modified_at"})
+        res = self.test_get_path._get_response_treatment({"write_date": False})
+        self.assertEqual(res, [{"modified_at": None}], "Alias changes should invalidate the response plan!")
@@ -1,3 +1,5 @@
+import json
+
 from odoo import fields
 from odoo.tests import TransactionCase
 
@@ -155,3 +157,23 @@ class TestSppApiNamespace(TransactionCase):
                 out = out.replace("DEBUG:odoo.addons.spp_api.models.spp_api_namespace:", "")
                 output.append(out.split(":", 1)[0])
             self.assertEqual(output, ["path", "OAS_part_for_model", "spec"] * 5)
+
+    def test_09_get_oas_json_cache(self):
+        version = self._namespace.version_name
+        oas_json, etag = self._namespace.get_oas_json(version)
+        self.assertEqual(json.loads(oas_json)["basePath"], "/api/test/v1")
+        with self.assertQueryCount(0):
+            self.assertEqual(self._namespace.get_oas_json(version), (oas_json, etag))
+
+        self.env["spp_api.path"].create(
+            {
+                "name": "res.partner",
+                "model_id": self.env.ref("base.model_res_partner").id,
+                "namespace_id": self._namespace.id,
+                "description": "DELETE res.partner",
+                "method": "delete",
+            }
+        )
+        new_oas_json, new_etag = self._namespace.get_oas_json(version)
+        self.assertNotEqual(new_etag, etag)
+        self.assertIn("/res.partner/{Id}", json.loads(new_oas_json)["paths"])
@@ -1,7 +1,16 @@
 from datetime import date, datetime
 
+from odoo.tools.cache import STAT
+
 
 def datetime_format(inp):
     if not isinstance(inp, datetime) or not isinstance(inp, date):
         return inp
     return inp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def get_ormcache_stats(model, method_name):
+    """Return the hit and miss counters of an ormcached method of `model` in the current database."""
+    method = getattr(type(model), method_name).__cache__.method
+    counter = STAT[(model.pool.db_name, model._name, method)]
+    return {"hit": counter.hit, "miss": counter.miss}
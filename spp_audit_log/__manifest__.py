@@ -14,6 +14,7 @@
     "data": [
         "security/audit_log_security.xml",
         "security/ir.model.access.csv",
+        "data/ir_cron.xml",
         "views/spp_audit_rule_views.xml",
         "views/spp_audit_log_views.xml",
     ],
@@ -1,3 +1,4 @@
 from . import spp_audit_rule
 from . import spp_audit_log
+from . import spp_audit_log_buffer
 from . import group
@@ -0,0 +1,137 @@
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# Key of the advisory lock making sure a single transaction drains the buffer at a time
+BUFFER_LOCK_KEY = 1908202401
+
+
+class AuditValuesEncoder(json.JSONEncoder):
+    """JSON encoder of the buffered values, keeping the dates and datetimes as such"""
+
+    def default(self, o):
+        if isinstance(o, datetime):
+            return {"__datetime__": o.isoformat()}
+        if isinstance(o, date):
+            return {"__date__": o.isoformat()}
+        if isinstance(o, Decimal):
+            return float(o)
+        if isinstance(o, bytes):
+            return o.decode(errors="replace")
+        # Any other value is logged as text, it is never evaluated
+        return str(o)
+
+
+def _decode_value(obj):
+    if len(obj) == 1:
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+def dump_values(values):
+    return json.dumps(values, cls=AuditValuesEncoder)
+
+
+def load_values(values):
+    return json.loads(values, object_hook=_decode_value) if values else None
+
+
+class SppAuditLogBuffer(models.Model):
+    """
+    Audit entries of the rules logging asynchronously.
+
+    The entries are appended with plain INSERTs in the transaction of the audited operation, so
+    they are committed (or rolled back) with it. :meth:`process_buffer` turns them into
+    spp.audit.log records in id order and deletes them in the same transaction, so every entry
+    is logged exactly once and the entries of a record keep their order.
+    """
+
+    _name = "spp.audit.log.buffer"
+    _description = "SPP Audit Log Buffer"
+    _order = "id"
+    _log_access = False
+
+    rule_id = fields.Many2one("spp.audit.rule", required=True, ondelete="cascade")
+    user_id = fields.Many2one("res.users", required=True, ondelete="cascade")
+    method = fields.Char(required=True)
+    # Time of the audited operation, used as the creation date of its audit logs
+    change_date = fields.Datetime(required=True)
+    old_values = fields.Text()
+    new_values = fields.Text()
+
+    BATCH_SIZE = 1000
+    # Maximum number of entries processed by one run of the cron, which is triggered again
+    # when entries are left, so that one transaction never drains a large backlog
+    CRON_LIMIT = 20000
+
+    @api.model
+    def append(self, rule, method, old_values=None, new_values=None):
+        self.flush_model()
+        self.env.cr.execute(
+            "INSERT INTO spp_audit_log_buffer (rule_id, user_id, method, change_date, old_values, new_values) "
+            "VALUES (%s, %s, %s, now() at time zone 'UTC', %s, %s)",
+            (rule.id, self.env.uid, method, dump_values(old_values), dump_values(new_values)),
+        )
+
+    @api.model
+    def process_buffer(self, limit=None):
+        """
+        Create the audit logs of the buffered entries, oldest first.
+
+        :param limit: Maximum number of entries to process, all of them if not set
+        :return: The number of processed entries
+        """
+        self.env.cr.execute("SELECT pg_try_advisory_xact_lock(%s)", (BUFFER_LOCK_KEY,))
+        if not self.env.cr.fetchone()[0]:
+            _logger.info("The audit log buffer is already being processed.")
+            return 0
+
+        processed = 0
+        while limit is None or processed < limit:
+            batch_size = self.BATCH_SIZE if limit is None else min(self.BATCH_SIZE, limit - processed)
+            entries = self.sudo().search([], limit=batch_size)
+            if not entries:
+                break
+            self._create_logs(entries)
+            processed += len(entries)
+            entries.unlink()
+        return processed
+
+    def _create_logs(self, entries):
+        """Create the audit logs of the entries at once, in the order of the entries,
+        dated with the time of the audited operations"""
+        rules = {}
+        fields_to_log = {}
+        vals_list = []
+        for entry in entries:
+            key = (entry.rule_id.id, entry.user_id.id)
+            if key not in rules:
+                rules[key] = entry.rule_id.with_user(entry.user_id)
+            if entry.rule_id.id not in fields_to_log:
+                fields_to_log[entry.rule_id.id] = entry.rule_id.get_fields_to_log()
+            entry_vals_list = rules[key]._get_logs_vals(
+                entry.method,
+                load_values(entry.old_values),
+                load_values(entry.new_values),
+                fields_to_log[entry.rule_id.id],
+            )
+            for vals in entry_vals_list:
+                vals["create_date"] = entry.change_date
+            vals_list += entry_vals_list
+        if vals_list:
+            self.env["spp.audit.log"].sudo().create(vals_list)
+
+    @api.model
+    def _cron_process_buffer(self):
+        processed = self.process_buffer(limit=self.CRON_LIMIT)
+        _logger.info("Processed %s buffered audit log entries.", processed)
+        if processed == self.CRON_LIMIT and self.sudo().search_count([], limit=1):
+            self.env.ref("spp_audit_log.ir_cron_process_audit_log_buffer")._trigger()
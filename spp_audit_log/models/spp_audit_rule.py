@@ -1,6 +1,6 @@
 import json
 
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import ValidationError
 
 from ..tools import audit_decorator
@@ -17,6 +17,11 @@ class SppAuditRule(models.Model):
     log_write = fields.Boolean("Log Update", default=True)
     log_unlink = fields.Boolean("Log Deletion", default=True)
     view_logs = fields.Boolean("View Logs Action Menu", default=True)
+    async_log = fields.Boolean(
+        "Asynchronous Logging",
+        help="Append the audit entries to a buffer in the audited transaction "
+        "and create the audit logs in batches in the background.",
+    )
     model_id = fields.Many2one(
         "ir.model",
         "Model",
@@ -104,10 +109,16 @@ class SppAuditRule(models.Model):
 
         :param method: The "method" parameter is a string that specifies the type of operation being
         performed. It can have one of the following values: "create", "write", or "unlink"
-        :return: The method is returning a search result of "spp.audit.rule" records based on the
-        specified domain.
+        :return: The "spp.audit.rule" records of the model that log the specified method. The lookup
+        is cached in the registry so a model without rules for the method costs no query.
         """
-        domain = [("model_id.model", "=", self._name)]
+        rule_ids = self.env["spp.audit.rule"]._get_audit_rule_ids(self._name, method)
+        return self.env["spp.audit.rule"].sudo().browse(rule_ids)
+
+    @api.model
+    @tools.ormcache("model_name", "method")
+    def _get_audit_rule_ids(self, model_name, method):
+        domain = [("model_id.model", "=", model_name)]
         if method == "create":
             domain.append(("log_create", "=", True))
         elif method == "write":
@@ -115,7 +126,7 @@ class SppAuditRule(models.Model):
         elif method == "unlink":
             domain.append(("log_unlink", "=", True))
 
-        return self.env["spp.audit.rule"].sudo().search(domain)
+        return tuple(self.sudo().search(domain).ids)
 
     @api.model
     def _register_hook(self, ids=None):
@@ -161,6 +172,7 @@ class SppAuditRule(models.Model):
     def create(self, vals):
         rule = super().create(vals)
         rule._process_action_id()
+        self.env.registry.clear_cache()
         if self._register_hook(rule.id):
             self.pool.signal_changes()
         return rule
@@ -168,6 +180,7 @@ class SppAuditRule(models.Model):
     def write(self, vals):
         res = super().write(vals)
         self._process_action_id()
+        self.env.registry.clear_cache()
         if self._register_hook(self._ids):
             self.pool.signal_changes()
         return res
@@ -181,7 +194,10 @@ class SppAuditRule(models.Model):
             if audit_rule_count == 1 and rec.action_id:
                 rec.action_id.unlink()
 
-            return super(SppAuditRule, rec).unlink()
+        res = super().unlink()
+        # Clear the cached lookup once the rules are gone, so it cannot be filled again with them
+        self.env.registry.clear_cache()
+        return res
 
     @classmethod
     def _format_data_to_log(cls, old_values, new_values, fields_to_log):
@@ -242,6 +258,10 @@ class SppAuditRule(models.Model):
 
         return
 
+    def get_fields_to_log(self):
+        """Names of the fields logged by the rules"""
+        return list(set(self.sudo().field_to_log_ids.mapped("name")))
+
     def get_audit_log_vals(self, res_id, method, data):
         self.ensure_one()
         return {
@@ -271,11 +291,21 @@ class SppAuditRule(models.Model):
         it returns None.
         """
         if old_values or new_values:
-            fields_to_log = self.field_to_log_ids.mapped("name")
-            data = self._format_data_to_log(old_values, new_values, fields_to_log)
-            audit_log = self.env["spp.audit.log"].sudo()
-            for rec in self:
-                for res_id in data:
-                    audit_log_vals = rec.get_audit_log_vals(res_id, method, data)
-                    audit_log.create(audit_log_vals)
+            async_rules = self.filtered("async_log")
+            for rec in async_rules:
+                self.env["spp.audit.log.buffer"].sudo().append(rec, method, old_values, new_values)
+            (self - async_rules)._create_logs(method, old_values, new_values)
         return
+
+    def _create_logs(self, method, old_values=None, new_values=None):
+        if not self:
+            return
+        audit_log_vals_list = self._get_logs_vals(method, old_values, new_values)
+        if audit_log_vals_list:
+            self.env["spp.audit.log"].sudo().create(audit_log_vals_list)
+
+    def _get_logs_vals(self, method, old_values=None, new_values=None, fields_to_log=None):
+        if fields_to_log is None:
+            fields_to_log = self.get_fields_to_log()
+        data = self._format_data_to_log(old_values, new_values, fields_to_log)
+        return [rec.get_audit_log_vals(res_id, method, data) for rec in self for res_id in data]
@@ -1,5 +1,12 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+from markupsafe import Markup
+
 from odoo.tests.common import TransactionCase
 
+from ..models.spp_audit_log_buffer import dump_values, load_values
+
 
 class AuditRuleTest(TransactionCase):
     @classmethod
@@ -88,3 +95,113 @@ class AuditRuleTest(TransactionCase):
         self.assertEqual(res_id, vals["res_id"])
         self.assertEqual(method, vals["method"])
         self.assertEqual(repr(data[res_id]), vals["data"])
+
+    def test_log_only_configured_fields(self):
+        name_field = self.env["ir.model.fields"].search([("model", "=", "res.partner"), ("name", "=", "name")])
+        self.res_partner_rule.write({"field_to_log_ids": [(6, 0, name_field.ids)]})
+        self.assertEqual(self.res_partner_rule.get_fields_to_log(), ["name"])
+
+        domain = [("model_id", "=", self.model_1.id), ("res_id", "=", self.res_partner.id), ("method", "=", "write")]
+        self.res_partner.write({"name": "Res Partner Group Renamed", "phone": "+639266716912"})
+        audit_log = self.env["spp.audit.log"].search(domain)
+        self.assertEqual(len(audit_log), 1)
+        self.assertIn("Res Partner Group Renamed", audit_log.data)
+        self.assertNotIn("+639266716912", audit_log.data)
+
+        # Changes on fields that are not logged do not create logs
+        self.res_partner.write({"phone": "+639266716913"})
+        self.assertEqual(self.env["spp.audit.log"].search_count(domain), 1)
+
+    def test_get_audit_rules_cache(self):
+        self.res_partner.get_audit_rules("unlink")
+        with self.assertQueryCount(0):
+            self.assertFalse(self.res_partner.get_audit_rules("unlink"))
+
+        # Updating a rule invalidates the cached lookup
+        self.res_partner_rule.write({"log_unlink": True})
+        self.assertEqual(self.res_partner.get_audit_rules("unlink"), self.res_partner_rule)
+
+        # Deleting a rule invalidates the cached lookup
+        rule_id = self.res_partner_rule.id
+        self.res_partner_rule.unlink()
+        self.assertNotIn(rule_id, self.res_partner.get_audit_rules("unlink").ids)
+        self.assertNotIn(rule_id, self.res_partner.get_audit_rules("write").ids)
+
+    def test_async_log(self):
+        name_field = self.env["ir.model.fields"].search([("model", "=", "res.partner"), ("name", "=", "name")])
+        self.res_partner_rule.write({"field_to_log_ids": [(6, 0, name_field.ids)], "async_log": True})
+        buffer = self.env["spp.audit.log.buffer"]
+        buffer.process_buffer()
+
+        domain = [("model_id", "=", self.model_1.id), ("res_id", "=", self.res_partner.id), ("method", "=", "write")]
+        self.res_partner.write({"name": "Res Partner Group Async 1"})
+        self.res_partner.write({"name": "Res Partner Group Async 2"})
+        buffer.invalidate_model()
+        self.assertEqual(buffer.search_count([]), 2)
+        self.assertFalse(self.env["spp.audit.log"].search(domain))
+
+        self.assertEqual(buffer.process_buffer(), 2)
+        self.assertFalse(buffer.search_count([]))
+        audit_logs = self.env["spp.audit.log"].search(domain, order="id")
+        self.assertEqual(len(audit_logs), 2)
+        self.assertIn("Res Partner Group Async 1", audit_logs[0].data)
+        self.assertIn("Res Partner Group Async 2", audit_logs[1].data)
+        self.assertEqual(audit_logs.user_id, self.env.user)
+
+    def test_async_log_date(self):
+        name_field = self.env["ir.model.fields"].search([("model", "=", "res.partner"), ("name", "=", "name")])
+        self.res_partner_rule.write({"field_to_log_ids": [(6, 0, name_field.ids)], "async_log": True})
+        buffer = self.env["spp.audit.log.buffer"]
+        buffer.process_buffer()
+
+        self.res_partner.write({"name": "Res Partner Group Async Date"})
+        change_date = datetime(2024, 1, 2, 3, 4, 5)
+        self.env.cr.execute("UPDATE spp_audit_log_buffer SET change_date = %s", (change_date,))
+        buffer.invalidate_model()
+        buffer.process_buffer()
+
+        audit_log = self.env["spp.audit.log"].search(
+            [("model_id", "=", self.model_1.id), ("res_id", "=", self.res_partner.id), ("method", "=", "write")],
+            order="id desc",
+            limit=1,
+        )
+        self.assertIn("Res Partner Group Async Date", audit_log.data)
+        # The log is dated with the change, not with the processing of the buffer
+        self.assertEqual(audit_log.create_date, change_date)
+
+    def test_async_log_values(self):
+        values = [
+            {
+                "id": self.res_partner.id,
+                "date": date(2024, 2, 29),
+                "write_date": datetime(2024, 2, 29, 13, 30, 5),
+                "comment": Markup("<p>Note</p>"),
+                "amount": Decimal("1.5"),
+                "category_id": [1, 2],
+                "partner": self.res_partner,
+            }
+        ]
+        loaded = load_values(dump_values(values))
+        self.assertEqual(loaded[0]["date"], date(2024, 2, 29))
+        self.assertEqual(loaded[0]["write_date"], datetime(2024, 2, 29, 13, 30, 5))
+        self.assertEqual(loaded[0]["comment"], "<p>Note</p>")
+        self.assertEqual(loaded[0]["amount"], 1.5)
+        self.assertEqual(loaded[0]["category_id"], [1, 2])
+        # Values that are not literals are kept as text, never evaluated
+        self.assertEqual(loaded[0]["partner"], str(self.res_partner))
+        self.assertIsNone(load_values(dump_values(None)))
+
+    def test_async_log_cron_limit(self):
+        name_field = self.env["ir.model.fields"].search([("model", "=", "res.partner"), ("name", "=", "name")])
+        self.res_partner_rule.write({"field_to_log_ids": [(6, 0, name_field.ids)], "async_log": True})
+        buffer = self.env["spp.audit.log.buffer"]
+        buffer.process_buffer()
+
+        for index in range(3):
+            self.res_partner.write({"name": f"Res Partner Group Cron {index}"})
+        self.patch(type(buffer), "CRON_LIMIT", 2)
+        buffer._cron_process_buffer()
+        buffer.invalidate_model()
+        self.assertEqual(buffer.search_count([]), 1)
+        buffer._cron_process_buffer()
+        self.assertFalse(buffer.search_count([]))
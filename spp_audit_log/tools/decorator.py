@@ -3,6 +3,9 @@
 
 import copy
 import logging
+from datetime import date
+
+from markupsafe import Markup
 
 from odoo import api
 
@@ -11,17 +14,30 @@ long = int
 _logger = logging.getLogger(__name__)
 
 
-def get_new_values(records):
-    new_values = []
-    for record in records:
-        vals = {}
-        for fname in records._fields:
-            try:
-                vals[fname] = records._fields[fname].convert_to_read(record[fname], record, use_display_name=False)
-            except TypeError as e:
-                _logger.warning("Error converting field %s: %s", fname, e)
-        new_values.append(vals)
-    return new_values
+# Values of these types can be logged without being copied first
+IMMUTABLE_TYPES = (str, int, float, bool, bytes, tuple, date, type(None))
+
+
+def get_fields_to_read(records, rules):
+    """Names of the fields logged by the rules that exist on the model of records"""
+    return [fname for fname in rules.get_fields_to_log() if fname in records._fields]
+
+
+def read_values(records, fnames):
+    values = records.sudo().with_context(allowed_company_ids=[]).read(fnames, load="_classic_write")
+    for vals in values:
+        for key, value in vals.items():
+            if isinstance(value, Markup):
+                vals[key] = str(value)
+    return values
+
+
+def copy_values(values):
+    """Deep copy the values only if some of them are mutable"""
+    for vals in values:
+        if not all(isinstance(value, IMMUTABLE_TYPES) for value in vals.values()):
+            return copy.deepcopy(values)
+    return values
 
 
 def audit_decorator(method):
@@ -29,6 +45,8 @@ def audit_decorator(method):
     The audit_decorator function is a Python decorator that adds auditing functionality to create, write, and
     unlink methods of a class.
 
+    Only the fields configured in the audit rules are read before and after the operation.
+
     :param method: The `method` parameter is a string that specifies the type of operation being
     performed. It can have one of the following values: "create", "write", or "unlink"
     :return: The audit_decorator function returns one of three functions: audit_create, audit_write, or
@@ -40,51 +58,37 @@ def audit_decorator(method):
         result = audit_create.origin(self, vals)
         record = self.browse(result) if isinstance(result, int | long) else result
         rules = self.get_audit_rules("create")
+        fnames = get_fields_to_read(record, rules)
 
-        new_values = record.read(load="_classic_write")
-        if new_values:
-            keys = new_values[0].keys()
-            for key in keys:
-                if str(type(new_values[0][key])) == "<class 'markupsafe.Markup'>":
-                    new_values[0][key] = str(new_values[0][key])
-
+        if rules and fnames:
+            new_values = read_values(record, fnames)
             rules.log("create", new_values=new_values)
         return result
 
     def audit_write(self, vals):
-        rules = self.get_audit_rules("write")
-        old_values_copy = None
-        if rules:
-            old_values = self.sudo().with_context(allowed_company_ids=[]).read(load="_classic_write")
-            old_values_copy = copy.deepcopy(old_values)
-        result = audit_write.origin(self, vals)
+        # write is audited through the call to write, _write is only patched to be skipped
+        if audit_write.origin.__name__ != "write":
+            return audit_write.origin(self, vals)
 
-        if audit_write.origin.__name__ == "_write":
-            new_values = get_new_values(self)
-        else:
-            new_values = self.sudo().with_context(allowed_company_ids=[]).read(load="_classic_write")
+        rules = self.get_audit_rules("write")
+        fnames = get_fields_to_read(self, rules)
+        if not rules or not fnames:
+            return audit_write.origin(self, vals)
 
-        if new_values and old_values_copy:
-            keys = new_values[0].keys()
-            for key in keys:
-                if str(type(new_values[0][key])) == "<class 'markupsafe.Markup'>":
-                    new_values[0][key] = str(new_values[0][key])
-                    old_values_copy[0][key] = str(old_values_copy[0][key])
+        old_values = copy_values(read_values(self, fnames))
+        result = audit_write.origin(self, vals)
+        new_values = read_values(self, fnames)
 
-            if audit_write.origin.__name__ == "write":
-                rules.log("write", old_values_copy, new_values)
+        if new_values and old_values:
+            rules.log("write", old_values, new_values)
         return result
 
     def audit_unlink(self):
         rules = self.get_audit_rules("unlink")
-        old_values = self.read(load="_classic_write")
-
-        if old_values:
-            keys = old_values[0].keys()
-            for key in keys:
-                if str(type(old_values[0][key])) == "<class 'markupsafe.Markup'>":
-                    old_values[0][key] = str(old_values[0][key])
+        fnames = get_fields_to_read(self, rules)
 
+        if rules and fnames:
+            old_values = read_values(self, fnames)
             rules.log("unlink", old_values)
         return audit_unlink.origin(self)
 
@@ -14,24 +14,25 @@ class SppAuditLog(models.Model):
     # Where to log
     log_to = fields.Text(compute="_compute_log_to")
 
-    @api.model
-    def create(self, vals):
-        res = super().create(vals)
+    @api.model_create_multi
+    def create(self, vals_list):
+        logs = super().create(vals_list)
 
-        records = []
-        msg = ""
-        if res.parent_model_id and res.parent_model_id.is_mail_thread:
-            res_ids = list(map(int, res.parent_res_ids_str.split(",")))
-            records = self.env[res.parent_model_id.model].browse(res_ids)
-            msg = res.parent_data_html
-        elif res.model_id and res.model_id.is_mail_thread:
-            records = self.env[res.model_id.model].browse(res.res_id)
-            msg = res.data_html
+        for res in logs:
+            records = []
+            msg = ""
+            if res.parent_model_id and res.parent_model_id.is_mail_thread:
+                res_ids = list(map(int, res.parent_res_ids_str.split(",")))
+                records = self.env[res.parent_model_id.model].browse(res_ids)
+                msg = res.parent_data_html
+            elif res.model_id and res.model_id.is_mail_thread:
+                records = self.env[res.model_id.model].browse(res.res_id)
+                msg = res.data_html
 
-        for record in records:
-            record.message_post(body=msg)
+            for record in records:
+                record.message_post(body=msg)
 
-        return res
+        return logs
 
     def _parent_get_content(self):
         """
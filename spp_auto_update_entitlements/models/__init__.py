@@ -2,3 +2,4 @@
 
 from . import entitlement
 from . import cycle
+from . import transactions
@@ -3,6 +3,7 @@
 from datetime import date
 
 from odoo import fields, models
+from odoo.tools import SQL
 
 from odoo.addons.g2p_programs.models import constants
 
@@ -29,9 +30,32 @@ class SPPDefaultCycleManager(models.Model):
         cycle.update({"state": constants.STATE_ENDED})
 
     def check_cycle_entitlements(self, cycle):
-        for entitlement in cycle.entitlement_ids:
-            state = self.check_entitlements_transactions(entitlement)
-            entitlement.update({"state": state})
+        """
+        Classify the entitlements of the cycle as redeemed or partially redeemed from
+        their stored balance, with the same rules as `check_entitlements_transactions`.
+        """
+        entitlement_model = self.env["g2p.entitlement"]
+        entitlement_model.flush_model(["cycle_id", "state", "initial_amount", "entitlement_balance"])
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT new_state, array_agg(id)
+                FROM (
+                    SELECT id, state,
+                        CASE WHEN entitlement_balance = 0 THEN 'rdpd2ben' ELSE 'parrdpd2ben' END AS new_state
+                    FROM %(table)s
+                    WHERE cycle_id = %(cycle_id)s
+                    AND (entitlement_balance = 0 OR initial_amount > entitlement_balance)
+                ) AS entitlement
+                WHERE state IS DISTINCT FROM new_state
+                GROUP BY new_state
+                """,
+                table=SQL.identifier(entitlement_model._table),
+                cycle_id=cycle.id,
+            )
+        )
+        for state, entitlement_ids in self.env.cr.fetchall():
+            entitlement_model.browse(entitlement_ids).write({"state": state})
 
     def check_entitlements_transactions(self, entitlement):
         balance = entitlement.entitlement_balance
@@ -1,6 +1,12 @@
 # Part of OpenSPP. See LICENSE file for full copyright and licensing details.
 
+from collections import defaultdict
+
 from odoo import api, fields, models
+from odoo.tools import SQL
+
+# Sign of each transaction type on the amount redeemed from an entitlement
+TRANSACTION_SIGNS = {"PURCHASE": 1, "VOID": -1}
 
 
 class SPPEntitlement(models.Model):
@@ -8,18 +14,42 @@ class SPPEntitlement(models.Model):
 
     state = fields.Selection(selection_add=[("parrdpd2ben", "Partially Redeemed/Paid to Beneficiary")])
     transaction_ids = fields.One2many("spp.entitlement.transactions", "entitlement_id", "Transactions")
-    entitlement_balance = fields.Float(compute="_compute_balance")
+    # Kept up to date incrementally by the transactions, see `_apply_balance_deltas`
+    entitlement_balance = fields.Float(compute="_compute_balance", store=True)
 
-    @api.depends("transaction_ids")
+    @api.depends("initial_amount")
     def _compute_balance(self):
+        redeemed = defaultdict(float)
+        entitlements = self.filtered("id")
+        if entitlements:
+            for entitlement, transaction_type, amount in self.env["spp.entitlement.transactions"]._read_group(
+                [("entitlement_id", "in", entitlements.ids)],
+                ["entitlement_id", "transaction_type"],
+                ["amount_charged_by_service_point:sum"],
+            ):
+                redeemed[entitlement.id] += TRANSACTION_SIGNS.get(transaction_type, 0) * amount
         for rec in self:
-            total_add = 0
-            total_deduct = 0
-            for transaction in rec.transaction_ids:
-                if transaction.transaction_type == "PURCHASE":
-                    total_add += transaction.amount_charged_by_service_point
-                elif transaction.transaction_type == "VOID":
-                    total_deduct += transaction.amount_charged_by_service_point
-            initial_balance = rec.initial_amount
-            total_balance = initial_balance - (total_add - total_deduct)
-            rec.entitlement_balance = total_balance
+            rec.entitlement_balance = rec.initial_amount - redeemed[rec.id]
+
+    @api.model
+    def _apply_balance_deltas(self, deltas):
+        """Add ``deltas``, a dict of amounts keyed by entitlement id, to the stored balances."""
+        deltas = {entitlement_id: delta for entitlement_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        self.flush_model(["entitlement_balance"])
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE %(table)s AS entitlement
+                SET entitlement_balance = COALESCE(entitlement.entitlement_balance, 0) + delta.amount
+                FROM (VALUES %(deltas)s) AS delta(id, amount)
+                WHERE entitlement.id = delta.id
+                """,
+                table=SQL.identifier(self._table),
+                deltas=SQL(", ").join(SQL("(%s, %s::float8)", *item) for item in deltas.items()),
+            )
+        )
+        entitlements = self.browse(deltas)
+        entitlements.invalidate_recordset(["entitlement_balance"])
+        entitlements.modified(["entitlement_balance"])
@@ -0,0 +1,48 @@
+# Part of OpenSPP. See LICENSE file for full copyright and licensing details.
+
+from collections import defaultdict
+
+from odoo import api, models
+
+from .entitlement import TRANSACTION_SIGNS
+
+BALANCE_FIELDS = {"entitlement_id", "transaction_type", "amount_charged_by_service_point"}
+
+
+class SPPEntitlementTransactions(models.Model):
+    _inherit = "spp.entitlement.transactions"
+
+    def _get_redeemed_amounts(self):
+        redeemed = defaultdict(float)
+        for rec in self:
+            if rec.entitlement_id:
+                sign = TRANSACTION_SIGNS.get(rec.transaction_type, 0)
+                redeemed[rec.entitlement_id.id] += sign * rec.amount_charged_by_service_point
+        return redeemed
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Settle pending balance computations so they don't count the new transactions
+        self.env["g2p.entitlement"].flush_model(["entitlement_balance"])
+        records = super().create(vals_list)
+        redeemed = records._get_redeemed_amounts()
+        self.env["g2p.entitlement"]._apply_balance_deltas({key: -value for key, value in redeemed.items()})
+        return records
+
+    def write(self, vals):
+        if not BALANCE_FIELDS.intersection(vals):
+            return super().write(vals)
+        self.env["g2p.entitlement"].flush_model(["entitlement_balance"])
+        deltas = self._get_redeemed_amounts()
+        res = super().write(vals)
+        for entitlement_id, amount in self._get_redeemed_amounts().items():
+            deltas[entitlement_id] -= amount
+        self.env["g2p.entitlement"]._apply_balance_deltas(deltas)
+        return res
+
+    def unlink(self):
+        self.env["g2p.entitlement"].flush_model(["entitlement_balance"])
+        deltas = self._get_redeemed_amounts()
+        res = super().unlink()
+        self.env["g2p.entitlement"]._apply_balance_deltas(deltas)
+        return res
@@ -70,3 +70,36 @@ class TestCycle(Common):
         )
         state = self.cycle_manager.check_entitlements_transactions(self.entitlement)
         self.assertEqual(state, "rdpd2ben")
+
+    def test_check_cycle_entitlements_bulk(self):
+        entitlements = self.env["g2p.entitlement"].create(
+            [
+                {
+                    "program_id": self.program.id,
+                    "partner_id": self.partner.id,
+                    "cycle_id": self.cycle.id,
+                    "state": "approved",
+                    "initial_amount": 100.00,
+                }
+                for _ in range(3)
+            ]
+        )
+        for entitlement, amount in zip(entitlements, [100.00, 40.00, 0.00], strict=True):
+            if not amount:
+                continue
+            self.env["spp.entitlement.transactions"].create(
+                {
+                    "entitlement_id": entitlement.id,
+                    "amount_charged_by_service_point": amount,
+                    "transaction_type": "PURCHASE",
+                    "user_id": self.env.ref("base.user_root").id,
+                    "transaction_uuid": f"test-uuid-{entitlement.id}",
+                    "currency_id": self.env.ref("base.USD").id,
+                    "timestamp_transaction_created": fields.Datetime.now(),
+                }
+            )
+
+        self.cycle_manager.check_cycle_entitlements(self.cycle)
+
+        self.assertEqual(entitlements.mapped("state"), ["rdpd2ben", "parrdpd2ben", "approved"])
+        self.assertEqual(self.entitlement.state, "draft")
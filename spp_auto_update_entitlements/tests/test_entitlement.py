@@ -45,3 +45,44 @@ class TestEntitlement(Common):
                 - self.entitlement_transaction_2.amount_charged_by_service_point
             ),
         )
+
+    def test_balance_maintained_incrementally(self):
+        transaction_model = self.env["spp.entitlement.transactions"]
+        common_values = {
+            "entitlement_id": self.entitlement.id,
+            "user_id": self.env.ref("base.user_root").id,
+            "currency_id": self.env.ref("base.USD").id,
+            "timestamp_transaction_created": fields.Datetime.now(),
+        }
+        purchase = transaction_model.create(
+            dict(
+                common_values,
+                transaction_uuid="test-uuid",
+                transaction_type="PURCHASE",
+                amount_charged_by_service_point=30.0,
+            )
+        )
+        self.assertEqual(self.entitlement.entitlement_balance, 70.0)
+
+        purchase.write({"amount_charged_by_service_point": 40.0})
+        self.assertEqual(self.entitlement.entitlement_balance, 60.0)
+
+        transaction_model.create(
+            dict(
+                common_values,
+                transaction_uuid="test-uuid2",
+                transaction_type="VOID",
+                amount_charged_by_service_point=40.0,
+            )
+        )
+        self.assertEqual(self.entitlement.entitlement_balance, 100.0)
+
+        purchase.unlink()
+        self.assertEqual(self.entitlement.entitlement_balance, 140.0)
+
+        self.env.flush_all()
+        self.env.cr.execute("SELECT entitlement_balance FROM g2p_entitlement WHERE id = %s", (self.entitlement.id,))
+        self.assertEqual(self.env.cr.fetchone()[0], 140.0)
+
+        self.entitlement.initial_amount = 200.0
+        self.assertEqual(self.entitlement.entitlement_balance, 240.0)
@@ -1,4 +1,5 @@
 from . import base
 from . import ir_model_fields
+from . import recompute_daily_record
 from . import res_config_settings
 from . import test_daily_recompute_model
@@ -1,4 +1,4 @@
-from odoo import models
+from odoo import api, models
 
 
 class Base(models.AbstractModel):
@@ -6,3 +6,23 @@ class Base(models.AbstractModel):
 
     def _valid_field_parameter(self, field, name):
         return name == "recompute_daily" or super()._valid_field_parameter(field, name)
+
+    def _mark_recompute_daily(self):
+        """Flag these records so the next daily run recomputes their indicators.
+
+        Call it whenever an input the daily indicators read but do not declare as a
+        dependency changes, e.g. a member joining a group or new event data.
+        """
+        self.env["spp.recompute.daily.record"].sudo()._mark(self._name, self.ids)
+        return True
+
+    @api.model
+    def _get_recompute_daily_ids(self, field_names, days):
+        """Return the ids whose daily indicators change just because ``days`` passed.
+
+        :param field_names: names of the ``recompute_daily`` fields being recomputed
+        :param days: list of dates elapsed since the previous daily run
+        :return: a list of ids, or ``None`` when the model cannot tell, in which case
+            every record is recomputed
+        """
+        return None
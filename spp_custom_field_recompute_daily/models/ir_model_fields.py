@@ -1,11 +1,17 @@
 import logging
+from collections import defaultdict
+from datetime import timedelta
 
 from pytz import timezone
 
 from odoo import SUPERUSER_ID, api, fields, models
+from odoo.tools import split_every
 
 _logger = logging.getLogger(__name__)
 
+LAST_RUN_PARAM = "spp.daily_recompute_last_run"
+MAX_CATCH_UP_DAYS = 366
+
 
 class IrModelFields(models.Model):
     _inherit = "ir.model.fields"
@@ -38,19 +44,60 @@ class IrModelFields(models.Model):
 
     @api.model
     def _daily_recompute_indicators(self):
-        maximum_daily_recompute_count = int(
-            self.env["ir.config_parameter"].sudo().get_param("spp.maximum_daily_recompute_count", "10_000")
-        )
-        recompute_daily_fields = self.search([("recompute_daily", "=", True)])
-        for field in recompute_daily_fields:
-            model = self.env[field.model_id.model]
+        """Recompute the daily indicators of the records that may have changed.
+
+        Only the records flagged through ``_mark_recompute_daily`` and the ones returned
+        by the model's ``_get_recompute_daily_ids`` for the days elapsed since the last
+        run are recomputed; models without the hook are recomputed in full.
+        """
+        config = self.env["ir.config_parameter"].sudo()
+        maximum_daily_recompute_count = int(config.get_param("spp.maximum_daily_recompute_count", "10_000"))
+        today = fields.Date.context_today(self)
+        days = self._get_daily_recompute_days(fields.Date.to_date(config.get_param(LAST_RUN_PARAM)), today)
+
+        fields_by_model = defaultdict(lambda: self.browse())
+        for field in self.search([("recompute_daily", "=", True)]):
+            fields_by_model[field.model_id.model] |= field
+
+        report = {}
+        for model_name, model_fields in fields_by_model.items():
+            if model_name not in self.env:
+                continue
+            model = self.env[model_name]
             total_records_count = model.search_count([])
-            records = model.search([])
-            if total_records_count <= maximum_daily_recompute_count:
-                field._recompute_indicator_on_records(records)
+            dirty_ids = self.env["spp.recompute.daily.record"].sudo()._pop(model_name)
+            date_ids = model._get_recompute_daily_ids(model_fields.mapped("name"), days)
+            if date_ids is None:
+                record_ids = model.search([], order="id").ids
+            else:
+                record_ids = sorted(model.browse(set(dirty_ids) | set(date_ids)).exists().ids)
+            skipped_count = max(total_records_count - len(record_ids), 0)
+            report[model_name] = {"recomputed": len(record_ids), "skipped": skipped_count}
+            _logger.info(
+                "Daily recompute of %s: %s record(s) recomputed, %s skipped.",
+                model_name,
+                len(record_ids),
+                skipped_count,
+            )
+            if not record_ids:
                 continue
-            for i in range(0, total_records_count, maximum_daily_recompute_count):
-                field.with_delay()._recompute_indicator_on_records(records[i : (i + maximum_daily_recompute_count)])
+            for field in model_fields:
+                if len(record_ids) <= maximum_daily_recompute_count:
+                    field._recompute_indicator_on_records(model.browse(record_ids))
+                    continue
+                for ids in split_every(maximum_daily_recompute_count, record_ids):
+                    field.with_delay()._recompute_indicator_on_records(model.browse(ids))
+
+        config.set_param(LAST_RUN_PARAM, fields.Date.to_string(today))
+        return report
+
+    @api.model
+    def _get_daily_recompute_days(self, last_run, today):
+        """Dates elapsed since ``last_run``, today included, capped to a year."""
+        if not last_run:
+            return [today]
+        first_day = max(last_run + timedelta(days=1), today - timedelta(days=MAX_CATCH_UP_DAYS - 1))
+        return [first_day + timedelta(days=i) for i in range((today - first_day).days + 1)]
 
     def _recompute_indicator_on_records(self, records_to_compute):
         self.ensure_one()
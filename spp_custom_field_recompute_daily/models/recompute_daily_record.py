@@ -0,0 +1,52 @@
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+
+class RecomputeDailyRecord(models.Model):
+    """Records whose daily indicators must be recomputed by the next nightly run.
+
+    Rows are written and consumed with plain SQL so that flagging a record costs a
+    single ``INSERT ... ON CONFLICT DO NOTHING``; the unique index on
+    ``(model, res_id)`` doubles as the lookup index of the nightly job.
+    """
+
+    _name = "spp.recompute.daily.record"
+    _description = "Daily Recompute Pending Record"
+    _log_access = False
+
+    model = fields.Char(required=True, readonly=True)
+    res_id = fields.Integer(string="Record ID", required=True, readonly=True)
+
+    _sql_constraints = [
+        ("model_res_id_uniq", "unique(model, res_id)", "A record can only be pending recompute once!"),
+    ]
+
+    @api.model
+    def _mark(self, model_name, res_ids):
+        res_ids = [res_id for res_id in res_ids if res_id]
+        if not res_ids:
+            return
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO %(table)s (model, res_id)
+                SELECT %(model)s, unnest(%(res_ids)s::int[])
+                ON CONFLICT (model, res_id) DO NOTHING
+                """,
+                table=SQL.identifier(self._table),
+                model=model_name,
+                res_ids=res_ids,
+            )
+        )
+
+    @api.model
+    def _pop(self, model_name):
+        """Remove and return the ids pending recompute for ``model_name``."""
+        self.env.cr.execute(
+            SQL(
+                "DELETE FROM %(table)s WHERE model = %(model)s RETURNING res_id",
+                table=SQL.identifier(self._table),
+                model=model_name,
+            )
+        )
+        return [row[0] for row in self.env.cr.fetchall()]
@@ -1,3 +1,6 @@
+from datetime import date
+from unittest.mock import patch
+
 from odoo.tests import TransactionCase
 
 
@@ -92,3 +95,40 @@ class TestIrModelFields(TransactionCase):
             bool(recompute_indicator_jobs_count),
             "Jobs should exists after reset max daily recompute " "record count and recompute indicators!",
         )
+
+    def test_04_daily_recompute_pending_records(self):
+        test_record_1 = self._create_test_record()
+        test_record_2 = self._create_test_record()
+        test_model_name = self.test_model._name
+        with patch.object(type(self.test_model), "_get_recompute_daily_ids", return_value=[]):
+            report = self.env["ir.model.fields"]._daily_recompute_indicators()
+            self.assertEqual(report[test_model_name]["recomputed"], 0)
+
+            test_record_2._mark_recompute_daily()
+            test_record_2._mark_recompute_daily()
+            report = self.env["ir.model.fields"]._daily_recompute_indicators()
+            self.assertEqual(
+                report[test_model_name]["recomputed"],
+                1,
+                "Only the record flagged for recompute should be recomputed!",
+            )
+            self.assertGreaterEqual(report[test_model_name]["skipped"], 1)
+            self.assertFalse(
+                self.env["spp.recompute.daily.record"].search([("model", "=", test_model_name)]),
+                "Pending records should be cleared once recomputed!",
+            )
+
+        with patch.object(type(self.test_model), "_get_recompute_daily_ids", return_value=[test_record_1.id]):
+            report = self.env["ir.model.fields"]._daily_recompute_indicators()
+            self.assertEqual(report[test_model_name]["recomputed"], 1)
+
+    def test_05_get_daily_recompute_days(self):
+        fields_model = self.env["ir.model.fields"]
+        today = date(2024, 3, 2)
+        self.assertEqual(fields_model._get_daily_recompute_days(False, today), [today])
+        self.assertEqual(fields_model._get_daily_recompute_days(today, today), [])
+        self.assertEqual(
+            fields_model._get_daily_recompute_days(date(2024, 2, 28), today),
+            [date(2024, 2, 29), date(2024, 3, 1), today],
+        )
+        self.assertEqual(len(fields_model._get_daily_recompute_days(date(2020, 1, 1), today)), 366)
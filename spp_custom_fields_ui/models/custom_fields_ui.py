@@ -134,20 +134,9 @@ class OpenSPPCustomFieldsUI(models.Model):
                 name = name + rec.draft_name
             rec.name = name
             if rec.field_category == "ind":
-                rec.compute = "kinds = None \n"
-                if rec.kinds:
-                    kind_ids = []
-                    for rec_line in rec.kinds:
-                        kind_id = str(rec_line.name)
-                        kind_ids.append(kind_id)
-
-                    rec.compute = "kinds = %s \n" % kind_ids
-                rec.compute += "domain = []\n"
+                # Kinds and presence are read back from the field by the indicator engine
+                rec.compute = "self._compute_custom_indicators()"
                 if rec.has_presence:
                     rec.ttype = "boolean"
-                    rec.compute += (
-                        "self.compute_count_and_set_indicator('%s', kinds, domain, presence_only=True)" % name
-                    )
                 else:
                     rec.ttype = "integer"
-                    rec.compute += "self.compute_count_and_set_indicator('%s', kinds, domain)" % name
@@ -0,0 +1,143 @@
+# Part of OpenSPP. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, models
+from odoo.tools import SQL, split_every
+
+INDICATOR_WRITE_BATCH_SIZE = 1000
+
+
+class OpenSPPCustomIndicators(models.Model):
+    _inherit = "res.partner"
+
+    @api.model
+    def _get_custom_indicators(self):
+        """
+        This method is used to collect the calculated indicators defined through the custom fields UI.
+        :return: A list of dicts with the name, kinds, domain and presence_only of each indicator.
+        """
+        indicator_fields = (
+            self.env["ir.model.fields"]
+            .sudo()
+            .search([("model", "=", self._name), ("field_category", "=", "ind"), ("state", "=", "manual")])
+        )
+        return [
+            {
+                "name": field.name,
+                "kinds": field.kinds.mapped("name") or None,
+                "domain": [],
+                "presence_only": field.has_presence,
+            }
+            for field in indicator_fields
+            if field.name in self._fields
+        ]
+
+    def _compute_custom_indicators(self):
+        """
+        This method is used to compute every calculated indicator of the records at once.
+
+        It is the compute of the indicator fields generated by the custom fields UI: the
+        first indicator computed fills all the others, which are then marked as computed.
+        """
+        indicators = self._get_custom_indicators()
+        if not indicators:
+            return
+        records = self.filtered("id")
+        counts = records._query_custom_indicators(indicators) if records else {}
+        zeros = [0] * len(indicators)
+        rows = []
+        for record in self:
+            record_counts = counts.get(record.id, zeros)
+            rows.append(
+                [
+                    count > 0 if indicator["presence_only"] else count
+                    for indicator, count in zip(indicators, record_counts, strict=True)
+                ]
+            )
+        for index, indicator in enumerate(indicators):
+            field = self._fields[indicator["name"]]
+            self.env.cache.update(self, field, [row[index] for row in rows])
+            self.env.remove_to_compute(field, self)
+        if records:
+            self._write_custom_indicators(
+                indicators,
+                {record.id: row for record, row in zip(self, rows, strict=True) if record.id},
+            )
+
+    def _query_custom_indicators(self, indicators):
+        """
+        This method is used to count the members matching each indicator in one grouped pass
+        over the group memberships.
+        :param indicators: The indicators as returned by _get_custom_indicators.
+        :return: A dict mapping the group IDs to their counts, in the order of the indicators.
+        """
+        membership_model = self.env["g2p.group.membership"]
+        kind_field = membership_model._fields["kind"]
+        kind_names = {name for indicator in indicators for name in indicator["kinds"] or []}
+        kind_ids = {}
+        for kind in self.env["g2p.group.membership.kind"].search([("name", "in", list(kind_names))]):
+            kind_ids.setdefault(kind.name, []).append(kind.id)
+
+        counts = []
+        for indicator in indicators:
+            conditions = []
+            if indicator["kinds"]:
+                conditions.append(
+                    SQL(
+                        "EXISTS (SELECT 1 FROM %(rel)s WHERE %(rel)s.%(membership)s = membership.id "
+                        "AND %(rel)s.%(kind)s = ANY(%(kind_ids)s))",
+                        rel=SQL.identifier(kind_field.relation),
+                        membership=SQL.identifier(kind_field.column1),
+                        kind=SQL.identifier(kind_field.column2),
+                        kind_ids=[kind_id for name in indicator["kinds"] for kind_id in kind_ids.get(name, [])],
+                    )
+                )
+            if indicator["domain"]:
+                individual_query = self.env["res.partner"]._search(indicator["domain"])
+                conditions.append(SQL("individual.id IN (%s)", individual_query.subselect()))
+            condition = SQL(" AND ").join(conditions) if conditions else SQL("TRUE")
+            counts.append(SQL("COUNT(*) FILTER (WHERE %s)", condition))
+
+        where = [SQL('membership."group" = ANY(%s)', self.ids), SQL("individual.active")]
+        if "is_ended" in membership_model._fields:
+            where.append(SQL("membership.is_ended IS NOT TRUE"))
+        membership_model.flush_model()
+        self.env["res.partner"].flush_model(["active"])
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT membership."group", %(counts)s
+                FROM g2p_group_membership membership
+                JOIN res_partner individual ON individual.id = membership.individual
+                WHERE %(where)s
+                GROUP BY membership."group"
+                """,
+                counts=SQL(", ").join(counts),
+                where=SQL(" AND ").join(where),
+            )
+        )
+        return {row[0]: list(row[1:]) for row in self.env.cr.fetchall()}
+
+    @api.model
+    def _write_custom_indicators(self, indicators, values):
+        """
+        This method is used to write the indicator columns back in bulk.
+        :param indicators: The indicators as returned by _get_custom_indicators.
+        :param values: A dict mapping the record IDs to their values, in the order of the indicators.
+        """
+        stored = [index for index, indicator in enumerate(indicators) if self._fields[indicator["name"]].store]
+        if not stored:
+            return
+        columns = [SQL.identifier(indicators[index]["name"]) for index in stored]
+        assignments = SQL(", ").join(SQL("%s = v.%s", column, column) for column in columns)
+        rows = [(record_id, *[row[index] for index in stored]) for record_id, row in values.items()]
+        for batch in split_every(INDICATOR_WRITE_BATCH_SIZE, rows):
+            self.env.cr.execute(
+                SQL(
+                    "UPDATE %(table)s SET %(assignments)s FROM (VALUES %(rows)s) AS v(id, %(columns)s) "
+                    "WHERE %(table)s.id = v.id",
+                    table=SQL.identifier(self._table),
+                    assignments=assignments,
+                    rows=SQL(", ").join(SQL("%s", row) for row in batch),
+                    columns=SQL(", ").join(columns),
+                )
+            )
@@ -86,3 +86,43 @@ class CustomFieldsTest(TransactionCase):
             UserError, "Changing the type of a field is not yet supported. Please drop it and create it again!"
         ):
             self.model_field_id.set_compute()
+
+    def test_compute_custom_indicators(self):
+        common_values = {
+            "model_id": self.model_id.id,
+            "state": "manual",
+            "field_category": "ind",
+            "store": True,
+            "compute": "self._compute_custom_indicators()",
+        }
+        self.env["ir.model.fields"].create(
+            [
+                dict(common_values, name="x_ind_grp_test_members", field_description="Members", ttype="integer"),
+                dict(
+                    common_values,
+                    name="x_ind_grp_test_has_head",
+                    field_description="Has Head",
+                    ttype="boolean",
+                    has_presence=True,
+                    kinds=[(6, 0, [self.kind_id.id])],
+                ),
+            ]
+        )
+        partners = self.env["res.partner"]
+        group = partners.create({"name": "Test Group", "is_group": True, "is_registrant": True})
+        head = partners.create({"name": "Test Head", "is_group": False, "is_registrant": True})
+        member = partners.create({"name": "Test Member", "is_group": False, "is_registrant": True})
+        self.env["g2p.group.membership"].create(
+            [
+                {"group": group.id, "individual": head.id, "kind": [(6, 0, [self.kind_id.id])]},
+                {"group": group.id, "individual": member.id},
+            ]
+        )
+
+        (group | head)._compute_custom_indicators()
+        group.invalidate_recordset()
+
+        self.assertEqual(group.x_ind_grp_test_members, 2)
+        self.assertTrue(group.x_ind_grp_test_has_head)
+        self.assertEqual(head.x_ind_grp_test_members, 0)
+        self.assertFalse(head.x_ind_grp_test_has_head)
@@ -12,6 +12,7 @@ from odoo.tools import date_utils
 from odoo.addons.spp_oauth.tools import OpenSPPOAuthJWTException, verify_and_decode_signature
 
 from ..tools import constants
+from ..tools.pagination import InvalidCursorError, decode_cursor, encode_cursor, get_cached_count
 
 
 def setup_db(req, db_name):
@@ -134,7 +135,7 @@ class SppDciApiServer(Controller):
         type="http",
         csrf=False,
     )
-    def retrieve_registry(self, page=1, limit=30, **kw):
+    def retrieve_registry(self, page=1, limit=30, cursor=None, **kw):
         auth_header = get_auth_header(request.httprequest.headers, raise_exception=True)
 
         access_token = auth_header.replace("Bearer ", "").replace("\\n", "").encode("utf-8")
@@ -184,12 +185,25 @@ class SppDciApiServer(Controller):
 
         # Process search requests and modify search_responses
         search_responses = []
-        pagination = {
-            "page": page,
-            "limit": limit,
-            "total_records": 0,
-            "total_pages": 0,
-        }
+        if cursor is not None:
+            # Keyset pagination: the cursor points after the last record of the previous page
+            try:
+                decode_cursor(cursor)
+            except InvalidCursorError:
+                return error_wrapper(400, "cursor is invalid.")
+            pagination = {
+                "cursor": cursor,
+                "limit": limit,
+                "next_cursor": None,
+                "total_records": 0,
+            }
+        else:
+            pagination = {
+                "page": page,
+                "limit": limit,
+                "total_records": 0,
+                "total_pages": 0,
+            }
         self.process_search_requests(search_requests, today_isoformat, search_responses, pagination)
 
         header = {
@@ -361,14 +375,7 @@ class SppDciApiServer(Controller):
             domain = self.process_queries(query_type, queries, domain)
 
             if domain:
-                page = pagination.get("page")
-                limit = pagination.get("limit")
-                offset = (page - 1) * limit
-
-                records = request.env["res.partner"].sudo().search(domain, offset=offset, limit=limit)
-                total_records = request.env["res.partner"].sudo().search_count(domain)
-                pagination["total_records"] = total_records
-                pagination["total_pages"] = (total_records + limit - 1) // limit
+                records = self.search_page(domain, pagination)
 
                 if records:
                     search_responses.append(
@@ -385,3 +392,33 @@ class SppDciApiServer(Controller):
                         }
                     )
         return search_responses
+
+    def search_page(self, domain, pagination):
+        """
+        The function searches one page of registrants and updates the pagination information.
+
+        With a cursor, the page is read with a keyset condition on the id instead of an offset, so
+        that deep pages cost the same as the first one. The total is counted once per search and
+        cached for a short time.
+
+        :param domain: The domain of the search
+        :param pagination: The pagination dictionary of the response
+        :return: the records of the page.
+        """
+        partner_model = request.env["res.partner"].sudo()
+        limit = pagination.get("limit")
+        pagination["total_records"] = get_cached_count(partner_model, domain)
+
+        if "cursor" in pagination:
+            records = partner_model.search(
+                AND([domain, [("id", ">", decode_cursor(pagination["cursor"]))]]),
+                order="id",
+                limit=limit,
+            )
+            if len(records) == limit:
+                pagination["next_cursor"] = encode_cursor(records[-1].id)
+            return records
+
+        offset = (pagination.get("page") - 1) * limit
+        pagination["total_pages"] = (pagination["total_records"] + limit - 1) // limit
+        return partner_model.search(domain, offset=offset, limit=limit)
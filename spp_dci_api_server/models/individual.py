@@ -1,9 +1,72 @@
+from collections import defaultdict
+
 from odoo import models
 
 
 class SPPIndividualCustom(models.Model):
     _inherit = "res.partner"
 
+    DCI_INDIVIDUAL_FIELDS = ["birthdate", "given_name", "family_name", "gender", "birth_place", "email"]
+
+    def _get_dci_related_data(self):
+        """
+        Load the identifiers, phone numbers and households of the individuals and of their groups
+        with a fixed number of queries, whatever the size of the recordset.
+
+        :return: a tuple (identifiers, phone_numbers, households) of dictionaries keyed by partner id.
+        """
+        self.fetch(self.DCI_INDIVIDUAL_FIELDS)
+        memberships = self.individual_membership_ids
+        memberships.fetch(["individual", "group"])
+        groups = memberships.group
+        groups.fetch(["name"])
+        partners = self | groups
+
+        reg_ids = partners.reg_ids
+        reg_ids.fetch(["partner_id", "id_type", "value"])
+        reg_ids.id_type.fetch(["name"])
+        phone_number_ids = partners.phone_number_ids
+        phone_number_ids.fetch(["partner_id", "phone_no", "country_id"])
+        phone_number_ids.country_id.fetch(["name", "code"])
+
+        identifiers = defaultdict(list)
+        for reg_id in reg_ids:
+            if reg_id.value and reg_id.id_type and reg_id.id_type.name:
+                identifiers[reg_id.partner_id.id].append(
+                    {
+                        "name": reg_id.id_type.name,
+                        "identifier": reg_id.value,
+                    }
+                )
+
+        phone_numbers = defaultdict(list)
+        for phone_number_id in phone_number_ids:
+            country = phone_number_id.country_id
+            phone_numbers[phone_number_id.partner_id.id].append(
+                {
+                    "phone": phone_number_id.phone_no,
+                    "country": {
+                        "id": country.id,
+                        "name": country.name,
+                        "code": country.code,
+                    }
+                    if country
+                    else {},
+                }
+            )
+
+        households = defaultdict(list)
+        for membership_id in memberships:
+            group = membership_id.group
+            households[membership_id.individual.id].append(
+                {
+                    "name": group.name,
+                    "identifier": identifiers[group.id],
+                    "phoneNumbers": phone_numbers[group.id],
+                }
+            )
+        return identifiers, phone_numbers, households
+
     def get_dci_individual_registry_data(self):
         """
         The function `get_dci_individual_registry_data` retrieves individual registry data and returns
@@ -12,69 +75,15 @@ class SPPIndividualCustom(models.Model):
         Each dictionary contains the following key-value pairs:
         """
         reg_records = []
+        if not self:
+            return reg_records
 
+        identifiers, phone_numbers, households = self._get_dci_related_data()
         for rec in self:
-            identifier = []
-            for reg_id in rec.reg_ids:
-                if reg_id.value and reg_id.id_type and reg_id.id_type.name:
-                    identifier.append(
-                        {
-                            "name": reg_id.id_type.name,
-                            "identifier": reg_id.value,
-                        }
-                    )
+            identifier = identifiers[rec.id]
             if not identifier:
                 continue
 
-            phone_numbers = []
-            for phone_number_id in rec.phone_number_ids:
-                phone_numbers.append(
-                    {
-                        "phone": phone_number_id.phone_no,
-                        "country": {
-                            "id": phone_number_id.country_id.id,
-                            "name": phone_number_id.country_id.name,
-                            "code": phone_number_id.country_id.code,
-                        }
-                        if phone_number_id.country_id
-                        else {},
-                    }
-                )
-
-            households = []
-            for membership_id in rec.individual_membership_ids:
-                household = {}
-                group = membership_id.group
-                household["name"] = group.name
-
-                hh_identifier = []
-                for reg_id in group.reg_ids:
-                    if reg_id.value and reg_id.id_type and reg_id.id_type.name:
-                        hh_identifier.append(
-                            {
-                                "name": reg_id.id_type.name,
-                                "identifier": reg_id.value,
-                            }
-                        )
-                household["identifier"] = hh_identifier
-
-                hh_phone_numbers = []
-                for phone_number_id in group.phone_number_ids:
-                    hh_phone_numbers.append(
-                        {
-                            "phone": phone_number_id.phone_no,
-                            "country": {
-                                "id": phone_number_id.country_id.id,
-                                "name": phone_number_id.country_id.name,
-                                "code": phone_number_id.country_id.code,
-                            }
-                            if phone_number_id.country_id
-                            else {},
-                        }
-                    )
-                household["phoneNumbers"] = hh_phone_numbers
-                households.append(household)
-
             reg_records.append(
                 {
                     "identifier": identifier,
@@ -84,8 +93,8 @@ class SPPIndividualCustom(models.Model):
                     "sex": rec.gender.lower() if rec.gender else "",
                     "birthPlace": rec.birth_place,
                     "email": rec.email,
-                    "phoneNumbers": phone_numbers,
-                    "households": households,
+                    "phoneNumbers": phone_numbers[rec.id],
+                    "households": households[rec.id],
                 }
             )
         return reg_records
@@ -1,2 +1,3 @@
 from . import test_client_credentials
 from . import test_individual
+from . import test_pagination
@@ -56,3 +56,29 @@ class IndividualTest(TransactionCase):
         self.assertEqual(reg_records[0]["birthDate"], "False")
         self.assertEqual(reg_records[0]["givenName"], "Chin")
         self.assertEqual(reg_records[0]["familyName"], "Franco")
+
+    def test_get_dci_individual_registry_data_query_count(self):
+        group = self.env["res.partner"].create({"name": "Franco Household", "is_group": True, "is_registrant": True})
+        individuals = self.individual_id | self.individual_2_id
+        for individual in individuals:
+            self.env["g2p.group.membership"].create({"group": group.id, "individual": individual.id})
+        self.env["g2p.reg.id"].create(
+            [
+                {"partner_id": self.individual_2_id.id, "id_type": self.id_type_id.id, "value": "0987654321"},
+                {"partner_id": group.id, "id_type": self.id_type_id.id, "value": "HH-001"},
+            ]
+        )
+
+        def count_queries(records):
+            self.env.invalidate_all()
+            start = self.env.cr.sql_log_count
+            reg_records = records.get_dci_individual_registry_data()
+            return self.env.cr.sql_log_count - start, reg_records
+
+        single_count, reg_records = count_queries(self.individual_id)
+        self.assertEqual(reg_records[0]["households"][0]["name"], "Franco Household")
+        self.assertEqual(reg_records[0]["households"][0]["identifier"][0]["identifier"], "HH-001")
+
+        page_count, reg_records = count_queries(individuals)
+        self.assertEqual(len(reg_records), 2)
+        self.assertEqual(page_count, single_count)
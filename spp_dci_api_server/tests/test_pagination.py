@@ -0,0 +1,21 @@
+from odoo.tests.common import TransactionCase
+
+from ..tools.pagination import InvalidCursorError, decode_cursor, encode_cursor, get_cached_count
+
+
+class PaginationTest(TransactionCase):
+    def test_cursor(self):
+        self.assertEqual(decode_cursor(encode_cursor(42)), 42)
+        self.assertEqual(decode_cursor(""), 0)
+        with self.assertRaises(InvalidCursorError):
+            decode_cursor("not a cursor")
+
+    def test_get_cached_count(self):
+        partner_model = self.env["res.partner"]
+        domain = [("name", "=", "DCI Pagination Test")]
+        self.assertEqual(get_cached_count(partner_model, domain), 0)
+
+        partner_model.create({"name": "DCI Pagination Test"})
+        with self.assertQueryCount(0):
+            self.assertEqual(get_cached_count(partner_model, domain), 0)
+        self.assertEqual(get_cached_count(partner_model, domain + [("active", "=", True)]), 1)
@@ -1 +1,2 @@
 from . import constants
+from . import pagination
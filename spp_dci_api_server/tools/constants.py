@@ -23,3 +23,7 @@ REG_TYPE_CHOICES = [INDIVIDUAL]
 PREDICATE = "predicate"
 
 ALLOWED_QUERY_TYPE = [PREDICATE]
+
+# Number of seconds the total number of records of a search is cached
+COUNT_CACHE_TTL = 60
+COUNT_CACHE_SIZE = 1000
@@ -0,0 +1,61 @@
+import base64
+import hashlib
+import json
+import threading
+import time
+
+from . import constants
+
+_count_cache = {}
+_count_cache_lock = threading.Lock()
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(last_id):
+    """Return the opaque cursor pointing after the record `last_id`."""
+    payload = json.dumps({"id": last_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor):
+    """Return the id of the last record of the previous page, or 0 for an empty cursor."""
+    if not cursor:
+        return 0
+    try:
+        last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))["id"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(cursor) from e
+    if not isinstance(last_id, int) or last_id < 0:
+        raise InvalidCursorError(cursor)
+    return last_id
+
+
+def get_cached_count(model, domain):
+    """
+    Return the number of records of `model` matching `domain`.
+
+    The count is cached per database and domain for COUNT_CACHE_TTL seconds, so paging through
+    the same search does not count the whole result set again for every page.
+    """
+    fingerprint = hashlib.sha256(
+        json.dumps([model.env.cr.dbname, model._name, domain], default=str).encode()
+    ).hexdigest()
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(fingerprint)
+        if cached and cached[1] > now:
+            return cached[0]
+
+    count = model.search_count(domain)
+
+    with _count_cache_lock:
+        if len(_count_cache) >= constants.COUNT_CACHE_SIZE:
+            expired = [key for key, (_count, expiry) in _count_cache.items() if expiry <= now]
+            # Drop the oldest entry when nothing has expired yet
+            for key in expired or [next(iter(_count_cache))]:
+                del _count_cache[key]
+        _count_cache[fingerprint] = (count, now + constants.COUNT_CACHE_TTL)
+    return count
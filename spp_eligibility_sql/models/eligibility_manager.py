@@ -1,10 +1,13 @@
 # Part of OpenSPP. See LICENSE file for full copyright and licensing details.
+import json
 import logging
+import time
+
+import psycopg2.errors
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
-
-from odoo.addons.queue_job.delay import group
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
@@ -26,6 +29,15 @@ class SQLEligibilityManager(models.Model):
     _inherit = ["g2p.program_membership.manager", "g2p.manager.source.mixin"]
     _description = "SQL-based Eligibility"
 
+    # Maximum number of memberships inserted by one statement
+    IMPORT_BATCH_SIZE = 10000
+    # Temporary table holding the registrants returned by the SQL query during an import
+    IMPORT_TABLE = "spp_eligibility_sql_import"
+    # Maximum time, in milliseconds, spent counting the records of a query being validated
+    VALIDATION_STATEMENT_TIMEOUT = 30000
+    # Number of record IDs shown as a sample of a validated query
+    PREVIEW_SIZE = 10
+
     sql_query = fields.Text(string="SQL Query")
     sql_query_valid = fields.Selection(
         [
@@ -39,6 +51,9 @@ class SQLEligibilityManager(models.Model):
     )
     sql_query_valid_message = fields.Text("Query Validation Message")
     sql_record_count = fields.Integer("Record Count", default=0)
+    sql_query_cost = fields.Float("Estimated Query Cost", readonly=True)
+    sql_query_runtime = fields.Float("Count Runtime (seconds)", readonly=True)
+    sql_query_preview = fields.Char("Sample Record IDs", readonly=True)
 
     @api.onchange("sql_query")
     def _sql_query_onchange(self):
@@ -53,6 +68,9 @@ class SQLEligibilityManager(models.Model):
                     "sql_query_valid": "recheck",
                     "sql_record_count": 0,
                     "sql_query_valid_message": None,
+                    "sql_query_cost": 0,
+                    "sql_query_runtime": 0,
+                    "sql_query_preview": None,
                 }
             )
 
@@ -146,37 +164,80 @@ class SQLEligibilityManager(models.Model):
         :return:
         """
         for rec in self:
-            sql_query = rec._generate_sql_query()
-            record_count = 0
-            try:
-                # Add a parameter to comply with pre-commit sql-injection-error
-                self._cr.execute(sql_query)  # pylint: disable=sql-injection
-            except Exception as e:
-                _logger.debug("Database Query Error: %s" % e)
-                sql_query_valid = "invalid"
-                sql_query_valid_message = _("Database Query Error: %s") % e
-                self._cr.rollback()
-            else:
-                beneficiaries = self._cr.dictfetchall()
-                # Convert List Dict to List
-                if beneficiaries:
-                    if not beneficiaries[0].get("id"):
-                        sql_query_valid = "invalid"
-                        sql_query_valid_message = _("The SQL Query must return the record ID field.")
-                    else:
-                        record_count = len(beneficiaries)
-                        sql_query_valid = "valid"
-                        sql_query_valid_message = None
-                else:
-                    sql_query_valid = "valid"
-                    sql_query_valid_message = _("The SQL Query is valid but it did not return any record.")
-            rec.update(
-                {
-                    "sql_query_valid": sql_query_valid,
-                    "sql_query_valid_message": sql_query_valid_message,
-                    "sql_record_count": record_count,
-                }
+            rec.update(self._check_sql_query(rec.sql_query, rec._generate_sql_query()))
+
+    @api.model
+    def _check_sql_query(self, user_query, sql_query, preview=True):
+        """
+        Validate a SQL Query without fetching its records.
+        The query is checked with EXPLAIN and LIMIT 0, then its records are counted within
+        VALIDATION_STATEMENT_TIMEOUT milliseconds.
+        The statements embedding the query are executed without parameters, so that the
+        literal % of the user defined query are not taken as placeholders.
+        :param user_query: string user defined query, it must return the id column
+        :param sql_query: string query generated from the user defined query
+        :param preview: boolean, also store a sample of the record IDs
+        :return: dict of the validation fields values
+        """
+        vals = {
+            "sql_query_valid": "valid",
+            "sql_query_valid_message": None,
+            "sql_record_count": 0,
+            "sql_query_cost": 0,
+            "sql_query_runtime": 0,
+            "sql_query_preview": None,
+        }
+        cr = self._cr
+        try:
+            with cr.savepoint():
+                # Neither statement runs the query
+                cr.execute(f"EXPLAIN (FORMAT JSON) {sql_query}")  # pylint: disable=sql-injection
+                plan = cr.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                vals["sql_query_cost"] = plan[0]["Plan"]["Total Cost"]
+                cr.execute(f"SELECT * FROM ({sql_query}) AS tbl LIMIT 0")  # pylint: disable=sql-injection
+                # The generated query always returns res_partner.id, the columns can only be
+                # read from the user defined query
+                cr.execute(f"SELECT * FROM ({user_query}) AS tbl LIMIT 0")  # pylint: disable=sql-injection
+                columns = [column.name for column in cr.description]
+        except Exception as e:
+            _logger.debug("Database Query Error: %s" % e)
+            vals.update(sql_query_valid="invalid", sql_query_valid_message=_("Database Query Error: %s") % e)
+            return vals
+        if "id" not in columns:
+            vals.update(
+                sql_query_valid="invalid",
+                sql_query_valid_message=_("The SQL Query must return the record ID field."),
             )
+            return vals
+
+        cr.execute("SHOW statement_timeout")
+        statement_timeout = cr.fetchone()[0]
+        start = time.monotonic()
+        try:
+            with cr.savepoint():
+                cr.execute(SQL("SET LOCAL statement_timeout = %s", self.VALIDATION_STATEMENT_TIMEOUT))
+                cr.execute(f"SELECT count(*) FROM ({sql_query}) AS tbl")  # pylint: disable=sql-injection
+                vals["sql_record_count"] = cr.fetchone()[0]
+                if preview and vals["sql_record_count"]:
+                    cr.execute(
+                        f"SELECT id FROM ({sql_query}) AS tbl LIMIT {int(self.PREVIEW_SIZE)}"  # pylint: disable=sql-injection
+                    )
+                    vals["sql_query_preview"] = ", ".join(str(row[0]) for row in cr.fetchall())
+                cr.execute(SQL("SET LOCAL statement_timeout = %s", statement_timeout))
+        except psycopg2.errors.QueryCanceled:
+            vals["sql_query_valid_message"] = _(
+                "The SQL Query is valid but counting its records took more than %s seconds."
+            ) % (self.VALIDATION_STATEMENT_TIMEOUT / 1000)
+        except psycopg2.Error as e:
+            _logger.debug("Database Query Error: %s" % e)
+            vals.update(sql_query_valid="invalid", sql_query_valid_message=_("Database Query Error: %s") % e)
+        else:
+            if not vals["sql_record_count"]:
+                vals["sql_query_valid_message"] = _("The SQL Query is valid but it did not return any record.")
+        vals["sql_query_runtime"] = time.monotonic() - start
+        return vals
 
     def enroll_eligible_registrants(self, program_memberships):
         _logger.debug("-" * 100)
@@ -205,36 +266,117 @@ class SQLEligibilityManager(models.Model):
     def import_eligible_registrants(self, state="draft"):
         ben_count = 0
         for rec in self:
-            new_beneficiaries = rec._get_beneficiaries_sql_query()
-            _logger.debug("Found %s beneficiaries", len(new_beneficiaries))
+            ben_count = rec._import_eligible_registrants_sql(state=state)
+            _logger.debug("Imported %s beneficiaries", ben_count)
 
-            # Exclude already added beneficiaries
-            beneficiary_ids = rec.program_id.get_beneficiaries().mapped("partner_id.id")
-            _logger.debug("Excluding %s beneficiaries", len(beneficiary_ids))
+            # Compute Statistics
+            rec.program_id._compute_eligible_beneficiary_count()
+            rec.program_id._compute_beneficiary_count()
 
-            new_beneficiaries = list(set(new_beneficiaries).difference(beneficiary_ids))
-            _logger.debug("Finally %s beneficiaries", len(new_beneficiaries))
+        return ben_count
 
-            ben_count = len(new_beneficiaries)
-            if ben_count < 1000:
-                rec._import_registrants(new_beneficiaries, state=state, do_count=True)
-            else:
-                rec._import_registrants_async(new_beneficiaries, state=state)
+    def _import_eligible_registrants_sql(self, state="draft"):
+        """
+        Enroll the registrants returned by the SQL query that are not members of the program yet.
+        The registrants are selected, deduplicated and inserted by PostgreSQL, in batches of
+        IMPORT_BATCH_SIZE, without loading them in Python.
+        :param state: state of the new program memberships
+        :return: int number of new program memberships
+        """
+        self.ensure_one()
+        if self.sql_query_valid != "valid":
+            raise UserError(_("The SQL Query is not valid. Be sure to validate this in the Eligibility Manager."))
 
+        membership_model = self.env["g2p.program_membership"]
+        # Make the pending ORM changes visible to the queries
+        self.env.flush_all()
+
+        # Run the user defined query once, and keep its result for the batches
+        table = SQL.identifier(self.IMPORT_TABLE)
+        self._cr.execute(SQL("DROP TABLE IF EXISTS %s", table))
+        try:
+            # Executed without parameters, so that the literal % of the query are kept
+            self._cr.execute(
+                f'CREATE TEMPORARY TABLE "{self.IMPORT_TABLE}" ON COMMIT DROP AS {self._generate_sql_query()}'
+            )  # pylint: disable=sql-injection
+        except Exception as e:
+            raise UserError(_("Database Query Error: %s") % e) from e
+        self._cr.execute(SQL("CREATE INDEX ON %s (id)", table))
+
+        columns, values = self._get_membership_insert_values(state)
+        ben_count = 0
+        last_id = 0
+        while True:
+            self._cr.execute(
+                SQL(
+                    """
+                    WITH batch AS (
+                        SELECT id FROM %(table)s WHERE id > %(last_id)s ORDER BY id LIMIT %(limit)s
+                    ), inserted AS (
+                        INSERT INTO g2p_program_membership (partner_id, %(columns)s)
+                        SELECT batch.id, %(values)s
+                        FROM batch
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM g2p_program_membership membership
+                            WHERE membership.program_id = %(program_id)s AND membership.partner_id = batch.id
+                        )
+                        ON CONFLICT DO NOTHING
+                        RETURNING id
+                    )
+                    SELECT (SELECT max(id) FROM batch), ARRAY(SELECT id FROM inserted)
+                    """,
+                    table=table,
+                    last_id=last_id,
+                    limit=self.IMPORT_BATCH_SIZE,
+                    columns=SQL(", ").join(SQL.identifier(column) for column in columns),
+                    values=SQL(", ").join(SQL("%s", value) for value in values),
+                    program_id=self.program_id.id,
+                )
+            )
+            last_id, membership_ids = self._cr.fetchone()
+            if last_id is None:
+                break
+            if membership_ids:
+                ben_count += len(membership_ids)
+                # Let the ORM compute the stored fields of the new memberships and their dependencies
+                memberships = membership_model.browse(membership_ids)
+                for field in membership_model._fields.values():
+                    if field.store and field.compute:
+                        self.env.add_to_compute(field, memberships)
+                memberships.modified(["partner_id", *columns], create=True)
+                membership_model.flush_model()
+                self.env.invalidate_all()
+            _logger.debug("Imported beneficiaries up to registrant %s", last_id)
+
+        self._cr.execute(SQL("DROP TABLE %s", table))
         return ben_count
 
-    def _import_registrants_async(self, new_beneficiaries, state="draft"):
-        self.ensure_one()
-        program = self.program_id
-        program.message_post(body="Import of %s beneficiaries started." % len(new_beneficiaries))
-        program.write({"locked": True, "locked_reason": "Importing beneficiaries"})
-
-        jobs = []
-        for i in range(0, len(new_beneficiaries), 10000):
-            jobs.append(self.delayable()._import_registrants(new_beneficiaries[i : i + 10000], state))
-        main_job = group(*jobs)
-        main_job.on_done(self.delayable().mark_import_as_done())
-        main_job.delay()
+    def _get_membership_insert_values(self, state):
+        """
+        Return the columns and values of the program memberships inserted by the SQL import.
+        The defaults of the stored fields of g2p.program_membership are included.
+        :param state: state of the new program memberships
+        :return: tuple (list of column names, list of values)
+        """
+        membership_model = self.env["g2p.program_membership"]
+        now = fields.Datetime.now()
+        vals = {
+            "program_id": self.program_id.id,
+            "state": state,
+            "create_uid": self.env.uid,
+            "create_date": now,
+            "write_uid": self.env.uid,
+            "write_date": now,
+        }
+        excluded = {"id", "partner_id", *vals}
+        default_fields = [
+            name
+            for name, field in membership_model._fields.items()
+            if field.store and field.column_type and not field.compute and name not in excluded
+        ]
+        for name, value in membership_model.default_get(default_fields).items():
+            vals[name] = membership_model._fields[name].convert_to_column(value, membership_model)
+        return list(vals), list(vals.values())
 
     def mark_import_as_done(self):
         self.ensure_one()
@@ -90,6 +90,31 @@ class TestSQLBasedEligibilityManager(TransactionCase):
         )
         self.assertEqual(self.sql_manager.sql_record_count, 0)
 
+    def test_check_sql_query(self):
+        self.sql_manager.sql_query = "select name from res_partner"
+        vals = self.sql_manager._check_sql_query(self.sql_manager.sql_query, self.sql_manager._generate_sql_query())
+        self.assertEqual(vals["sql_query_valid"], "invalid")
+        self.assertEqual(vals["sql_query_valid_message"], "The SQL Query must return the record ID field.")
+
+        self.sql_manager.sql_query = f"select id from res_partner where id = {self.partner.id}"
+        vals = self.sql_manager._check_sql_query(self.sql_manager.sql_query, self.sql_manager._generate_sql_query())
+        self.assertEqual(vals["sql_query_valid"], "valid")
+        self.assertEqual(vals["sql_record_count"], 1)
+        self.assertEqual(vals["sql_query_preview"], str(self.partner.id))
+        self.assertGreater(vals["sql_query_cost"], 0)
+
+        # Literal % are not taken as query parameters
+        self.sql_manager.sql_query = "select id from res_partner where name ilike '%Test Partner%'"
+        vals = self.sql_manager._check_sql_query(self.sql_manager.sql_query, self.sql_manager._generate_sql_query())
+        self.assertEqual(vals["sql_query_valid"], "valid")
+        self.assertEqual(vals["sql_record_count"], 1)
+
+        # Errors raised while running the query invalidate it
+        self.sql_manager.sql_query = "select id from res_partner where id / (id - id) > 0"
+        vals = self.sql_manager._check_sql_query(self.sql_manager.sql_query, self.sql_manager._generate_sql_query())
+        self.assertEqual(vals["sql_query_valid"], "invalid")
+        self.assertIn("Database Query Error", vals["sql_query_valid_message"])
+
     def test_enroll_eligible_registrants(self):
         res = self.sql_manager.enroll_eligible_registrants(self.program_id.program_membership_ids)
 
@@ -111,16 +136,24 @@ class TestSQLBasedEligibilityManager(TransactionCase):
 
         self.assertEqual(ben_count, 1)
 
-    def test_import_registrants_async(self):
+    def test_import_eligible_registrants_sql(self):
         new_partner = self.env["res.partner"].create({"name": "New Test Partner", "is_group": False})
-        current_count = len(self.env["queue.job"].search([]))
 
-        self.sql_manager._import_registrants_async(new_partner.ids)
+        self.sql_manager.sql_query = f"select id from res_partner where id in ({self.partner.id}, {new_partner.id})"
+        self.sql_manager.sql_query_valid = "valid"
+        ben_count = self.sql_manager._import_eligible_registrants_sql(state="enrolled")
+
+        self.assertEqual(ben_count, 1)
+        membership = self.program_id.program_membership_ids.filtered(lambda m: m.partner_id == new_partner)
+        self.assertEqual(membership.state, "enrolled")
+        self.assertEqual(len(self.program_id.program_membership_ids), 2)
+
+        # Existing members are not imported again
+        self.assertEqual(self.sql_manager._import_eligible_registrants_sql(), 0)
 
-        # 2 jobs are created for the import and the verification
-        # - the actual job
-        # - the function after running the actual job
-        self.assertEqual(current_count + 2, len(self.env["queue.job"].search([])))
+        # Literal % are not taken as query parameters
+        self.sql_manager.sql_query = "select id from res_partner where name ilike '%Test Partner%'"
+        self.assertEqual(self.sql_manager._import_eligible_registrants_sql(), 0)
 
     def test_mark_import_as_done(self):
         self.sql_manager.mark_import_as_done()
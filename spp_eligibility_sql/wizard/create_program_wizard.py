@@ -90,35 +90,14 @@ class SPPCreateNewProgramWiz(models.TransientModel):
         If valid, it must return the res_partner id field and must contain at least 1 record.
         :return:
         """
+        manager_model = self.env["g2p.program_membership.manager.sql"]
         for rec in self:
-            sql_query = rec._generate_sql_query()
-            record_count = 0
-            try:
-                self._cr.execute(sql_query)  # pylint: disable=sql-injection
-            except Exception as e:
-                _logger.debug("SQL-based Eligibility Wizard: Database Query Error: %s" % e)
-                sql_query_valid = "invalid"
-                sql_query_valid_message = _("Database Query Error: %s") % e
-                self._cr.rollback()
-            else:
-                beneficiaries = self._cr.dictfetchall()
-                # Convert List Dict to List
-                if beneficiaries:
-                    if not beneficiaries[0].get("id"):
-                        sql_query_valid = "invalid"
-                        sql_query_valid_message = _("The SQL Query must return the record ID field.")
-                    else:
-                        record_count = len(beneficiaries)
-                        sql_query_valid = "valid"
-                        sql_query_valid_message = None
-                else:
-                    sql_query_valid = "valid"
-                    sql_query_valid_message = _("The SQL Query is valid but it did not return any record.")
+            vals = manager_model._check_sql_query(rec.sql_query, rec._generate_sql_query(), preview=False)
             rec.update(
                 {
-                    "sql_query_valid": sql_query_valid,
-                    "sql_query_valid_message": sql_query_valid_message,
-                    "sql_record_count": record_count,
+                    "sql_query_valid": vals["sql_query_valid"],
+                    "sql_query_valid_message": vals["sql_query_valid_message"],
+                    "sql_record_count": vals["sql_record_count"],
                     "state": "step1",
                 }
             )
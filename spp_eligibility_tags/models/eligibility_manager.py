@@ -4,8 +4,6 @@ import logging
 
 from odoo import _, api, fields, models
 
-from odoo.addons.queue_job.delay import group
-
 _logger = logging.getLogger(__name__)
 
 
@@ -101,12 +99,7 @@ class TagBasedEligibilityManager(models.Model):
 
     def import_eligible_registrants(self, state="draft"):
         for rec in self:
-            domain = rec._prepare_eligible_domain()
-            new_beneficiaries = self.env["res.partner"].search(domain)
-
-            # Exclude already added beneficiaries
-            beneficiary_ids = rec.program_id.get_beneficiaries().mapped("partner_id")
-            new_beneficiaries = new_beneficiaries - beneficiary_ids
+            new_beneficiaries = rec._get_new_beneficiaries()
 
             new_beneficiaries_count = len(new_beneficiaries)
 
@@ -118,17 +111,7 @@ class TagBasedEligibilityManager(models.Model):
             return new_beneficiaries_count
 
     def _import_registrants_async(self, new_beneficiaries, state="draft"):
-        self.ensure_one()
-        program = self.program_id
-        program.message_post(body="Import of %s beneficiaries started." % len(new_beneficiaries))
-        program.write({"locked": True, "locked_reason": "Importing beneficiaries"})
-
-        jobs = []
-        for i in range(0, len(new_beneficiaries), self.MAX_ROW_JOB_QUEUE):
-            jobs.append(self.delayable()._import_registrants(new_beneficiaries[i : i + self.MAX_ROW_JOB_QUEUE], state))
-        main_job = group(*jobs)
-        main_job.on_done(self.delayable().mark_import_as_done())
-        main_job.delay()
+        self._import_registrants_by_id_ranges(new_beneficiaries, state=state)
 
     def mark_import_as_done(self):
         self.ensure_one()
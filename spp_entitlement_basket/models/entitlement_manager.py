@@ -75,6 +75,11 @@ class SPPBasketEntitlementManager(models.Model):
         default=_default_warehouse_id,
         check_company=True,
     )
+    merge_stock_moves = fields.Boolean(
+        default=False,
+        help="Merge the stock moves of the entitlements approved together per warehouse, product and service "
+        "point. Merged stock moves are not linked to individual entitlements.",
+    )
     company_id = fields.Many2one("res.company", string="Company", related="program_id.company_id")
 
     # Group able to validate the payment
@@ -297,26 +302,27 @@ class SPPBasketEntitlementManager(models.Model):
         state_err = 0
         message = ""
         sw = 0
-        for rec in entitlements:
-            if rec.state in ("draft", "pending_validation"):
-                if rec.manage_inventory:
-                    # TODO: check if there is enough stocks to allocate
-                    rec._action_launch_stock_rule()
-                rec.update(
-                    {
-                        "state": "approved",
-                        "date_approved": fields.Date.today(),
-                    }
-                )
-            else:
-                state_err += 1
-                if sw == 0:
-                    sw = 1
-                    message = _("Entitlement State Error! Entitlements not in 'pending validation' state:\n")
-                message += _("Program: %(prg)s, Beneficiary: %(partner)s.\n") % {
-                    "prg": rec.cycle_id.program_id.name,
-                    "partner": rec.partner_id.name,
-                }
+        entitlements_to_approve = entitlements.filtered(lambda rec: rec.state in ("draft", "pending_validation"))
+        for rec in entitlements - entitlements_to_approve:
+            state_err += 1
+            if sw == 0:
+                sw = 1
+                message = _("Entitlement State Error! Entitlements not in 'pending validation' state:\n")
+            message += _("Program: %(prg)s, Beneficiary: %(partner)s.\n") % {
+                "prg": rec.cycle_id.program_id.name,
+                "partner": rec.partner_id.name,
+            }
+
+        # TODO: check if there is enough stocks to allocate
+        entitlements_to_approve.filtered("manage_inventory")._action_launch_stock_rule_batched(
+            merge_moves=self.merge_stock_moves
+        )
+        entitlements_to_approve.write(
+            {
+                "state": "approved",
+                "date_approved": fields.Date.today(),
+            }
+        )
 
         return (state_err, message)
 
@@ -38,6 +38,8 @@ class G2PCashEntitlementManager(models.Model):
 
     # Set to True so that the UI will display the payment management components
     IS_CASH_ENTITLEMENT = True
+    # Number of entitlements inserted per create() call in prepare_entitlements
+    ENTITLEMENT_CREATE_BATCH_SIZE = 1000
 
     # Cash Entitlement Manager
     evaluate_one_item = fields.Boolean(default=False)
@@ -66,6 +68,10 @@ class G2PCashEntitlementManager(models.Model):
         Cash Entitlement Manager :meth:`prepare_entitlements`.
         This method is used to prepare the entitlement list of the beneficiaries.
 
+        The amounts of every entitlement item are evaluated on the whole set of beneficiaries:
+        the multiplier columns and the ID documents are prefetched once and the entitlements
+        are inserted with batched creates of :attr:`ENTITLEMENT_CREATE_BATCH_SIZE` records.
+
         :param cycle: The cycle.
         :param beneficiaries: The beneficiaries.
         :return:
@@ -75,6 +81,19 @@ class G2PCashEntitlementManager(models.Model):
 
         all_beneficiaries_ids = beneficiaries.mapped("partner_id.id")
 
+        # Get beneficiaries_with_entitlements to prevent generating
+        # the same entitlement for beneficiaries
+        beneficiaries_with_entitlements = set(
+            self.env["g2p.entitlement"]
+            .search(
+                [
+                    ("cycle_id", "=", cycle.id),
+                    ("partner_id", "in", all_beneficiaries_ids),
+                ]
+            )
+            .mapped("partner_id.id")
+        )
+
         new_entitlements_to_create = {}
         for rec in self.entitlement_item_ids:
             if rec.condition:
@@ -84,70 +103,64 @@ class G2PCashEntitlementManager(models.Model):
             else:
                 beneficiaries_ids = all_beneficiaries_ids
 
-            beneficiaries_with_entitlements = (
-                self.env["g2p.entitlement"]
-                .search(
-                    [
-                        ("cycle_id", "=", cycle.id),
-                        ("partner_id", "in", beneficiaries_ids),
-                    ]
-                )
-                .mapped("partner_id.id")
+            beneficiaries_with_entitlements_to_create = self.env["res.partner"].browse(
+                [
+                    beneficiaries_id
+                    for beneficiaries_id in beneficiaries_ids
+                    if beneficiaries_id not in beneficiaries_with_entitlements
+                ]
             )
-            entitlements_to_create = [
-                beneficiaries_id
-                for beneficiaries_id in beneficiaries_ids
-                if beneficiaries_id not in beneficiaries_with_entitlements
-            ]
-
-            entitlement_start_validity = cycle.start_date
-            entitlement_end_validity = cycle.end_date
-            entitlement_currency = rec.currency_id.id
-
-            beneficiaries_with_entitlements_to_create = self.env["res.partner"].browse(entitlements_to_create)
-
-            for beneficiary_id in beneficiaries_with_entitlements_to_create:
-                if rec.multiplier_field:
-                    # Get the multiplier value from multiplier_field else return the default multiplier=1
-                    multiplier = beneficiary_id.mapped(rec.multiplier_field.name)
-                    if multiplier:
-                        multiplier = multiplier[0] or 0
-                else:
-                    multiplier = 1
-                if rec.max_multiplier > 0 and multiplier > rec.max_multiplier:
-                    multiplier = rec.max_multiplier
-                amount = rec.amount * float(multiplier)
 
+            for beneficiary_id, amount in rec._get_beneficiary_amounts(beneficiaries_with_entitlements_to_create):
                 # Compute the sum of cash entitlements
-                if beneficiary_id.id in new_entitlements_to_create:
-                    amount = amount + new_entitlements_to_create[beneficiary_id.id]["initial_amount"]
+                if beneficiary_id in new_entitlements_to_create:
+                    amount = amount + new_entitlements_to_create[beneficiary_id]["initial_amount"]
                 # Check if amount > max_amount; ignore if max_amount is set to 0
                 if self.max_amount > 0.0:
-                    if amount > self.max_amount:
-                        amount = self.max_amount
-
-                new_entitlements_to_create[beneficiary_id.id] = {
-                    "cycle_id": cycle.id,
-                    "partner_id": beneficiary_id.id,
-                    "initial_amount": amount,
-                    "currency_id": entitlement_currency,
-                    "state": "draft",
-                    "is_cash_entitlement": True,
-                    "valid_from": entitlement_start_validity,
-                    "valid_until": entitlement_end_validity,
-                }
+                    amount = min(amount, self.max_amount)
+
+                if beneficiary_id in new_entitlements_to_create:
+                    # As each item used to rewrite the entitlement, the currency of the last item wins
+                    new_entitlements_to_create[beneficiary_id].update(
+                        {"initial_amount": amount, "currency_id": rec.currency_id.id}
+                    )
+                else:
+                    new_entitlements_to_create[beneficiary_id] = {
+                        "cycle_id": cycle.id,
+                        "partner_id": beneficiary_id,
+                        "initial_amount": amount,
+                        "currency_id": rec.currency_id.id,
+                        "state": "draft",
+                        "is_cash_entitlement": True,
+                        "valid_from": cycle.start_date,
+                        "valid_until": cycle.end_date,
+                    }
+
+        entitlements = []
+        new_beneficiaries = self.env["res.partner"].browse(list(new_entitlements_to_create))
+        self._prefetch_addl_entitlement_fields(new_beneficiaries)
+        for beneficiary_id in new_beneficiaries:
+            entitlement_fields = new_entitlements_to_create[beneficiary_id.id]
+            entitlement_fields["initial_amount"] = self._check_subsidy(entitlement_fields["initial_amount"])
+            # Create non-zero entitlements only
+            if entitlement_fields["initial_amount"] > 0.0:
                 # Check if there are additional fields to be added in entitlements
                 addl_fields = self._get_addl_entitlement_fields(beneficiary_id)
                 if addl_fields:
-                    new_entitlements_to_create[beneficiary_id.id].update(addl_fields)
+                    entitlement_fields.update(addl_fields)
+                entitlements.append(entitlement_fields)
 
         # Create entitlement records
-        for ent in new_entitlements_to_create:
-            initial_amount = new_entitlements_to_create[ent]["initial_amount"]
-            new_entitlements_to_create[ent]["initial_amount"] = self._check_subsidy(initial_amount)
-            # Create non-zero entitlements only
-            if new_entitlements_to_create[ent]["initial_amount"] > 0.0:
-                self.env["g2p.entitlement"].create(new_entitlements_to_create[ent])
+        for i in range(0, len(entitlements), self.ENTITLEMENT_CREATE_BATCH_SIZE):
+            self.env["g2p.entitlement"].create(entitlements[i : i + self.ENTITLEMENT_CREATE_BATCH_SIZE])
+
+    def _prefetch_addl_entitlement_fields(self, beneficiaries):
+        """
+        Load in one pass the data read by :meth:`_get_addl_entitlement_fields` so that
+        calling it for each beneficiary is served from the cache.
+        """
+        if self.id_type:
+            beneficiaries.mapped("reg_ids.id_type")
 
     def _get_addl_entitlement_fields(self, beneficiary_id):
         """
@@ -295,24 +308,40 @@ class G2PCashEntitlementManager(models.Model):
             }
         )
 
-        jobs = []
-        for i in range(0, entitlements_count, self.MAX_ROW_JOB_QUEUE):
-            # Needs to override
-            jobs.append(self.delayable()._validate_entitlements(cycle, entitlements[i : i + self.MAX_ROW_JOB_QUEUE]))
+        id_ranges = cycle.get_entitlement_id_ranges(
+            ["draft", "pending_validation"],
+            entitlement_model="g2p.entitlement",
+            chunk_size=self.MAX_ROW_JOB_QUEUE,
+        )
+        jobs = [
+            self.delayable()._validate_entitlements(cycle, min_id=min_id, max_id=max_id) for min_id, max_id in id_ranges
+        ]
+        if not jobs:
+            return self.mark_job_as_done(cycle, _("Entitlements Validated and Approved."))
         main_job = group(*jobs)
         main_job.on_done(self.delayable().mark_job_as_done(cycle, _("Entitlements Validated and Approved.")))
         main_job.delay()
 
-    def _validate_entitlements(self, cycle, entitlements):
+    def _validate_entitlements(self, cycle, entitlements=None, min_id=None, max_id=None):
         """Validate Cash Entitlements.
         Cash Entitlement Manager :meth:`_validate_entitlements`.
         Validate entitlements in a cycle.
 
         :param cycle: A recordset of cycle
-        :param entitlements: A recordset of entitlements to validate
+        :param entitlements: A recordset of entitlements to validate, the ones of the cycle
+            between min_id and max_id if not set
+        :param min_id: An integer value for the smallest entitlement ID to process
+        :param max_id: An integer value for the largest entitlement ID to process
         :return err: Integer number of errors
         :return message: String description of the error
         """
+        if entitlements is None:
+            entitlements = cycle.get_entitlements(
+                ["draft", "pending_validation"],
+                entitlement_model="g2p.entitlement",
+                min_id=min_id,
+                max_id=max_id,
+            )
         err, message = self.approve_entitlements(entitlements)
         if err:
             cycle.message_post(body=_(message))
@@ -362,67 +391,40 @@ class G2PCashEntitlementManager(models.Model):
         Cash Entitlement Manager :meth:`_approve_entitlements`.
         Approve selected entitlements.
 
+        The fund balance of each program is checked once for the whole batch and the
+        disbursement payments are created with a single batched create.
+
         :param entitlements: Selected entitlements to approve
         :return state_err: Integer number of errors
         :return message: String description of the errors
         """
-        amt = 0.0
         state_err = 0
         message = ""
         sw = 0
+        fund_err_message = None
+        to_approve = self.env["g2p.entitlement"]
+        # Remaining fund per program for this batch
+        fund_balances = {}
         for rec in entitlements:
             if rec.state in ("draft", "pending_validation"):
-                fund_balance = self.check_fund_balance(rec.cycle_id.program_id.id) - amt
+                program = rec.cycle_id.program_id
+                if program.id not in fund_balances:
+                    fund_balances[program.id] = self.check_fund_balance(program.id)
+                fund_balance = fund_balances[program.id]
                 if fund_balance >= rec.initial_amount:
-                    amt += rec.initial_amount
-                    # Prepare journal entry (account.move) via account.payment
-                    amount = rec.initial_amount
-                    new_service_fee = None
-                    if rec.transfer_fee > 0.0:
-                        amount -= rec.transfer_fee
-                        # Incurred Fees (transfer fees)
-                        payment = {
-                            "partner_id": rec.partner_id.id,
-                            "payment_type": "outbound",
-                            "amount": rec.transfer_fee,
-                            "currency_id": rec.journal_id.currency_id.id,
-                            "journal_id": rec.journal_id.id,
-                            "partner_type": "supplier",
-                            "ref": "Service Fee: Code: %s" % rec.code,
-                        }
-                        new_service_fee = self.env["account.payment"].create(payment)
-
-                    # Fund Disbursed (amount - transfer fees)
-                    payment = {
-                        "partner_id": rec.partner_id.id,
-                        "payment_type": "outbound",
-                        "amount": amount,
-                        "currency_id": rec.journal_id.currency_id.id,
-                        "journal_id": rec.journal_id.id,
-                        "partner_type": "supplier",
-                        "ref": "Fund disbursed to beneficiary: Code: %s" % rec.code,
-                    }
-                    new_payment = self.env["account.payment"].create(payment)
-
-                    rec.update(
-                        {
-                            "disbursement_id": new_payment.id,
-                            "service_fee_disbursement_id": new_service_fee and new_service_fee.id or None,
-                            "state": "approved",
-                            "date_approved": fields.Date.today(),
-                        }
-                    )
+                    fund_balances[program.id] -= rec.initial_amount
+                    to_approve |= rec
                 else:
-                    message = _(
+                    fund_err_message = _(
                         "The fund for the program: %(program)s [%(fund).2f] "
                         + "is insufficient for the entitlement: %(entitlement)s"
                     ) % {
-                        "program": rec.cycle_id.program_id.name,
+                        "program": program.name,
                         "fund": fund_balance,
                         "entitlement": rec.code,
                     }
-                    # Stop the process and return an error
-                    return (1, message)
+                    # Stop the process
+                    break
             else:
                 state_err += 1
                 if sw == 0:
@@ -433,8 +435,75 @@ class G2PCashEntitlementManager(models.Model):
                     "partner": rec.partner_id.name,
                 }
 
+        self._create_entitlement_payments(to_approve)
+
+        if fund_err_message:
+            # Return an error
+            return (1, fund_err_message)
         return (state_err, message)
 
+    def _create_entitlement_payments(self, entitlements):
+        """Create the payments of approved Cash Entitlements.
+        Cash Entitlement Manager :meth:`_create_entitlement_payments`.
+        Prepare the journal entries (account.move) via account.payment for all the entitlements
+        with one batched create, then link the payments and approve the entitlements.
+
+        :param entitlements: Entitlements to approve
+        :return:
+        """
+        if not entitlements:
+            return
+
+        payment_vals = []
+        service_fee_vals = []
+        service_fee_entitlements = self.env["g2p.entitlement"]
+        for rec in entitlements:
+            amount = rec.initial_amount
+            if rec.transfer_fee > 0.0:
+                amount -= rec.transfer_fee
+                # Incurred Fees (transfer fees)
+                service_fee_vals.append(
+                    {
+                        "partner_id": rec.partner_id.id,
+                        "payment_type": "outbound",
+                        "amount": rec.transfer_fee,
+                        "currency_id": rec.journal_id.currency_id.id,
+                        "journal_id": rec.journal_id.id,
+                        "partner_type": "supplier",
+                        "ref": "Service Fee: Code: %s" % rec.code,
+                    }
+                )
+                service_fee_entitlements |= rec
+
+            # Fund Disbursed (amount - transfer fees)
+            payment_vals.append(
+                {
+                    "partner_id": rec.partner_id.id,
+                    "payment_type": "outbound",
+                    "amount": amount,
+                    "currency_id": rec.journal_id.currency_id.id,
+                    "journal_id": rec.journal_id.id,
+                    "partner_type": "supplier",
+                    "ref": "Fund disbursed to beneficiary: Code: %s" % rec.code,
+                }
+            )
+
+        service_fees = self.env["account.payment"].create(service_fee_vals) if service_fee_vals else []
+        service_fee_map = dict(zip(service_fee_entitlements.ids, service_fees, strict=True))
+        payments = self.env["account.payment"].create(payment_vals)
+
+        date_approved = fields.Date.today()
+        for rec, new_payment in zip(entitlements, payments, strict=True):
+            new_service_fee = service_fee_map.get(rec.id)
+            rec.update(
+                {
+                    "disbursement_id": new_payment.id,
+                    "service_fee_disbursement_id": new_service_fee and new_service_fee.id or None,
+                    "state": "approved",
+                    "date_approved": date_approved,
+                }
+            )
+
     def open_entitlements_form(self, cycle):
         self.ensure_one()
         action = {
@@ -505,3 +574,26 @@ class G2PCashEntitlementItem(models.Model):
         string="Maximum number",
         help="0 means no limit",
     )
+
+    def _get_beneficiary_amounts(self, beneficiaries):
+        """Get the amount of this item for each beneficiary.
+        The multiplier field is read for all beneficiaries in a single query.
+
+        :param beneficiaries: Recordset of res.partner
+        :return: List of (beneficiary id, amount) tuples in the order of beneficiaries
+        """
+        self.ensure_one()
+        if self.multiplier_field:
+            # Get the multiplier value from multiplier_field else return the default multiplier=1
+            field_name = self.multiplier_field.name
+            multipliers = {row["id"]: row[field_name] or 0 for row in beneficiaries.read([field_name])}
+        else:
+            multipliers = dict.fromkeys(beneficiaries.ids, 1)
+
+        amounts = []
+        for beneficiary_id in beneficiaries.ids:
+            multiplier = multipliers[beneficiary_id]
+            if self.max_multiplier > 0 and multiplier > self.max_multiplier:
+                multiplier = self.max_multiplier
+            amounts.append((beneficiary_id, self.amount * float(multiplier)))
+        return amounts
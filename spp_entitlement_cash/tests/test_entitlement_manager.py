@@ -162,3 +162,102 @@ class TestEntitlementManager(TransactionCase):
         self.assertEqual(res["target"], "new")
         self.assertEqual(res["res_id"], entitlement.id)
         self.assertEqual(res["view_mode"], "form")
+
+    def test_07_prepare_entitlements_multiplier(self):
+        self.registrants[0].color = 3
+        self.registrants[1].color = 10
+        multiplier_field = self.env["ir.model.fields"].search(
+            [("model", "=", "res.partner"), ("name", "=", "color")], limit=1
+        )
+        self._cash_entitlement_manager.write(
+            {
+                "entitlement_item_ids": [
+                    (
+                        0,
+                        0,
+                        {
+                            "amount": 5.0,
+                            "multiplier_field": multiplier_field.id,
+                            "max_multiplier": 4,
+                        },
+                    ),
+                    (
+                        0,
+                        0,
+                        {
+                            "amount": 100.0,
+                        },
+                    ),
+                ],
+            }
+        )
+        self._cash_entitlement_manager.prepare_entitlements(self.cycle, self.program.program_membership_ids)
+        entitlements = self.env["g2p.entitlement"].search([("cycle_id", "=", self.cycle.id)])
+        amounts = {ent.partner_id.id: ent.initial_amount for ent in entitlements}
+        self.assertEqual(amounts, {self.registrants[0].id: 115.0, self.registrants[1].id: 120.0})
+
+        # Running it again must not duplicate the entitlements
+        self._cash_entitlement_manager.prepare_entitlements(self.cycle, self.program.program_membership_ids)
+        self.assertEqual(self.env["g2p.entitlement"].search_count([("cycle_id", "=", self.cycle.id)]), 2)
+
+    def test_08_approve_entitlements_state_error(self):
+        entitlement = self.create_entitlement()
+        entitlement.state = "cancelled"
+        err, message = self._cash_entitlement_manager.approve_entitlements(entitlement)
+        self.assertEqual(err, 1)
+        self.assertIn("Entitlement State Error", message)
+        self.assertFalse(entitlement.disbursement_id, "No payment should be created!")
+
+    def _create_pending_entitlements(self):
+        entitlements = self.env["g2p.entitlement"].create(
+            [
+                {
+                    "partner_id": registrant.id,
+                    "cycle_id": self.cycle.id,
+                    "valid_from": fields.Date.today(),
+                    "initial_amount": amount,
+                    "transfer_fee": transfer_fee,
+                    "state": "pending_validation",
+                }
+                for registrant, amount, transfer_fee in zip(self.registrants, (5.0, 7.0), (1.0, 0.0), strict=True)
+            ]
+        )
+        return entitlements
+
+    def test_09_approve_entitlements_payments(self):
+        entitlements = self._create_pending_entitlements()
+        manager = self._cash_entitlement_manager
+        with patch.object(type(manager), "check_fund_balance", return_value=100.0) as check_fund_balance:
+            err, message = manager.approve_entitlements(entitlements)
+        self.assertEqual((err, message), (0, ""))
+        # The fund of the program is checked once for the whole batch
+        check_fund_balance.assert_called_once_with(self.program.id)
+
+        self.assertEqual(entitlements.mapped("state"), ["approved", "approved"])
+        payments = entitlements.mapped("disbursement_id")
+        self.assertEqual(len(payments), 2, "One payment per approved entitlement")
+        for entitlement, amount in zip(entitlements, (4.0, 7.0), strict=True):
+            payment = entitlement.disbursement_id
+            self.assertEqual(payment.partner_id, entitlement.partner_id)
+            self.assertEqual(payment.amount, amount, "The transfer fee is not disbursed to the beneficiary")
+            self.assertIn(entitlement.code, payment.ref)
+            self.assertEqual(entitlement.date_approved, fields.Date.today())
+        service_fee = entitlements[0].service_fee_disbursement_id
+        self.assertEqual(service_fee.amount, 1.0)
+        self.assertIn(entitlements[0].code, service_fee.ref)
+        self.assertFalse(entitlements[1].service_fee_disbursement_id)
+
+    def test_10_approve_entitlements_insufficient_fund(self):
+        entitlements = self._create_pending_entitlements()
+        manager = self._cash_entitlement_manager
+        # Enough for the first entitlement only
+        with patch.object(type(manager), "check_fund_balance", return_value=8.0):
+            err, message = manager.approve_entitlements(entitlements)
+        self.assertEqual(err, 1)
+        self.assertIn("is insufficient for the entitlement: %s" % entitlements[1].code, message)
+        self.assertIn("[3.00]", message, "The remaining fund of the batch is reported")
+
+        self.assertEqual(entitlements[0].state, "approved")
+        self.assertTrue(entitlements[0].disbursement_id)
+        self.assertEqual(entitlements[1].state, "pending_validation")
+        self.assertFalse(entitlements[1].disbursement_id, "No payment should be created!")
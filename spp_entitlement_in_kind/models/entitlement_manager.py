@@ -53,6 +53,11 @@ class G2PInKindEntitlementManager(models.Model):
         default=_default_warehouse_id,
         check_company=True,
     )
+    merge_stock_moves = fields.Boolean(
+        default=False,
+        help="Merge the stock moves of the entitlements approved together per warehouse, product and service "
+        "point. Merged stock moves are not linked to individual entitlements.",
+    )
     company_id = fields.Many2one("res.company", string="Company", related="program_id.company_id")
 
     # Group able to validate the payment
@@ -204,16 +209,22 @@ class G2PInKindEntitlementManager(models.Model):
             }
         )
 
-        jobs = []
-        for i in range(0, entitlements_count, self.MAX_ROW_JOB_QUEUE):
-            jobs.append(
-                self.delayable()._set_pending_validation_entitlements(cycle, offset=i, limit=self.MAX_ROW_JOB_QUEUE)
-            )
+        id_ranges = cycle.get_entitlement_id_ranges(
+            ["draft"],
+            entitlement_model="g2p.entitlement.inkind",
+            chunk_size=self.MAX_ROW_JOB_QUEUE,
+        )
+        jobs = [
+            self.delayable()._set_pending_validation_entitlements(cycle, min_id=min_id, max_id=max_id)
+            for min_id, max_id in id_ranges
+        ]
+        if not jobs:
+            return self.mark_job_as_done(cycle, _("Entitlements Set to Pending Validation."))
         main_job = group(*jobs)
         main_job.on_done(self.delayable().mark_job_as_done(cycle, _("Entitlements Set to Pending Validation.")))
         main_job.delay()
 
-    def _set_pending_validation_entitlements(self, cycle, offset=0, limit=None):
+    def _set_pending_validation_entitlements(self, cycle, offset=0, limit=None, min_id=None, max_id=None):
         """Set In-Kind Entitlements to Pending Validation.
         In-kind Entitlement Manager :meth:`_set_pending_validation_entitlements`.
         Set entitlements to pending_validation in a cycle.
@@ -221,6 +232,8 @@ class G2PInKindEntitlementManager(models.Model):
         :param cycle: A recordset of cycle
         :param offset: An integer value to be used in :meth:`cycle.get_entitlements` for setting the query offset
         :param limit: An integer value to be used in :meth:`cycle.get_entitlements` for setting the query limit
+        :param min_id: An integer value for the smallest entitlement ID to process
+        :param max_id: An integer value for the largest entitlement ID to process
         :return:
         """
         # Get the entitlements in the cycle
@@ -229,6 +242,8 @@ class G2PInKindEntitlementManager(models.Model):
             entitlement_model="g2p.entitlement.inkind",
             offset=offset,
             limit=limit,
+            min_id=min_id,
+            max_id=max_id,
         )
         entitlements.update({"state": "pending_validation"})
 
@@ -300,14 +315,21 @@ class G2PInKindEntitlementManager(models.Model):
             }
         )
 
-        jobs = []
-        for i in range(0, entitlements_count, self.MAX_ROW_JOB_QUEUE):
-            jobs.append(self.delayable()._validate_entitlements(cycle, offset=i, limit=self.MAX_ROW_JOB_QUEUE))
+        id_ranges = cycle.get_entitlement_id_ranges(
+            ["draft", "pending_validation"],
+            entitlement_model="g2p.entitlement.inkind",
+            chunk_size=self.MAX_ROW_JOB_QUEUE,
+        )
+        jobs = [
+            self.delayable()._validate_entitlements(cycle, min_id=min_id, max_id=max_id) for min_id, max_id in id_ranges
+        ]
+        if not jobs:
+            return self.mark_job_as_done(cycle, _("Entitlements Validated and Approved."))
         main_job = group(*jobs)
         main_job.on_done(self.delayable().mark_job_as_done(cycle, _("Entitlements Validated and Approved.")))
         main_job.delay()
 
-    def _validate_entitlements(self, cycle, offset=0, limit=None):
+    def _validate_entitlements(self, cycle, offset=0, limit=None, min_id=None, max_id=None):
         """Validate In-Kind Entitlements.
         In-Kind Entitlement Manager :meth:`_validate_entitlements`.
         Validate entitlements in a cycle.
@@ -315,6 +337,8 @@ class G2PInKindEntitlementManager(models.Model):
         :param cycle: A recordset of cycle
         :param offset: An integer value to be used in :meth:`cycle.get_entitlements` for setting the query offset
         :param limit: An integer value to be used in :meth:`cycle.get_entitlements` for setting the query limit
+        :param min_id: An integer value for the smallest entitlement ID to process
+        :param max_id: An integer value for the largest entitlement ID to process
         :return err: Integer number of errors
         :return message: String description of the error
         """
@@ -324,6 +348,8 @@ class G2PInKindEntitlementManager(models.Model):
             entitlement_model="g2p.entitlement.inkind",
             offset=offset,
             limit=limit,
+            min_id=min_id,
+            max_id=max_id,
         )
         err, message = self.approve_entitlements(entitlements)
         return err, message
@@ -376,26 +402,27 @@ class G2PInKindEntitlementManager(models.Model):
         state_err = 0
         message = ""
         sw = 0
-        for rec in entitlements:
-            if rec.state in ("draft", "pending_validation"):
-                if rec.manage_inventory:
-                    # TODO: check if there is enough stocks to allocate
-                    rec._action_launch_stock_rule()
-                rec.update(
-                    {
-                        "state": "approved",
-                        "date_approved": fields.Date.today(),
-                    }
-                )
-            else:
-                state_err += 1
-                if sw == 0:
-                    sw = 1
-                    message = _("Entitlement State Error! Entitlements not in 'pending validation' state:\n")
-                message += _("Program: %(prg)s, Beneficiary: %(partner)s.\n") % {
-                    "prg": rec.cycle_id.program_id.name,
-                    "partner": rec.partner_id.name,
-                }
+        entitlements_to_approve = entitlements.filtered(lambda rec: rec.state in ("draft", "pending_validation"))
+        for rec in entitlements - entitlements_to_approve:
+            state_err += 1
+            if sw == 0:
+                sw = 1
+                message = _("Entitlement State Error! Entitlements not in 'pending validation' state:\n")
+            message += _("Program: %(prg)s, Beneficiary: %(partner)s.\n") % {
+                "prg": rec.cycle_id.program_id.name,
+                "partner": rec.partner_id.name,
+            }
+
+        # TODO: check if there is enough stocks to allocate
+        entitlements_to_approve.filtered("manage_inventory")._action_launch_stock_rule_batched(
+            merge_moves=self.merge_stock_moves
+        )
+        entitlements_to_approve.write(
+            {
+                "state": "approved",
+                "date_approved": fields.Date.today(),
+            }
+        )
 
         return (state_err, message)
 
@@ -24,27 +24,9 @@ class SPPDefaultEligibilityManager(models.Model):
         domain += self._safe_eval(self.exclusion_eligibility_domain)
         return domain
 
-    def import_eligible_registrants(self, state="draft"):
-        for rec in self:
-            domain = rec._prepare_eligible_domain()
-            new_beneficiaries = self.env["res.partner"].search(domain)
-
-            if rec.enable_exclusion_filter:
-                exclusive_domain = rec._prepare_exclusion_eligible_domain()
-                excluded_beneficiaries = self.env["res.partner"].search(exclusive_domain)
-
-                new_beneficiaries = new_beneficiaries - excluded_beneficiaries
-
-            # Exclude already added beneficiaries
-            beneficiary_ids = rec.program_id.get_beneficiaries().mapped("partner_id")
-
-            new_beneficiaries = new_beneficiaries - beneficiary_ids
-
-            ben_count = len(new_beneficiaries)
-
-            if len(new_beneficiaries) < 1000:
-                rec._import_registrants(new_beneficiaries, state=state, do_count=True)
-            else:
-                rec._import_registrants_async(new_beneficiaries, state=state)
-
-            return ben_count
+    def _get_new_beneficiaries(self, domain=None):
+        new_beneficiaries = super()._get_new_beneficiaries(domain)
+        if self.enable_exclusion_filter:
+            exclusive_domain = self._prepare_exclusion_eligible_domain() + [("id", "in", new_beneficiaries.ids)]
+            new_beneficiaries -= self.env["res.partner"].search(exclusive_domain)
+        return new_beneficiaries
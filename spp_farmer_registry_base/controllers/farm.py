@@ -1,14 +1,77 @@
 # Import necessary classes
+import base64
+import json
+
+import werkzeug.wrappers
+
 from odoo import http
 from odoo.http import request
 
+DEFAULT_PAGE_SIZE = 5000
+MAX_PAGE_SIZE = 50000
+# Number of rows fetched from the database between two writes to the response
+FETCH_SIZE = 1000
+
+
+def encode_cursor(farm_id):
+    return base64.urlsafe_b64encode(str(farm_id).encode()).decode()
+
+
+def decode_cursor(cursor):
+    return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+
+
+def stream_feature_collection(registry, query, limit):
+    """
+    Write the features of the query as a GeoJSON FeatureCollection, as they are fetched.
+    The query is run on its own cursor because the request cursor is closed when the
+    response body is generated.
+    """
+    yield '{"type": "FeatureCollection", "features": ['
+    count = 0
+    last_id = None
+    with registry.cursor() as cr:
+        cr.execute(query)
+        while rows := cr.fetchmany(FETCH_SIZE):
+            for feature, farm_id in rows:
+                yield ("," if count else "") + feature
+                count += 1
+                last_id = farm_id
+    next_cursor = encode_cursor(last_id) if count == limit else None
+    yield '], "next_cursor": %s}' % json.dumps(next_cursor)
+
 
 class GeoJsonController(http.Controller):
     @http.route("/api/farm/geojson", type="http", auth="user", methods=["GET"])
-    def get_farm_geojson(self, **kw):
+    def get_farm_geojson(self, bbox=None, zoom=None, cursor=None, limit=None, **kw):
+        """
+        Stream the farms as a GeoJSON FeatureCollection, one page at a time.
+
+        :param bbox: Optional "min_lon,min_lat,max_lon,max_lat" WGS84 bounding box
+        :param zoom: Optional map zoom level used to simplify the geometries
+        :param cursor: The next_cursor of the previous page
+        :param limit: Number of features per page
+        """
+        try:
+            if bbox:
+                bbox = [float(value) for value in bbox.split(",")]
+                if len(bbox) != 4:
+                    raise ValueError("bbox")
+            zoom = int(zoom) if zoom else None
+            cursor = decode_cursor(cursor) if cursor else None
+            limit = min(int(limit), MAX_PAGE_SIZE) if limit else DEFAULT_PAGE_SIZE
+        except ValueError:
+            return request.make_response(
+                json.dumps({"error": "Invalid bbox, zoom, cursor or limit parameter."}),
+                headers=[("Content-Type", "application/json")],
+                status=400,
+            )
+
         # Ensure the user has the necessary permissions
         # This might involve checking if the user is logged in, has specific roles, etc.
-
-        # Call the get_geojson method from the Farm model
-        result = request.env["res.partner"].get_geojson()
-        return request.make_response(result, headers=[("Content-Type", "application/json")])
+        query = request.env["res.partner"]._get_farm_geojson_query(bbox=bbox, zoom=zoom, cursor=cursor, limit=limit)
+        return werkzeug.wrappers.Response(
+            stream_feature_collection(request.env.registry, query, limit),
+            content_type="application/json",
+            direct_passthrough=True,
+        )
@@ -1,11 +1,7 @@
-import json
 import logging
 
-import pyproj
-from shapely.geometry import mapping
-from shapely.ops import transform
-
 from odoo import Command, api, fields, models
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
@@ -38,6 +34,11 @@ class Farm(models.Model):
     farm_land_rec_id = fields.Many2one("spp.land.record", required=True, ondelete="cascade", string="Land Record")
     farmer_id = fields.Many2one("spp.farmer", required=True, ondelete="cascade", string="Farmer")
 
+    # Farm coordinates are handled as EPSG:3857 (Pseudo-Mercator) values
+    FARM_GEOJSON_SRID = 3857
+    # Number of decimals of the GeoJSON coordinates
+    FARM_GEOJSON_PRECISION = 7
+
     @api.model_create_multi
     def create(self, vals):
         farm = super().create(vals)
@@ -126,58 +127,68 @@ class Farm(models.Model):
             elif not rec.is_group and rec.is_registrant:
                 rec.update_farmer(rec)
 
-    def _process_record_to_feature(self, record, transformer):
+    @api.model
+    def _get_farm_geojson_query(self, bbox=None, zoom=None, cursor=None, limit=None):
         """
-        Convert a farm record to a GeoJSON feature using shapely and geojson libraries.
+        Build the query returning a page of farm GeoJSON features, ordered by id.
+
+        The reprojection and the GeoJSON serialization are done by PostGIS.
 
         Args:
-            record: The farm record to process.
+            bbox: Optional (min_lon, min_lat, max_lon, max_lat) bounding box in WGS84.
+            zoom: Optional map zoom level, coordinates are snapped to the size of a pixel at this level.
+            cursor: Optional id of the last farm of the previous page.
+            limit: Optional maximum number of features.
 
         Returns:
-            A GeoJSON feature dictionary or None if coordinates are not found.
+            An SQL object selecting the feature as JSON text and the farm id.
         """
-        if not record.coordinates:
-            return None  # Skip records without coordinates
-
-        point_transformed = mapping(transform(transformer, record.coordinates))
-
-        # Construct the feature with the geometry and properties
-        feature = {
-            "type": "Feature",
-            "geometry": point_transformed,
-            "properties": {
-                "name": record.name,  # Include any other properties you want in the GeoJSON
-            },
-        }
+        domain = [("kind", "=", self.env.ref("spp_farmer_registry_base.kind_farm").id)]
+        if cursor:
+            domain.append(("id", ">", cursor))
+        query = self._search(domain, order="id", limit=limit)
+
+        table = self._table
+        query.add_where(f'"{table}"."coordinates" IS NOT NULL')
+        if bbox:
+            # Transform the box rather than the column so that the spatial index can be used
+            query.add_where(
+                SQL(
+                    f'"{table}"."coordinates" && '
+                    "ST_SetSRID(ST_Transform(ST_MakeEnvelope(%s, %s, %s, %s, 4326), %s), %s)",
+                    *bbox,
+                    self.FARM_GEOJSON_SRID,
+                    self._fields["coordinates"].srid,
+                )
+            )
 
-        return feature
+        geometry = SQL(f'ST_Transform(ST_SetSRID("{table}"."coordinates", %s), 4326)', self.FARM_GEOJSON_SRID)
+        if zoom is not None:
+            # Size in degrees of a 256 pixels tile at this zoom level
+            geometry = SQL("ST_SnapToGrid(%s, %s)", geometry, 360.0 / (256 * 2**zoom))
+
+        return query.select(
+            SQL(
+                "json_build_object('type', 'Feature', 'geometry', ST_AsGeoJSON(%s, %s)::json, "
+                "'properties', json_build_object('name', %s))::text",
+                geometry,
+                self.FARM_GEOJSON_PRECISION,
+                SQL(f'"{table}"."name"'),
+            ),
+            SQL(f'"{table}"."id"'),
+        )
 
     @api.model
-    def get_geojson(self):
+    def get_geojson(self, bbox=None, zoom=None, cursor=None, limit=None):
         """
         Generate a GeoJSON representation of farm records.
 
         Returns:
             A GeoJSON string of farm records.
         """
-        # Query all farms with coordinates
-        # farms = self.search([('coordinates', '!=', False)])
-        farms = self.search([])
-
-        # Construct GeoJSON structure
-        geojson_features = {"type": "FeatureCollection", "features": []}
-
-        # Assuming coordinates are in EPSG:3857 (Pseudo-Mercator)
-        proj_from = pyproj.Proj("epsg:3857")  # EPSG:3857 - WGS 84 / Pseudo-Mercator
-        proj_to = pyproj.Proj("epsg:4326")  # WGS84
-        transformer = pyproj.Transformer.from_proj(proj_from, proj_to, always_xy=True).transform
-
-        for farm in farms:
-            feature = self._process_record_to_feature(farm, transformer)
-            if feature:
-                geojson_features["features"].append(feature)
-
-        return json.dumps(geojson_features, indent=2)
+        self.env.cr.execute(self._get_farm_geojson_query(bbox=bbox, zoom=zoom, cursor=cursor, limit=limit))
+        features = ",".join(feature for feature, _farm_id in self.env.cr.fetchall())
+        return '{"type": "FeatureCollection", "features": [%s]}' % features
 
     def create_update_farmer(self, farm):
         farmer_name = ""
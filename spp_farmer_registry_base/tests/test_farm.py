@@ -1,3 +1,5 @@
+import json
+
 from odoo.tests.common import TransactionCase
 
 
@@ -74,3 +76,20 @@ class MembershipTest(TransactionCase):
 
     #     self.assertEqual(self.farm_1.farmer_family_name, "Test Family Name")
     #     self.assertEqual(self.farm_1.farmer_given_name, "Test Given Name")
+
+    def test_get_geojson(self):
+        farm_kind = self.env.ref("spp_farmer_registry_base.kind_farm")
+        self.farm_1.write({"kind": farm_kind.id, "coordinates": "POINT(0 0)"})
+
+        geojson = json.loads(self.env["res.partner"].get_geojson(bbox=[-1, -1, 1, 1]))
+        names = [feature["properties"]["name"] for feature in geojson["features"]]
+        self.assertIn("Farm 1", names)
+        self.assertEqual(geojson["features"][names.index("Farm 1")]["geometry"]["coordinates"], [0, 0])
+
+        geojson = json.loads(self.env["res.partner"].get_geojson(bbox=[10, 10, 11, 11]))
+        names = [feature["properties"]["name"] for feature in geojson["features"]]
+        self.assertNotIn("Farm 1", names)
+
+        geojson = json.loads(self.env["res.partner"].get_geojson(cursor=self.farm_1.id))
+        names = [feature["properties"]["name"] for feature in geojson["features"]]
+        self.assertNotIn("Farm 1", names)
@@ -16,6 +16,7 @@
         "data/queue_job_data.xml",
         "security/ir.model.access.csv",
         "views/import_match_view.xml",
+        "views/import_progress_view.xml",
     ],
     "assets": {
         "web.assets_backend": [
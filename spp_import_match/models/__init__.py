@@ -3,4 +3,5 @@
 from . import base
 from . import base_import
 from . import import_match
+from . import import_progress
 from . import queue_job
@@ -27,9 +27,10 @@ class Base(models.AbstractModel):
             if ".id" in fields:
                 column = fields.index(".id")
                 fields[column] = "id"
-                for values in data:
-                    dbid = int(values[column])
-                    values[column] = self.browse(dbid).get_external_id().get(dbid)
+                dbids = [int(values[column]) for values in data]
+                external_ids = self.browse(dbids).get_external_id()
+                for values, dbid in zip(data, dbids, strict=True):
+                    values[column] = external_ids.get(dbid)
             import_fields = list(map(models.fix_import_export_id_paths, fields))
             converted_data = list(self._convert_records(self._extract_records(import_fields, data)))
 
@@ -42,34 +43,31 @@ class Base(models.AbstractModel):
                 if len(f) > 1:
                     field_name += "/" + f[1]
                 clean_fields.append(field_name)
+            _logger.debug("CLEAN FIELDS: %s" % clean_fields)
+
+            rows = []
             for dbid, xmlid, record, info in converted_data:
                 if len(clean_fields) > len(data[info["record"]]):
                     data[info["record"]].append(None)
 
-                _logger.info("CLEAN FIELDS: %s" % clean_fields)
-                _logger.info("RECORD: %s" % data[info["record"]])
+                _logger.debug("RECORD: %s" % data[info["record"]])
                 row = dict(zip(clean_fields, data[info["record"]], strict=True))
+                rows.append((dbid, xmlid, record, row))
+
+            matches, external_ids = self._import_match_find_all(rows)
 
-                match = self
+            flat_fields_to_remove = [item for sublist in field_to_match for item in sublist]
+            for (_dbid, xmlid, _record, row), match in zip(rows, matches, strict=True):
                 if xmlid:
-                    _logger.info("XMLID: %s" % xmlid)
+                    _logger.debug("XMLID: %s" % xmlid)
                     row["id"] = xmlid
                     newdata.append(tuple(row[f] for f in clean_fields))
                     continue
-                elif dbid:
-                    _logger.info("DBID: %s" % dbid)
-                    match = self.browse(dbid)
-                else:
-                    match = self.env["spp.import.match"]._match_find(self, record, row)
-                    _logger.info("MATCH: %s" % match)
+                _logger.debug("MATCH: %s" % match)
 
-                match.export_data(fields)
-
-                ext_id = match.get_external_id()
-                row["id"] = ext_id[match.id] if match else row.get("id", "")
+                row["id"] = external_ids[match.id] if match else row.get("id", "")
                 if match:
                     if overwrite_match:
-                        flat_fields_to_remove = [item for sublist in field_to_match for item in sublist]
                         for fields_pop in flat_fields_to_remove:
                             # Set one2many and many2many fields to False if matched
                             # to avoid duplicates in one2many or many2many when exporting data
@@ -82,15 +80,44 @@ class Base(models.AbstractModel):
                 else:
                     newdata.append(tuple(row[f] for f in fields))
             data = newdata
-        return super().load(fields, data)
+        # Flag the writes done by the import so that Base.write only alters them
+        return super(Base, self.with_context(import_match_load=True)).load(fields, data)
+
+    @api.model
+    def _import_match_find_all(self, rows):
+        """Find the matching records of all the rows of an import chunk.
+
+        :param rows: List of (dbid, xmlid, converted record, imported row) tuples
+        :return: The list of matches of each row and the external IDs of the matched records
+        """
+        found = iter(
+            self.env["spp.import.match"]._match_find_bulk(
+                self, [(record, row) for dbid, xmlid, record, row in rows if not xmlid and not dbid]
+            )
+        )
+        matches = []
+        for dbid, xmlid, _record, _row in rows:
+            if xmlid:
+                matches.append(None)
+            elif dbid:
+                matches.append(self.browse(dbid))
+            else:
+                matches.append(next(found))
+
+        matched_records = self.browse(list({match.id for match in matches if match}))
+        # Exporting the matched records generates their missing external IDs
+        matched_records.export_data(["id"])
+        return matches, matched_records.get_external_id()
 
     def write(self, vals):
-        model = self.env["ir.model"].sudo().search([("model", "=", self._name)])
-        new_vals = vals.copy()
-        for rec in vals:
-            field_name = rec
-            if not vals[field_name]:
-                field = self.env["ir.model.fields"].search([("model_id", "=", model.id), ("name", "=", field_name)])
-                if field and field.ttype in ("one2many", "many2many"):
-                    new_vals.pop(rec)
-        return super().write(new_vals)
+        if self.env.context.get("import_match_load"):
+            # Do not clear one2many and many2many fields with empty imported values.
+            # The field types are taken from the registry so this costs no query.
+            vals = {
+                field_name: value
+                for field_name, value in vals.items()
+                if value
+                or field_name not in self._fields
+                or self._fields[field_name].type not in ("one2many", "many2many")
+            }
+        return super().write(vals)
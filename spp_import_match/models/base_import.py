@@ -1,7 +1,7 @@
-import base64
 import csv
 import logging
-from io import BytesIO, StringIO, TextIOWrapper
+import time
+from io import BytesIO, TextIOWrapper
 from os.path import splitext
 
 from odoo import _, api, models
@@ -23,6 +23,12 @@ OPT_PRIORITY = "priority"
 
 INIT_PRIORITY = 100
 DEFAULT_CHUNK_SIZE = 100
+# adaptive chunk sizing, see _get_chunk_size
+MAX_CHUNK_SIZE = 10000
+MAX_CHUNK_COUNT = 1000
+DEFAULT_TARGET_JOB_DURATION = 60
+DEFAULT_ROWS_PER_SECOND = 20
+DEFAULT_IMPORT_CHANNEL = "root.spp_import"
 
 
 class ImportValidationError(Exception):
@@ -85,13 +91,10 @@ class SPPBaseImport(models.TransientModel):
                 self = self.with_context(import_match_ids=import_match_ids)
             return super().execute_import(fields, columns, options, dryrun=dryrun)
         _logger.info("Started Asynchronous Import: %s" % self.res_model)
-        # asynchronous import
-        try:
-            data, import_fields = self._convert_import_data(fields, options)
-            # Parse date and float field
-            data = self._parse_import_data(data, import_fields, options)
-        except ValueError as e:
-            return {"messages": [{"type": "error", "message": str(e), "record": False}]}
+        # asynchronous import, the data was already converted and parsed above: it is
+        # stored in one attachment that the split job streams into chunk jobs, so the
+        # request does not spend its time creating them
+        data = input_file_data
 
         # get the translated model name to build
         # a meaningful job description
@@ -104,65 +107,131 @@ class SPPBaseImport(models.TransientModel):
             model_name=translated_model_name, file_name=self.file_name
         )
         attachment = self._create_csv_attachment(import_fields, data, options, self.file_name)
-        delayed_job = self.with_delay(description=description)._split_file(
+        progress = (
+            self.env["spp.import.progress"]
+            .sudo()
+            .create(
+                {
+                    "name": description,
+                    "res_model": self.res_model,
+                    "file_name": self.file_name,
+                    "row_count": len(data),
+                    "channel": self._get_import_channel(),
+                }
+            )
+        )
+        delayed_job = self.with_delay(description=description, channel=progress.channel)._split_file(
             model_name=self.res_model,
             translated_model_name=translated_model_name,
             attachment=attachment,
             options=options,
             split_context=self.env.context,
             file_name=self.file_name,
+            row_count=len(data),
+            progress=progress,
         )
-        self._link_attachment_to_job(delayed_job, attachment)
-        return {"async": True}
+        split_job = self._link_attachment_to_job(delayed_job, attachment)
+        # A failed split job never creates the chunk jobs, its state is shown on the progress
+        progress.write({"split_job_id": split_job.id})
+        return {"async": True, "import_progress_id": progress.id}
 
-    def _link_attachment_to_job(self, delayed_job, attachment):
+    def _link_attachment_to_job(self, delayed_job, attachment, progress=None, row_count=0):
         queue_job = self.env["queue.job"].search([("uuid", "=", delayed_job.uuid)], limit=1)
         attachment.write({"res_model": "queue.job", "res_id": queue_job.id})
+        if progress:
+            queue_job.sudo().write({"import_progress_id": progress.id, "import_row_count": row_count})
+        return queue_job
+
+    def _get_import_channel(self):
+        """queue_job channel of the import jobs, configurable so imports do not starve other jobs"""
+        return (
+            self.env["ir.config_parameter"].sudo().get_param("spp_import_match.import_channel", DEFAULT_IMPORT_CHANNEL)
+        )
+
+    def _get_chunk_size(self, model_name, row_count):
+        """Number of rows per chunk job so that a job lasts about the configured target duration.
+
+        The throughput is measured on the previous imports of the model, the chunk size is
+        then bounded so that an import never creates more than MAX_CHUNK_COUNT jobs.
+        """
+        params = self.env["ir.config_parameter"].sudo()
+        target_duration = float(params.get_param("spp_import_match.target_job_duration", DEFAULT_TARGET_JOB_DURATION))
+        rows_per_second = self.env["spp.import.progress"].sudo()._get_measured_rows_per_second(model_name)
+        if not rows_per_second:
+            rows_per_second = float(
+                params.get_param("spp_import_match.default_rows_per_second", DEFAULT_ROWS_PER_SECOND)
+            )
+        chunk_size = int(target_duration * rows_per_second)
+        if row_count:
+            chunk_size = max(chunk_size, -(-row_count // MAX_CHUNK_COUNT))
+        return min(max(chunk_size, DEFAULT_CHUNK_SIZE), MAX_CHUNK_SIZE)
 
     @api.returns("ir.attachment")
     def _create_csv_attachment(self, fields, data, options, file_name):
-        # write csv
-        f = StringIO()
-        writer = csv.writer(
-            f,
-            delimiter=str(options.get(OPT_SEPARATOR)) or ",",
-            quotechar=str(options.get(OPT_QUOTING)),
-        )
+        # write csv, encoding the rows as they are written
+        binary = BytesIO()
         encoding = options.get(OPT_ENCODING) or "utf-8"
-        writer.writerow(fields)
-        for row in data:
-            writer.writerow(row)
-        # create attachment
-        datas = base64.encodebytes(f.getvalue().encode(encoding))
-        attachment = self.env["ir.attachment"].create({"name": file_name, "datas": datas})
+        with TextIOWrapper(binary, encoding=encoding, newline="", write_through=True) as f:
+            writer = csv.writer(
+                f,
+                delimiter=str(options.get(OPT_SEPARATOR)) or ",",
+                quotechar=str(options.get(OPT_QUOTING)),
+            )
+            writer.writerow(fields)
+            writer.writerows(data)
+            # create attachment
+            attachment = self.env["ir.attachment"].create({"name": file_name, "raw": binary.getvalue()})
         return attachment
 
-    def _read_csv_attachment(self, attachment, options):
-        decoded_datas = base64.decodebytes(attachment.datas)
+    def _iter_csv_attachment(self, attachment, options):
+        """Iterate over the rows of a CSV attachment, reading it from the filestore
+        as a stream instead of loading the whole file in memory"""
+        if attachment.store_fname:
+            binary = open(attachment._full_path(attachment.store_fname), "rb")  # noqa: SIM115
+        else:
+            binary = BytesIO(attachment.raw)
         encoding = options.get(OPT_ENCODING) or "utf-8"
-        f = TextIOWrapper(BytesIO(decoded_datas), encoding=encoding)
-        reader = csv.reader(
-            f,
-            delimiter=str(options.get(OPT_SEPARATOR)) or ",",
-            quotechar=str(options.get(OPT_QUOTING)),
-        )
+        with TextIOWrapper(binary, encoding=encoding, newline="") as f:
+            reader = csv.reader(
+                f,
+                delimiter=str(options.get(OPT_SEPARATOR)) or ",",
+                quotechar=str(options.get(OPT_QUOTING)),
+            )
+            yield from reader
 
-        fields = next(reader)
-        data = [row for row in reader]
+    def _read_csv_attachment(self, attachment, options):
+        rows = self._iter_csv_attachment(attachment, options)
+        fields = next(rows)
+        data = list(rows)
         return fields, data
 
     @staticmethod
-    def _extract_chunks(model_obj, fields, data, chunk_size):
-        """Split the data on record boundaries, in chunks of minimum chunk_size"""
+    def _extract_chunks(model_obj, fields, rows, chunk_size):
+        """Split the rows on record boundaries, in chunks of minimum chunk_size.
+        The rows are consumed as they come so only one chunk is held in memory."""
         fields = list(map(fix_import_export_id_paths, fields))
+        # A row holding only one2many values belongs to the record of the previous row
+        o2m_indexes = set()
+        for index, path in enumerate(fields):
+            field = model_obj._fields.get(path[0])
+            if field and field.type == "one2many":
+                o2m_indexes.add(index)
+
+        def only_o2m_values(row):
+            return any(row[i] for i in o2m_indexes if i < len(row)) and not any(
+                value for i, value in enumerate(row) if i not in o2m_indexes
+            )
+
         row_from = 0
-        for rows in model_obj._extract_records(fields, data):
-            rows = rows[1]["rows"]
-            if rows["to"] - row_from + 1 >= chunk_size:
-                yield row_from, rows["to"]
-                row_from = rows["to"] + 1
-        if row_from < len(data):
-            yield row_from, len(data) - 1
+        chunk = []
+        for row in rows:
+            if len(chunk) >= chunk_size and not only_o2m_values(row):
+                yield row_from, chunk
+                row_from += len(chunk)
+                chunk = []
+            chunk.append(row)
+        if chunk:
+            yield row_from, chunk
 
     def _split_file(
         self,
@@ -172,18 +241,53 @@ class SPPBaseImport(models.TransientModel):
         options,
         split_context,
         file_name="file.csv",
+        row_count=None,
+        progress=None,
+    ):
+        """Split a CSV attachment in smaller import jobs.
+        The attachment is streamed and each chunk is enqueued as soon as it is read."""
+        rows = self._iter_csv_attachment(attachment, options)
+        fields = next(rows)
+        self._enqueue_chunks(
+            model_name,
+            translated_model_name,
+            fields,
+            rows,
+            options,
+            split_context,
+            file_name=file_name,
+            row_count=row_count,
+            progress=progress,
+        )
+
+    def _enqueue_chunks(
+        self,
+        model_name,
+        translated_model_name,
+        fields,
+        rows,
+        options,
+        context,
+        file_name="file.csv",
+        row_count=None,
+        progress=None,
     ):
-        """Split a CSV attachment in smaller import jobs"""
+        """Write the rows in one CSV attachment per chunk and enqueue one import job per chunk.
+        The rows are consumed as they come, so only one chunk is written at a time."""
         model_obj = self.env[model_name]
-        fields, data = self._read_csv_attachment(attachment, options)
-        padding = len(str(len(data)))
+        padding = len(str(row_count)) if row_count else 0
         priority = options.get(OPT_PRIORITY, INIT_PRIORITY)
         if options.get(OPT_HAS_HEADER):
             header_offset = 1
         else:
             header_offset = 0
-        chunk_size = options.get(OPT_CHUNK_SIZE) or DEFAULT_CHUNK_SIZE
-        for row_from, row_to in self._extract_chunks(model_obj, fields, data, chunk_size):
+        chunk_size = options.get(OPT_CHUNK_SIZE) or self._get_chunk_size(model_name, row_count)
+        channel = progress.channel if progress else None
+        if progress:
+            progress.sudo().write({"chunk_size": chunk_size})
+        root, ext = splitext(file_name)
+        for row_from, chunk_data in self._extract_chunks(model_obj, fields, rows, chunk_size):
+            row_to = row_from + len(chunk_data) - 1
             chunk = str(priority - INIT_PRIORITY).zfill(padding)
             description = _(
                 "Import {model_name} from file {file_name} - #{chunk} - lines {row_from} to {row_to}"
@@ -195,23 +299,30 @@ class SPPBaseImport(models.TransientModel):
                 row_to=row_to + 1 + header_offset,
             )
             # create a CSV attachment and enqueue the job
-            root, ext = splitext(file_name)
             attachment = self._create_csv_attachment(
                 fields,
-                data[row_from : row_to + 1],
+                chunk_data,
                 options,
                 file_name=root + "-" + chunk + ext,
             )
-            delayed_job = self.with_delay(description=description, priority=priority)._import_one_chunk(
-                model_name=model_name, attachment=attachment, options=options, context=split_context
-            )
-            self._link_attachment_to_job(delayed_job, attachment)
+            delayed_job = self.with_delay(
+                description=description, priority=priority, channel=channel
+            )._import_one_chunk(model_name=model_name, attachment=attachment, options=options, context=context)
+            self._link_attachment_to_job(delayed_job, attachment, progress=progress, row_count=len(chunk_data))
             priority += 1
 
     def _import_one_chunk(self, model_name, attachment, options, context):
         model_obj = self.env[model_name].with_context(context)
         fields, data = self._read_csv_attachment(attachment, options)
+        start = time.perf_counter()
         result = model_obj.load(fields, data)
+        duration = time.perf_counter() - start
+        result["throughput"] = {
+            "rows": len(data),
+            "duration": round(duration, 3),
+            "rows_per_second": round(len(data) / duration, 1) if duration else None,
+        }
+        _logger.info("Imported chunk of %s rows in %.3fs", len(data), duration)
         error_message = [message["message"] for message in result["messages"] if message["type"] == "error"]
         if error_message:
             raise FailedJobError("\n".join(error_message))
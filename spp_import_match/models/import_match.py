@@ -1,6 +1,8 @@
 # Part of OpenSPP. See LICENSE file for full copyright and licensing details.
 
+import itertools
 import logging
+from collections import defaultdict
 
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
@@ -39,32 +41,36 @@ class SPPImportMatch(models.Model):
         for rec in self:
             rec.field_ids = None
 
+    def _get_match_domain(self, converted_row, imported_row):
+        """Domain matching the imported row for this rule, None if a conditional field disables it"""
+        self.ensure_one()
+        domain = list()
+        for field in self.field_ids:
+            if field.conditional:
+                if imported_row[field.name] != field.imported_value:
+                    return None
+            if field.field_id.name in converted_row:
+                row_value = converted_row[field.field_id.name]
+                field_value = field.field_id.name
+                add_to_domain = True
+                if field.sub_field_id:
+                    tuple_val = row_value[0][2]
+                    add_to_domain = False
+                    if field.sub_field_id.name in tuple_val:
+                        row_value = tuple_val[field.sub_field_id.name]
+                        add_to_domain = True
+                        field_value = field.field_id.name + "." + field.sub_field_id.name
+                if add_to_domain:
+                    domain.append((field_value, "=", row_value))
+        return domain
+
     @api.model
     def _match_find(self, model, converted_row, imported_row):
         usable, field_to_match = self._usable_rules(model._name, converted_row)
         usable = self.browse(usable)
         for combination in usable:
-            combination_valid = True
-            domain = list()
-            for field in combination.field_ids:
-                if field.conditional:
-                    if imported_row[field.name] != field.imported_value:
-                        combination_valid = False
-                        break
-                if field.field_id.name in converted_row:
-                    row_value = converted_row[field.field_id.name]
-                    field_value = field.field_id.name
-                    add_to_domain = True
-                    if field.sub_field_id:
-                        tuple_val = row_value[0][2]
-                        add_to_domain = False
-                        if field.sub_field_id.name in tuple_val:
-                            row_value = tuple_val[field.sub_field_id.name]
-                            add_to_domain = True
-                            field_value = field.field_id.name + "." + field.sub_field_id.name
-                    if add_to_domain:
-                        domain.append((field_value, "=", row_value))
-            if not combination_valid:
+            domain = combination._get_match_domain(converted_row, imported_row)
+            if domain is None:
                 continue
             match = model.search(domain)
             if len(match) == 1:
@@ -74,6 +80,112 @@ class SPPImportMatch(models.Model):
 
         return model
 
+    @api.model
+    def _match_find_bulk(self, model, rows):
+        """Same as :meth:`_match_find` for a whole chunk of imported rows.
+
+        The match-key values of all the rows are resolved with one query per rule combination
+        and the matching records are looked up in an in-memory key to id map.
+
+        :param model: Model of the imported records
+        :param rows: List of (converted_row, imported_row) tuples
+        :return: List with the matched record of each row, or `model` if nothing matched
+        """
+        matches = [model] * len(rows)
+        usable_cache = {}
+        row_rules = []
+        for converted_row, _imported_row in rows:
+            key = frozenset(converted_row)
+            if key not in usable_cache:
+                usable_cache[key] = set(self._usable_rules(model._name, converted_row)[0])
+            row_rules.append(usable_cache[key])
+
+        pending = set(range(len(rows)))
+        combinations = self.search([("id", "in", list(set().union(*row_rules)))])
+        for combination in combinations:
+            # Rows are grouped by the fields present in their domain
+            groups = defaultdict(list)
+            for index in sorted(pending):
+                if combination.id not in row_rules[index]:
+                    continue
+                domain = combination._get_match_domain(*rows[index])
+                if domain is None:
+                    continue
+                values = tuple(term[2] for term in domain)
+                try:
+                    hash(values)
+                except TypeError:
+                    # Values that cannot be used as a key are searched one by one
+                    match = self._get_unique_match(model, model.search(domain).ids)
+                    if match:
+                        matches[index] = match
+                        pending.discard(index)
+                    continue
+                groups[tuple(term[0] for term in domain)].append((index, values))
+
+            for paths, items in groups.items():
+                key_map = self._get_match_key_map(model, paths, items)
+                for index, values in items:
+                    key = tuple(self._normalize_match_value(model, path, values[i]) for i, path in enumerate(paths))
+                    match = self._get_unique_match(model, key_map.get(key, []))
+                    if match:
+                        matches[index] = match
+                        pending.discard(index)
+
+        return matches
+
+    @api.model
+    def _get_unique_match(self, model, match_ids):
+        if len(match_ids) > 1:
+            raise ValidationError(_("Multiple matches found for '%s'!" % model.browse(match_ids[0]).name))
+        return model.browse(match_ids)
+
+    @api.model
+    def _get_match_key_map(self, model, paths, items):
+        """Search the records matching any of the rows in one query and index them by key"""
+        domain = [(path, "in", list({values[i] for _index, values in items})) for i, path in enumerate(paths)]
+        candidates = model.search(domain)
+        for path in paths:
+            # Load the compared values of all the candidates at once
+            candidates.mapped(path)
+
+        sample = items[0][1]
+        key_map = defaultdict(list)
+        for candidate in candidates:
+            candidate_values = [self._get_match_key_values(candidate, path, sample[i]) for i, path in enumerate(paths)]
+            for key in itertools.product(*candidate_values):
+                if candidate.id not in key_map[key]:
+                    key_map[key].append(candidate.id)
+        return key_map
+
+    @api.model
+    def _get_match_path_field(self, model, path):
+        field = None
+        for fname in path.split("."):
+            field = model._fields[fname]
+            model = model.env[field.comodel_name] if field.relational else model
+        return field
+
+    @api.model
+    def _normalize_match_value(self, model, path, value):
+        field = self._get_match_path_field(model, path)
+        if field.type in ("date", "datetime") and not field.relational:
+            return fields.Datetime.to_datetime(value)
+        return value
+
+    @api.model
+    def _get_match_key_values(self, record, path, value):
+        """Values of record at path, compared with value the same way as :meth:`filtered_domain`"""
+        data = record.mapped(path)
+        field = self._get_match_path_field(record, path)
+        if isinstance(data, models.BaseModel):
+            if isinstance(value, str):
+                return data.mapped("display_name") or [False]
+            return data.ids or [False]
+        if field.type in ("date", "datetime"):
+            return [fields.Datetime.to_datetime(item) for item in data] or [False]
+        return data or [False]
+
     @api.model
     def _usable_rules(self, model_name, fields, option_config_ids=False):
         result = self
@@ -0,0 +1,76 @@
+# Part of OpenSPP. See LICENSE file for full copyright and licensing details.
+
+from odoo import api, fields, models
+
+
+class SPPImportProgress(models.Model):
+    _name = "spp.import.progress"
+    _description = "Asynchronous Import Progress"
+    _order = "id desc"
+
+    name = fields.Char(required=True)
+    res_model = fields.Char("Model", required=True, index=True)
+    file_name = fields.Char()
+    row_count = fields.Integer("Rows")
+    chunk_size = fields.Integer()
+    channel = fields.Char()
+    job_ids = fields.One2many("queue.job", "import_progress_id", string="Chunk Jobs")
+    split_job_id = fields.Many2one("queue.job", string="Split Job", readonly=True, ondelete="set null")
+
+    chunk_count = fields.Integer(compute="_compute_progress")
+    done_count = fields.Integer("Done Chunks", compute="_compute_progress")
+    failed_count = fields.Integer("Failed Chunks", compute="_compute_progress")
+    imported_row_count = fields.Integer("Imported Rows", compute="_compute_progress")
+    progress = fields.Float(compute="_compute_progress")
+    rows_per_second = fields.Float(compute="_compute_progress")
+    state = fields.Selection(
+        [
+            ("split", "Splitting"),
+            ("progress", "In Progress"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        compute="_compute_progress",
+    )
+
+    @api.depends("job_ids.state", "row_count", "split_job_id.state")
+    def _compute_progress(self):
+        for rec in self:
+            done_jobs = rec.job_ids.filtered(lambda job: job.state == "done")
+            rec.chunk_count = len(rec.job_ids)
+            rec.done_count = len(done_jobs)
+            rec.failed_count = len(rec.job_ids.filtered(lambda job: job.state == "failed"))
+            rec.imported_row_count = sum(done_jobs.mapped("import_row_count"))
+            rec.progress = rec.row_count and 100.0 * rec.imported_row_count / rec.row_count
+            rec.rows_per_second = self._get_rows_per_second(done_jobs)
+
+            chunk_row_count = sum(rec.job_ids.mapped("import_row_count"))
+            if rec.failed_count or rec.split_job_id.state == "failed":
+                rec.state = "failed"
+            elif chunk_row_count < rec.row_count:
+                rec.state = "split"
+            elif rec.done_count < rec.chunk_count:
+                rec.state = "progress"
+            else:
+                rec.state = "done"
+
+    @api.model
+    def _get_rows_per_second(self, jobs):
+        exec_time = sum(jobs.mapped("exec_time"))
+        if not exec_time:
+            return 0.0
+        return sum(jobs.mapped("import_row_count")) / exec_time
+
+    @api.model
+    def _get_measured_rows_per_second(self, res_model, limit=20):
+        """Import throughput measured on the last chunk jobs of the model, 0.0 if unknown"""
+        jobs = self.env["queue.job"].search(
+            [
+                ("import_progress_id.res_model", "=", res_model),
+                ("state", "=", "done"),
+                ("exec_time", ">", 0),
+            ],
+            order="date_done desc",
+            limit=limit,
+        )
+        return self._get_rows_per_second(jobs)
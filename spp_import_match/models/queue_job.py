@@ -1,7 +1,7 @@
 # Copyright 2017 ACSONE SA/NV
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
 
-from odoo import _, models
+from odoo import _, fields, models
 
 
 class SPPQueueJob(models.Model):
@@ -9,6 +9,9 @@ class SPPQueueJob(models.Model):
 
     _inherit = "queue.job"
 
+    import_progress_id = fields.Many2one("spp.import.progress", index=True, ondelete="set null")
+    import_row_count = fields.Integer()
+
     def _related_action_attachment(self):
         res_id = self.kwargs.get("att_id")
         action = {
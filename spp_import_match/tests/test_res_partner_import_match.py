@@ -171,3 +171,95 @@ class TestResPartnerImportMatch(TransactionCase):
         )
 
         self.assertEqual(result, import_match.model_id)
+
+    def test_07_write_empty_x2many_in_import(self):
+        """Empty x2many values are only ignored on writes made by an import."""
+        category = self.env["res.partner.category"].create({"name": "Import Match [TEST]"})
+        self._test_applicant.category_id = category
+
+        self._test_applicant.with_context(import_match_load=True).write({"category_id": False, "email": False})
+        self.assertEqual(self._test_applicant.category_id, category)
+        self.assertFalse(self._test_applicant.email)
+
+        self._test_applicant.write({"category_id": False})
+        self.assertFalse(self._test_applicant.category_id)
+
+    def test_08_match_find_bulk(self):
+        """Match a chunk of rows at once."""
+        self.create_matching_name()
+        rows = [
+            ({"name": "Renaud"}, {"name": "Renaud", "id": None}),
+            ({"name": "Not Renaud [TEST]"}, {"name": "Not Renaud [TEST]", "id": None}),
+            ({"name": "Rufino Renaud"}, {"name": "Rufino Renaud", "id": None}),
+        ]
+        partner_model = self.env["res.partner"]
+        result = self.env["spp.import.match"]._match_find_bulk(partner_model, rows)
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[0], self._test_hh)
+        self.assertFalse(result[1])
+        self.assertEqual(result[2], self._test_applicant)
+        for index, (converted_row, imported_row) in enumerate(rows):
+            self.assertEqual(
+                result[index],
+                self.env["spp.import.match"]._match_find(partner_model, converted_row, imported_row),
+            )
+
+    def test_09_extract_chunks_on_record_boundaries(self):
+        """Chunks are read from an iterator and never split a record."""
+        rows = iter([["A", "Child 1"], ["", "Child 2"], ["B", ""], ["C", ""]])
+        chunks = list(
+            self.env["base_import.import"]._extract_chunks(self.env["res.partner"], ["name", "child_ids/name"], rows, 1)
+        )
+        self.assertEqual(
+            chunks,
+            [
+                (0, [["A", "Child 1"], ["", "Child 2"]]),
+                (2, [["B", ""]]),
+                (3, [["C", ""]]),
+            ],
+        )
+
+    def test_10_async_import_progress(self):
+        """Async imports are tracked and split in adaptive chunks."""
+        file_path = self.get_file_path_3()
+        record = self._base_import_record("res.partner", file_path)
+
+        async_rec = record.execute_import(["name", "email"], ["name", "email"], OPTIONS)
+        progress = self.env["spp.import.progress"].browse(async_rec["import_progress_id"])
+        self.assertEqual(progress.res_model, "res.partner")
+        self.assertEqual(progress.channel, "root.spp_import")
+        self.assertGreater(progress.row_count, 100)
+        # The chunk jobs are enqueued by the split job
+        self.assertEqual(progress.state, "split")
+        self.assertFalse(progress.job_ids)
+
+        # The split job streams the stored rows into the chunk jobs
+        split_job = self.env["queue.job"].search([("method_name", "=", "_split_file")], order="id desc", limit=1)
+        split_job.records._split_file(*split_job.args, **split_job.kwargs)
+        progress.invalidate_recordset()
+        self.assertEqual(progress.state, "progress")
+        self.assertEqual(sum(progress.job_ids.mapped("import_row_count")), progress.row_count)
+        self.assertEqual(set(progress.job_ids.mapped("method_name")), {"_import_one_chunk"})
+
+        base_import = self.env["base_import.import"]
+        self.assertEqual(base_import._get_chunk_size("res.partner", 10), 1200)
+        self.assertEqual(base_import._get_chunk_size("res.partner", 5_000_000), 5000)
+        self.env["ir.config_parameter"].sudo().set_param("spp_import_match.target_job_duration", 1)
+        self.assertEqual(base_import._get_chunk_size("res.partner", 10), 100)
+
+    def test_11_async_import_split_failure(self):
+        """The progress of an import whose split job failed does not stay in the splitting state."""
+        file_path = self.get_file_path_3()
+        record = self._base_import_record("res.partner", file_path)
+
+        async_rec = record.execute_import(["name", "email"], ["name", "email"], OPTIONS)
+        progress = self.env["spp.import.progress"].browse(async_rec["import_progress_id"])
+        self.assertEqual(progress.split_job_id.method_name, "_split_file")
+        self.assertEqual(progress.state, "split")
+
+        progress.split_job_id.write({"state": "failed"})
+        self.assertEqual(progress.state, "failed")
+
+        progress.split_job_id.write({"state": "pending"})
+        self.assertEqual(progress.state, "split")
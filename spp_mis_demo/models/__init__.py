@@ -6,3 +6,4 @@ from . import generate_group
 from . import generate_program
 from . import individual
 from . import group
+from . import group_membership
@@ -1,16 +1,32 @@
 # Part of OpenSPP. See LICENSE file for full copyright and licensing details.
+import calendar
 import datetime
 import logging
 
 from dateutil.relativedelta import relativedelta
 
-from odoo import fields, models
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.sql import create_index, index_exists
 
 _logger = logging.getLogger(__name__)
 
 CHILDREN_AGE_LIMIT = 18
 ELDERLY_AGE_LIMIT = 65
 
+# Daily indicators that only move when a member has a birthday
+BIRTHDATE_DAILY_INDICATORS = {
+    "z_ind_grp_num_adults",
+    "z_ind_grp_num_adults_woman",
+    "z_ind_grp_num_elderly",
+    "z_ind_grp_is_hh_with_children",
+    "z_ind_grp_is_hh_with_elderly",
+    "z_ind_grp_is_elderly_head_hh",
+}
+# Must match the expression filtered on in `_get_recompute_daily_ids` for the index to be used
+BIRTHDAY_INDEX = "res_partner_birthday_index"
+BIRTHDAY_EXPRESSION = "(EXTRACT(MONTH FROM birthdate) * 100 + EXTRACT(DAY FROM birthdate))"
+
 
 class G2PGroup(models.Model):
     _inherit = "res.partner"
@@ -135,6 +151,46 @@ class G2PGroup(models.Model):
         recompute_daily=True,
     )
 
+    def init(self):
+        super().init()
+        if not index_exists(self.env.cr, BIRTHDAY_INDEX):
+            create_index(self.env.cr, BIRTHDAY_INDEX, self._table, [BIRTHDAY_EXPRESSION], where="birthdate IS NOT NULL")
+
+    @api.model
+    def _get_recompute_daily_ids(self, field_names, days):
+        """
+        Groups with a member whose birthday fell on one of ``days`` or on the day
+        before: an age threshold can only be crossed on a birthday, or on the day
+        after it for the thresholds compared with a strict inequality.
+        """
+        if not set(field_names) <= BIRTHDATE_DAILY_INDICATORS:
+            return super()._get_recompute_daily_ids(field_names, days)
+        birthdays = set()
+        for day in days:
+            for birthday in (day, day - datetime.timedelta(days=1)):
+                birthdays.add(birthday.month * 100 + birthday.day)
+            # People born on Feb 29 come of age on Mar 1 in common years
+            if (day.month, day.day) == (3, 1) and not calendar.isleap(day.year):
+                birthdays.add(229)
+        if not birthdays:
+            return []
+        self.env["g2p.group.membership"].flush_model(["group", "individual"])
+        self.flush_model(["birthdate"])
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT DISTINCT membership."group"
+                FROM g2p_group_membership membership
+                JOIN res_partner individual ON individual.id = membership.individual
+                WHERE individual.birthdate IS NOT NULL
+                AND (EXTRACT(MONTH FROM individual.birthdate) * 100 + EXTRACT(DAY FROM individual.birthdate))
+                    = ANY(%(birthdays)s)
+                """,
+                birthdays=sorted(birthdays),
+            )
+        )
+        return [row[0] for row in self.env.cr.fetchall()]
+
     def _compute_ind_grp_num_children(self):
         """
         Households (HH) with children
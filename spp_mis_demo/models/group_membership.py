@@ -0,0 +1,27 @@
+# Part of OpenSPP. See LICENSE file for full copyright and licensing details.
+from odoo import api, models
+
+# Membership fields read by the daily indicators of the group
+GROUP_DAILY_INDICATOR_INPUTS = {"group", "individual", "kind", "ended_date"}
+
+
+class G2PGroupMembership(models.Model):
+    _inherit = "g2p.group.membership"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records.group._mark_recompute_daily()
+        return records
+
+    def write(self, vals):
+        if not GROUP_DAILY_INDICATOR_INPUTS.intersection(vals):
+            return super().write(vals)
+        groups = self.group
+        res = super().write(vals)
+        (groups | self.group)._mark_recompute_daily()
+        return res
+
+    def unlink(self):
+        self.group._mark_recompute_daily()
+        return super().unlink()
@@ -5,6 +5,9 @@ from odoo import fields, models
 
 _logger = logging.getLogger(__name__)
 
+# Individual fields read by the daily indicators of their groups
+GROUP_DAILY_INDICATOR_INPUTS = {"birthdate", "gender"}
+
 
 class G2PIndividual(models.Model):
     _inherit = "res.partner"
@@ -15,3 +18,9 @@ class G2PIndividual(models.Model):
     z_cst_indv_disability_level = fields.Integer("Disability level")  # 0-100
     z_cst_indv_pregnancy_start = fields.Date("Pregnancy start")  # We set a date to be able to clean it later
     z_cst_indv_lactation_start = fields.Date("Lactation start")  # We set a date to be able to clean it later
+
+    def write(self, vals):
+        res = super().write(vals)
+        if GROUP_DAILY_INDICATOR_INPUTS.intersection(vals):
+            self.filtered(lambda rec: not rec.is_group).individual_membership_ids.group._mark_recompute_daily()
+        return res
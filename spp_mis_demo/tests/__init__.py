@@ -1,3 +1,4 @@
 from . import test_cus_partner
 from . import test_generate_group
 from . import test_generate_program
+from . import test_group_daily_indicators
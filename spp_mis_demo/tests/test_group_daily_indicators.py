@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+from dateutil.relativedelta import relativedelta
+
+from odoo.tests.common import TransactionCase
+
+
+class TestGroupDailyIndicators(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.today = date.today()
+        cls.group = cls.env["res.partner"].create({"name": "Daily Group", "is_group": True, "is_registrant": True})
+        cls.individual = cls.env["res.partner"].create(
+            {
+                "name": "Daily Individual",
+                "is_group": False,
+                "is_registrant": True,
+                "birthdate": cls.today - relativedelta(years=18),
+            }
+        )
+        cls.env["g2p.group.membership"].create({"group": cls.group.id, "individual": cls.individual.id})
+
+    def _pending_group_ids(self):
+        return self.env["spp.recompute.daily.record"].search([("model", "=", "res.partner")]).mapped("res_id")
+
+    def test_get_recompute_daily_ids(self):
+        partners = self.env["res.partner"]
+        group_ids = partners._get_recompute_daily_ids(["z_ind_grp_num_adults"], [self.today])
+        self.assertIn(self.group.id, group_ids)
+        # Adults are born strictly before the cutoff, so they only count as such the day after their birthday
+        group_ids = partners._get_recompute_daily_ids(["z_ind_grp_num_adults"], [self.today + timedelta(days=1)])
+        self.assertIn(self.group.id, group_ids)
+        group_ids = partners._get_recompute_daily_ids(["z_ind_grp_num_adults"], [self.today + timedelta(days=2)])
+        self.assertNotIn(self.group.id, group_ids)
+        self.assertEqual(partners._get_recompute_daily_ids(["z_ind_grp_num_adults"], []), [])
+        self.assertIsNone(partners._get_recompute_daily_ids(["name"], [self.today]))
+
+    def test_mark_recompute_daily(self):
+        self.assertIn(self.group.id, self._pending_group_ids())
+        self.env["spp.recompute.daily.record"].search([]).unlink()
+        self.individual.write({"name": "Daily Individual Renamed"})
+        self.assertNotIn(self.group.id, self._pending_group_ids())
+        self.individual.write({"birthdate": self.today - relativedelta(years=70)})
+        self.assertIn(self.group.id, self._pending_group_ids())
+
+    def test_daily_recompute_age_threshold(self):
+        # The member turned 18 yesterday, so is an adult since today
+        self.individual.write({"birthdate": self.today - relativedelta(years=18) - timedelta(days=1)})
+        self.env.flush_all()
+        # Simulate the value stored before the threshold was crossed
+        self.env.cr.execute(
+            "UPDATE res_partner SET z_ind_grp_num_adults = 0 WHERE id = %s",
+            (self.group.id,),
+        )
+        self.group.invalidate_recordset(["z_ind_grp_num_adults"])
+        self.env["spp.recompute.daily.record"].search([]).unlink()
+        self.env["ir.config_parameter"].sudo().set_param(
+            "spp.daily_recompute_last_run", str(self.today - timedelta(days=1))
+        )
+
+        report = self.env["ir.model.fields"]._daily_recompute_indicators()
+        self.assertGreaterEqual(report["res.partner"]["recomputed"], 1)
+        self.assertEqual(self.group.z_ind_grp_num_adults, 1)
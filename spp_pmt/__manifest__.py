@@ -19,6 +19,7 @@
         "spp_custom_fields_ui",
         "spp_area",
     ],
+    "external_dependencies": {"python": ["numpy"]},
     "data": [
         "security/ir.model.access.csv",
         "views/custom_fields_ui_view.xml",
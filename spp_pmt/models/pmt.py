@@ -1,7 +1,10 @@
 # Part of OpenSPP. See LICENSE file for full copyright and licensing details.
 import logging
 
+import numpy as np
+
 from odoo import fields, models
+from odoo.tools import SQL, split_every
 
 _logger = logging.getLogger(__name__)
 
@@ -10,6 +13,9 @@ _logger = logging.getLogger(__name__)
 class G2PGroupPMT(models.Model):
     _inherit = "res.partner"
 
+    # Number of groups whose PMT score is computed at once
+    PMT_BATCH_SIZE = 5000
+
     # Boolean fields capturing specific conditions of an individual
     x_cst_indv_gce_ol = fields.Boolean("Lower than G.C.E. Ordinary Level")
     x_cst_indv_school_age = fields.Boolean("Currently not attending school or other educational institution")
@@ -40,49 +46,104 @@ class G2PGroupPMT(models.Model):
 
             rec.area_calc = area_calc
 
-    def compute_score(self, field_name):
-        hh_area = self.area_id
-
-        model = self.env["ir.model"].search([("model", "=", "res.partner")])
+    def _get_pmt_weights(self):
+        """
+        Get the weighted indicator fields of the individuals and their weights.
 
-        fields = self.env["ir.model.fields"].search(
+        :return: a tuple (field names, default weight vector, dictionary of weight vectors by area id)
+        """
+        weighted_fields = self.env["ir.model.fields"].search(
             [
-                ("model_id", "=", model.id),
+                ("model_id", "=", self.env["ir.model"]._get_id("res.partner")),
                 ("with_weight", "=", True),
                 ("target_type", "=", "indv"),
             ]
         )
-        weights = {}
-        if fields:
-            for field in fields:
-                if hh_area:
-                    areas = field.area_ids.filtered(lambda a: a.name.id == hh_area.id)
-                    if areas:
-                        weights.update({field.name: areas[0].weight})
-                    else:
-                        weights.update({field.name: field.field_weight})
-                else:
-                    weights.update({field.name: field.field_weight})
-
-        for record in self:
-            if weights:
-                z_ind_grp_pmt_score = 0
-                if record.group_membership_ids:
-                    total_score = 0.0
-                    total_weight = 0.0
-                    # Iterating through each member of the group to calculate the PMT score
-                    for ind in record.group_membership_ids:
-                        for field, weight in weights.items():
-                            if hasattr(ind.individual, field):
-                                total_score += getattr(ind.individual, field) * weight
-                                total_weight += weight
-                    if total_weight > 0:
-                        z_ind_grp_pmt_score = total_score / total_weight
-                    else:
-                        z_ind_grp_pmt_score = 0
-                setattr(record, field_name, z_ind_grp_pmt_score)
-            else:
+        weighted_fields = [field for field in weighted_fields if field.name in self._fields]
+        default_weights = np.array([field.field_weight for field in weighted_fields], dtype=float)
+        area_weights = {}
+        for index, field in enumerate(weighted_fields):
+            # The first weight defined for an area is used
+            for area in reversed(field.area_ids):
+                area_weights.setdefault(area.name.id, default_weights.copy())[index] = area.weight
+        return [field.name for field in weighted_fields], default_weights, area_weights
+
+    def _get_pmt_indicator_values(self, field_names):
+        """
+        Load the indicator values of the individuals in a matrix, one row per individual.
+
+        :param field_names: the names of the indicator fields, one column per field
+        :return: a NumPy array of shape (len(self), len(field_names))
+        """
+        values = np.zeros((len(self), len(field_names)))
+        if not self:
+            return values
+        index_by_id = {partner_id: index for index, partner_id in enumerate(self.ids)}
+        stored = [name for name in field_names if self._fields[name].store and self._fields[name].column_type]
+        if stored:
+            # Read the stored indicators of all the individuals at once
+            self.flush_model(stored)
+            self.env.cr.execute(
+                SQL(
+                    "SELECT id, %s FROM res_partner WHERE id = ANY(%s)",
+                    SQL(", ").join(SQL.identifier(name) for name in stored),
+                    self.ids,
+                )
+            )
+            rows = self.env.cr.fetchall()
+            if rows:
+                # NULL values are converted to NaN
+                matrix = np.array([row[1:] for row in rows], dtype=float)
+                rows_index = [index_by_id[row[0]] for row in rows]
+                columns_index = [field_names.index(name) for name in stored]
+                values[np.ix_(rows_index, columns_index)] = matrix
+        others = [name for name in field_names if name not in stored]
+        if others:
+            columns_index = [field_names.index(name) for name in others]
+            for row in self.read(others, load=None):
+                values[index_by_id[row["id"]], columns_index] = [row[name] or 0 for name in others]
+        return np.nan_to_num(values)
+
+    def _compute_pmt_scores(self, field_names, default_weights, area_weights):
+        """
+        Compute the PMT score of the groups.
+
+        The score of a group is the weighted mean of the indicators of its members, using the
+        weights of the area of the group.
+
+        :return: a NumPy array of the scores, in the order of the groups
+        """
+        group_index = {group_id: index for index, group_id in enumerate(self.ids)}
+        memberships = self.group_membership_ids.read(["group", "individual"], load=None)
+        if not memberships:
+            return np.zeros(len(self))
+
+        individuals = self.browse({membership["individual"] for membership in memberships})
+        individual_index = {individual_id: index for index, individual_id in enumerate(individuals.ids)}
+        values = individuals._get_pmt_indicator_values(field_names)
+
+        group_weights = np.array([area_weights.get(group.area_id.id, default_weights) for group in self])
+        group_positions = np.array([group_index[membership["group"]] for membership in memberships])
+        member_positions = np.array([individual_index[membership["individual"]] for membership in memberships])
+
+        # One row per membership: the weights of the group and the values of the member
+        membership_weights = group_weights[group_positions]
+        membership_scores = (values[member_positions] * membership_weights).sum(axis=1)
+        total_score = np.bincount(group_positions, weights=membership_scores, minlength=len(self))
+        total_weight = np.bincount(group_positions, weights=membership_weights.sum(axis=1), minlength=len(self))
+        return np.divide(total_score, total_weight, out=np.zeros(len(self)), where=total_weight > 0)
+
+    def compute_score(self, field_name):
+        field_names, default_weights, area_weights = self._get_pmt_weights()
+        if not field_names:
+            for record in self:
                 setattr(record, field_name, 0)
+            return
+
+        for batch in split_every(self.PMT_BATCH_SIZE, self.ids, self.browse):
+            scores = batch._compute_pmt_scores(field_names, default_weights, area_weights)
+            for record, score in zip(batch, scores.tolist(), strict=True):
+                setattr(record, field_name, score)
 
     def _compute_z_ind_grp_pmt_score(self):
         self.compute_score("z_ind_grp_pmt_score")
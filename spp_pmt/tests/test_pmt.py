@@ -1,5 +1,7 @@
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+
 from odoo import fields
 from odoo.tests.common import TransactionCase
 
@@ -69,3 +71,111 @@ class PMTTest(TransactionCase):
 
         self.group_1.compute_score("z_ind_grp_pmt_score")
         self.assertEqual(self.group_1.z_ind_grp_pmt_score, 1)
+
+    def test_compute_pmt_scores_batch(self):
+        registrant_2 = self.env["res.partner"].create(
+            {"name": "Registrant 2", "is_group": False, "is_registrant": True}
+        )
+        registrant_3 = self.env["res.partner"].create(
+            {"name": "Registrant 3", "is_group": False, "is_registrant": True, "x_cst_indv_disability": True}
+        )
+        group_2 = self.env["res.partner"].create({"name": "Group 2", "is_group": True, "is_registrant": True})
+        self.env["g2p.group.membership"].create(
+            [
+                {"group": self.group_1.id, "individual": registrant_2.id},
+                {"group": group_2.id, "individual": registrant_3.id},
+            ]
+        )
+        self.registrant_1.write({"x_cst_indv_disability": True, "x_cst_indv_chronic_disease": True})
+
+        weights = (
+            ["x_cst_indv_disability", "x_cst_indv_chronic_disease"],
+            np.array([2.0, 1.0]),
+            {self.area_1.id: np.array([4.0, 0.0])},
+        )
+        with patch.object(type(self.env["res.partner"]), "_get_pmt_weights", return_value=weights):
+            (self.group_1 | group_2).compute_score("z_ind_grp_pmt_score")
+
+        # Group 1 uses the weights of its area: (1 * 4 + 1 * 0 + 0 * 4 + 0 * 0) / (4 + 0 + 4 + 0)
+        self.assertAlmostEqual(self.group_1.z_ind_grp_pmt_score, 0.5)
+        # Group 2 has no area and uses the default weights: (1 * 2 + 0 * 1) / (2 + 1)
+        self.assertAlmostEqual(group_2.z_ind_grp_pmt_score, 2 / 3)
+
+    def _get_per_member_score(self, group):
+        """The PMT score of a group computed member by member, as it was before the batched computation"""
+        weighted_fields = self.env["ir.model.fields"].search(
+            [
+                ("model_id", "=", self.env["ir.model"]._get_id("res.partner")),
+                ("with_weight", "=", True),
+                ("target_type", "=", "indv"),
+            ]
+        )
+        weights = {}
+        for field in weighted_fields:
+            areas = field.area_ids.filtered(lambda a: a.name == group.area_id) if group.area_id else None
+            weights[field.name] = areas[0].weight if areas else field.field_weight
+        total_score = total_weight = 0.0
+        for membership in group.group_membership_ids:
+            for field_name, weight in weights.items():
+                if hasattr(membership.individual, field_name):
+                    total_score += (membership.individual[field_name] or 0) * weight
+                    total_weight += weight
+        return total_score / total_weight if total_weight > 0 else 0
+
+    def test_compute_score_with_area_weights(self):
+        area_2 = self.env["spp.area"].create({"draft_name": "Area 2"})
+        common_values = {
+            "model_id": self.env["ir.model"]._get_id("res.partner"),
+            "state": "manual",
+            "ttype": "float",
+            "target_type": "indv",
+            "with_weight": True,
+        }
+        self.env["ir.model.fields"].create(
+            [
+                dict(
+                    common_values,
+                    name="x_cst_indv_pmt_test_rooms",
+                    field_description="Rooms",
+                    field_weight=2.0,
+                    area_ids=[
+                        (0, 0, {"name": self.area_1.id, "weight": 3.0}),
+                        # Only the first weight of an area is used
+                        (0, 0, {"name": self.area_1.id, "weight": 9.0}),
+                        (0, 0, {"name": area_2.id, "weight": 5.0}),
+                    ],
+                ),
+                dict(
+                    common_values,
+                    name="x_cst_indv_pmt_test_income",
+                    field_description="Income",
+                    field_weight=1.0,
+                ),
+            ]
+        )
+        registrant_2 = self.env["res.partner"].create(
+            {"name": "Registrant 2", "is_group": False, "is_registrant": True}
+        )
+        registrant_3 = self.env["res.partner"].create(
+            {"name": "Registrant 3", "is_group": False, "is_registrant": True}
+        )
+        group_2 = self.env["res.partner"].create({"name": "Group 2", "is_group": True, "is_registrant": True})
+        self.env["g2p.group.membership"].create(
+            [
+                {"group": self.group_1.id, "individual": registrant_2.id},
+                {"group": group_2.id, "individual": registrant_3.id},
+            ]
+        )
+        self.registrant_1.write({"x_cst_indv_pmt_test_rooms": 2.0, "x_cst_indv_pmt_test_income": 1.0})
+        registrant_2.write({"x_cst_indv_pmt_test_rooms": 4.0})
+        registrant_3.write({"x_cst_indv_pmt_test_rooms": 1.0, "x_cst_indv_pmt_test_income": 3.0})
+
+        groups = self.group_1 | group_2
+        groups.compute_score("z_ind_grp_pmt_score")
+
+        # Group 1 uses the first weight of its area: (2 * 3 + 1 * 1 + 4 * 3 + 0 * 1) / (3 + 1 + 3 + 1)
+        self.assertAlmostEqual(self.group_1.z_ind_grp_pmt_score, 19 / 8)
+        # Group 2 has no area and uses the default weights: (1 * 2 + 3 * 1) / (2 + 1)
+        self.assertAlmostEqual(group_2.z_ind_grp_pmt_score, 5 / 3)
+        for group in groups:
+            self.assertAlmostEqual(group.z_ind_grp_pmt_score, self._get_per_member_score(group))
@@ -3,6 +3,8 @@
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
 
+from ..tools.id_ranges import get_id_ranges, id_range_domain
+
 
 class G2PCycle(models.Model):
     _inherit = "g2p.cycle"
@@ -29,6 +31,8 @@ class G2PCycle(models.Model):
         limit=None,
         order=None,
         count=False,
+        min_id=None,
+        max_id=None,
     ):
         """
         Query entitlements based on state.
@@ -39,17 +43,33 @@ class G2PCycle(models.Model):
         :param limit: Optional integer value for the ORM search limit
         :param order: Optional string value for the ORM search order fields
         :param count: Optional boolean for executing a search-count (if true) or search (if false: default)
+        :param min_id: Optional integer value for the smallest entitlement ID to return
+        :param max_id: Optional integer value for the largest entitlement ID to return
         :return:
         """
+        domain = self._get_entitlements_domain(state) + id_range_domain(min_id, max_id)
+
+        if count:
+            return self.env["g2p.cycle.membership"].search_count(domain, limit=limit)
+        return self.env[entitlement_model].search(domain, offset=offset, limit=limit, order=order)
+
+    def _get_entitlements_domain(self, state):
         domain = [("cycle_id", "=", self.id)]
         if state:
             if isinstance(state, str):
                 state = [state]
             domain += [("state", "in", state)]
+        return domain
 
-        if count:
-            return self.env["g2p.cycle.membership"].search_count(domain, limit=limit)
-        return self.env[entitlement_model].search(domain, offset=offset, limit=limit, order=order)
+    def get_entitlement_id_ranges(self, state, entitlement_model="g2p.entitlement", chunk_size=1000):
+        """
+        Snapshot the entitlements of the cycle into id ranges of at most chunk_size entitlements.
+        :param state: List of states
+        :param entitlement_model: String value of entitlement model to search
+        :param chunk_size: Integer maximum number of entitlements per range
+        :return: List of (min_id, max_id) tuples to pass to :meth:`get_entitlements`
+        """
+        return get_id_ranges(self.env[entitlement_model], self._get_entitlements_domain(state), chunk_size)
 
     @api.constrains("start_date", "end_date")
     def _check_dates(self):
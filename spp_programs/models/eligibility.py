@@ -4,24 +4,64 @@ import logging
 
 from odoo import models
 
+from odoo.addons.queue_job.delay import group
+
+from ..tools.id_ranges import id_range_domain, split_id_ranges
+
 _logger = logging.getLogger(__name__)
 
 
+class BaseEligibilityManager(models.AbstractModel):
+    _inherit = "g2p.program_membership.manager"
+
+    MAX_ROW_JOB_QUEUE = 10000
+
+    def _get_new_beneficiaries(self, domain=None):
+        """
+        Eligible registrants that are not members of the program yet.
+        :param domain: Optional domain further restricting the registrants
+        :return: A recordset of res.partner
+        """
+        self.ensure_one()
+        new_beneficiaries = self.env["res.partner"].search(self._prepare_eligible_domain() + (domain or []))
+        # Exclude already added beneficiaries
+        members = self.env["g2p.program_membership"].search(
+            [("program_id", "=", self.program_id.id), ("partner_id", "in", new_beneficiaries.ids)]
+        )
+        return new_beneficiaries - members.partner_id
+
+    def _import_registrants_by_id_ranges(self, new_beneficiaries, state="draft"):
+        """
+        Import the registrants in queue jobs, each one given the bounds of a range of
+        registrant ids rather than the ids themselves.
+        """
+        self.ensure_one()
+        program = self.program_id
+        program.message_post(body="Import of %s beneficiaries started." % len(new_beneficiaries))
+        program.write({"locked": True, "locked_reason": "Importing beneficiaries"})
+
+        jobs = [
+            self.delayable()._import_registrants_in_range(state, min_id, max_id)
+            for min_id, max_id in split_id_ranges(new_beneficiaries.ids, self.MAX_ROW_JOB_QUEUE)
+        ]
+        if not jobs:
+            return self.mark_import_as_done()
+        main_job = group(*jobs)
+        main_job.on_done(self.delayable().mark_import_as_done())
+        main_job.delay()
+
+    def _import_registrants_in_range(self, state, min_id, max_id):
+        new_beneficiaries = self._get_new_beneficiaries(id_range_domain(min_id, max_id))
+        self._import_registrants(new_beneficiaries, state=state)
+
+
 class CustomDefaultEligibilityManager(models.Model):
     _inherit = "g2p.program_membership.manager.default"
 
     def import_eligible_registrants(self, state="draft"):
         ben_count = 0
         for rec in self:
-            domain = rec._prepare_eligible_domain()
-            new_beneficiaries = self.env["res.partner"].search(domain)
-            # _logger.debug("Found %s beneficiaries", len(new_beneficiaries))
-
-            # Exclude already added beneficiaries
-            beneficiary_ids = rec.program_id.get_beneficiaries().mapped("partner_id")
-
-            # _logger.debug("Excluding %s beneficiaries", len(beneficiary_ids))
-            new_beneficiaries = new_beneficiaries - beneficiary_ids
+            new_beneficiaries = rec._get_new_beneficiaries()
             # _logger.debug("Finally %s beneficiaries", len(new_beneficiaries))
 
             ben_count = len(new_beneficiaries)
@@ -31,3 +71,6 @@ class CustomDefaultEligibilityManager(models.Model):
                 rec._import_registrants_async(new_beneficiaries, state=state)
 
         return ben_count
+
+    def _import_registrants_async(self, new_beneficiaries, state="draft"):
+        self._import_registrants_by_id_ranges(new_beneficiaries, state=state)
@@ -1,16 +1,19 @@
 # Part of OpenSPP. See LICENSE file for full copyright and licensing details.
 
 import logging
+import time
 from uuid import uuid4
 
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
-from odoo.tools import float_compare
+from odoo.tools import float_compare, split_every
 
 from . import constants
 
 _logger = logging.getLogger(__name__)
 
+PROCUREMENT_BATCH_SIZE = 1000
+
 
 class InKindEntitlement(models.Model):
     _name = "g2p.entitlement.inkind"
@@ -228,16 +231,21 @@ class InKindEntitlement(models.Model):
             "partner_id": self.partner_id.id,
         }
 
-    def _action_launch_stock_rule(self):
+    def _action_launch_stock_rule(self, merge_moves=False):
         """
         Launch procurement group run method with required/custom fields generated by an
         entitlement. procurement group will launch '_run_pull', '_run_buy' or '_run_manufacture'
         depending on the entitlement product rule.
+
+        All the procurements of the recordset are run together. With ``merge_moves``, the
+        procurements sharing a cycle, warehouse, product and service point are merged into
+        one; the resulting stock moves are then not linked to individual entitlements.
         """
         if self._context.get("skip_procurement"):
             return True
         precision = self.env["decimal.precision"].precision_get("Product Unit of Measure")
-        procurements = []
+        procurement_groups = {}
+        procurements = {}
         for row in self:
             row = row.with_company(row.company_id)
             if row.product_id.type not in ("consu", "product"):
@@ -246,20 +254,9 @@ class InKindEntitlement(models.Model):
             if float_compare(qty, float(row.qty), precision_digits=precision) == 0:
                 continue
 
-            group_id = row._get_procurement_group()
-            if not group_id:
-                group_id = self.env["procurement.group"].create(row._prepare_procurement_group_vals())
-                row.cycle_id.procurement_group_id = group_id
-            else:
-                # In case the procurement group is already created and the entitlement was
-                # cancelled, we need to update certain values of the group.
-                updated_vals = {}
-                if group_id.partner_id != row.partner_id:
-                    updated_vals.update({"partner_id": row.partner_id.id})
-                if group_id.move_type != "direct":
-                    updated_vals.update({"move_type": "direct"})
-                if updated_vals:
-                    group_id.write(updated_vals)
+            group_id = procurement_groups.get(row.cycle_id)
+            if group_id is None:
+                group_id = procurement_groups[row.cycle_id] = row._get_or_update_procurement_group()
 
             values = row._prepare_procurement_values(group_id=group_id)
             product_qty = float(row.qty) - qty
@@ -267,20 +264,46 @@ class InKindEntitlement(models.Model):
             row_uom = row.uom_id
             quant_uom = row.product_id.uom_id
             product_qty, procurement_uom = row_uom._adjust_uom_quantities(product_qty, quant_uom)
-            procurements.append(
-                self.env["procurement.group"].Procurement(
+            location = row.partner_id.property_stock_customer
+            if not merge_moves:
+                procurements[row.id] = self.env["procurement.group"].Procurement(
                     row.product_id,
                     product_qty,
                     procurement_uom,
-                    row.partner_id.property_stock_customer,
+                    location,
                     row.name,
                     row.cycle_id.name,
                     row.company_id,
                     values,
                 )
+                continue
+            key = (
+                group_id,
+                row.company_id,
+                row.warehouse_id,
+                row.route_id,
+                row.product_id,
+                procurement_uom,
+                location,
+                row.service_point_id,
+            )
+            merged = procurements.get(key)
+            if merged:
+                product_qty += merged.product_qty
+            else:
+                values.update({"entitlement_id": False, "partner_id": False})
+            procurements[key] = self.env["procurement.group"].Procurement(
+                row.product_id,
+                product_qty,
+                procurement_uom,
+                location,
+                merged.name if merged else row.product_id.display_name,
+                row.cycle_id.name,
+                row.company_id,
+                merged.values if merged else values,
             )
         if procurements:
-            self.env["procurement.group"].run(procurements)
+            self.env["procurement.group"].run(list(procurements.values()))
 
         # This next block is currently needed only because the scheduler trigger is done by picking confirmation
         # rather than stock.move confirmation
@@ -291,3 +314,50 @@ class InKindEntitlement(models.Model):
                 # Trigger the Scheduler for Pickings
                 pickings_to_confirm.action_confirm()
         return True
+
+    def _get_or_update_procurement_group(self):
+        self.ensure_one()
+        group_id = self._get_procurement_group()
+        if not group_id:
+            group_id = self.env["procurement.group"].create(self._prepare_procurement_group_vals())
+            self.cycle_id.procurement_group_id = group_id
+        else:
+            # In case the procurement group is already created and the entitlement was
+            # cancelled, we need to update certain values of the group.
+            updated_vals = {}
+            if group_id.partner_id != self.partner_id:
+                updated_vals.update({"partner_id": self.partner_id.id})
+            if group_id.move_type != "direct":
+                updated_vals.update({"move_type": "direct"})
+            if updated_vals:
+                group_id.write(updated_vals)
+        return group_id
+
+    def _action_launch_stock_rule_batched(self, batch_size=PROCUREMENT_BATCH_SIZE, merge_moves=False):
+        """
+        Launch the stock rules of the entitlements batch by batch, logging how many stock
+        moves and queries each batch took.
+        :param batch_size: Number of entitlements whose procurements are run together
+        :param merge_moves: See `_action_launch_stock_rule`
+        :return: A list of dicts with the entitlements, moves, queries and duration of each batch
+        """
+        stats = []
+        stock_move = self.env["stock.move"]
+        for batch in split_every(batch_size, self.ids, self.browse):
+            last_move_id = stock_move.search([], order="id desc", limit=1).id or 0
+            query_count = self.env.cr.sql_log_count
+            start = time.perf_counter()
+            batch._action_launch_stock_rule(merge_moves=merge_moves)
+            batch_stats = {
+                "entitlements": len(batch),
+                "moves": stock_move.search_count([("id", ">", last_move_id)]),
+                "queries": self.env.cr.sql_log_count - query_count,
+                "duration": time.perf_counter() - start,
+            }
+            _logger.info(
+                "Launched stock rules of %(entitlements)s entitlements: "
+                "%(moves)s stock moves, %(queries)s queries in %(duration).2fs",
+                batch_stats,
+            )
+            stats.append(batch_stats)
+        return stats
@@ -1,4 +1,14 @@
-from odoo import models
+import logging
+
+from odoo import _, models
+from odoo.exceptions import UserError
+
+from odoo.addons.g2p_programs.models import constants
+from odoo.addons.queue_job.delay import group
+
+from ...tools.id_ranges import get_id_ranges, id_range_domain
+
+_logger = logging.getLogger(__name__)
 
 
 class CustomDefaultCycleManager(models.Model):
@@ -22,7 +32,42 @@ class CustomDefaultCycleManager(models.Model):
         cycle._compute_inkind_entitlements_count()
         return
 
-    def _prepare_entitlements(self, cycle, offset=0, limit=None, do_count=False):
+    def _get_enrolled_beneficiaries_domain(self, cycle):
+        return [("cycle_id", "=", cycle.id), ("state", "in", ["enrolled"])]
+
+    def _prepare_entitlements_async(self, cycle, beneficiaries_count):
+        """Prepare Entitlements Asynchronously
+        Split the enrolled beneficiaries of the cycle into id ranges and prepare the
+        entitlements of each range in its own job.
+
+        :param cycle: The cycle
+        :param beneficiaries_count: Integer - total number of beneficiaries to process
+        :return:
+        """
+        _logger.debug("Prepare entitlement asynchronously")
+        cycle.message_post(body=_("Prepare entitlement for %s beneficiaries started.", beneficiaries_count))
+        cycle.write(
+            {
+                "locked": True,
+                "locked_reason": _("Prepare entitlement for beneficiaries."),
+            }
+        )
+
+        id_ranges = get_id_ranges(
+            self.env["g2p.cycle.membership"],
+            self._get_enrolled_beneficiaries_domain(cycle),
+            self.MAX_ROW_JOB_QUEUE,
+        )
+        jobs = [
+            self.delayable()._prepare_entitlements(cycle, min_id=min_id, max_id=max_id) for min_id, max_id in id_ranges
+        ]
+        if not jobs:
+            return self.mark_prepare_entitlement_as_done(cycle, _("Entitlement Ready."))
+        main_job = group(*jobs)
+        main_job.on_done(self.delayable().mark_prepare_entitlement_as_done(cycle, _("Entitlement Ready.")))
+        main_job.delay()
+
+    def _prepare_entitlements(self, cycle, offset=0, limit=None, do_count=False, min_id=None, max_id=None):
         """Prepare Entitlements
         Get the beneficiaries and generate their entitlements.
 
@@ -30,9 +75,21 @@ class CustomDefaultCycleManager(models.Model):
         :param offset: Optional integer value for the ORM search offset
         :param limit: Optional integer value for the ORM search limit
         :param do_count: Boolean - set to False to not run compute function
+        :param min_id: Optional integer value for the smallest cycle membership ID to process
+        :param max_id: Optional integer value for the largest cycle membership ID to process
         :return:
         """
-        super()._prepare_entitlements(cycle, offset, limit, do_count)
+        if min_id is None and max_id is None:
+            super()._prepare_entitlements(cycle, offset, limit, do_count)
+        else:
+            beneficiaries = self.env["g2p.cycle.membership"].search(
+                self._get_enrolled_beneficiaries_domain(cycle) + id_range_domain(min_id, max_id),
+                order="id",
+            )
+            ent_manager = self.program_id.get_manager(constants.MANAGER_ENTITLEMENT)
+            if not ent_manager:
+                raise UserError(_("No Entitlement Manager defined."))
+            ent_manager.prepare_entitlements(cycle, beneficiaries)
         if do_count:
             # Update Statistics
             cycle._compute_inkind_entitlements_count()
@@ -5,3 +5,4 @@ from . import test_programs
 from . import test_registrant
 from . import test_stock_rule
 from . import test_cycle
+from . import test_id_ranges
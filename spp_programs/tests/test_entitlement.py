@@ -249,3 +249,44 @@ class TestEntitlement(Common):
         self.cycle.write({"state": "approved"})
         with self.assertRaisesRegex(UserError, "No Entitlement Manager defined."):
             entitlement_id.approve_entitlement()
+
+    def _create_stock_entitlements(self):
+        product = self.env["product.product"].create(
+            {
+                "name": "Rice [TEST]",
+                "detailed_type": "product",
+                "categ_id": self.env.ref("product.product_category_all").id,
+                "uom_id": self.env.ref("uom.product_uom_unit").id,
+                "uom_po_id": self.env.ref("uom.product_uom_unit").id,
+            }
+        )
+        registrant_2 = self.env["res.partner"].create({"name": "test registrant 2", "is_registrant": True})
+        entitlements = self.entitlement | self.env["g2p.entitlement.inkind"].create(
+            {"partner_id": registrant_2.id, "cycle_id": self.cycle.id}
+        )
+        entitlements.write(
+            {
+                "product_id": product.id,
+                "uom_id": self.env.ref("uom.product_uom_unit").id,
+                "qty": 2,
+                "manage_inventory": True,
+                "warehouse_id": self.env.ref("stock.warehouse0").id,
+            }
+        )
+        return entitlements
+
+    def test_13_action_launch_stock_rule_batched(self):
+        entitlements = self._create_stock_entitlements()
+        stats = entitlements._action_launch_stock_rule_batched(batch_size=1)
+        self.assertEqual(len(stats), 2, "One batch per entitlement should be launched!")
+        self.assertEqual(sum(batch["moves"] for batch in stats), 2)
+        self.assertEqual(entitlements.move_ids.mapped("product_uom_qty"), [2.0, 2.0])
+        self.assertEqual(len(self.env["procurement.group"].search([("cycle_id", "=", self.cycle.id)])), 1)
+
+    def test_14_action_launch_stock_rule_batched_merge_moves(self):
+        entitlements = self._create_stock_entitlements()
+        stats = entitlements._action_launch_stock_rule_batched(merge_moves=True)
+        self.assertEqual(stats[0]["moves"], 1, "Moves of the same product and warehouse should be merged!")
+        moves = self.env["stock.move"].search([("group_id", "=", self.cycle.procurement_group_id.id)])
+        self.assertEqual(moves.product_uom_qty, 4.0)
+        self.assertFalse(moves.entitlement_id)
@@ -0,0 +1,43 @@
+from odoo.addons.spp_programs.tools.id_ranges import get_id_ranges, id_range_domain, split_id_ranges
+
+from .common import Common
+
+
+class TestIdRanges(Common):
+    def setUp(self):
+        super().setUp()
+        self.entitlements = self.entitlement | self.env["g2p.entitlement.inkind"].create(
+            [{"partner_id": self.registrant.id, "cycle_id": self.cycle.id} for _ in range(4)]
+        )
+
+    def test_01_get_id_ranges(self):
+        ids = sorted(self.entitlements.ids)
+        id_ranges = get_id_ranges(self.env["g2p.entitlement.inkind"], [("id", "in", ids)], 2)
+        self.assertEqual(id_ranges, [(ids[0], ids[1]), (ids[2], ids[3]), (ids[4], ids[4])])
+        self.assertEqual(get_id_ranges(self.env["g2p.entitlement.inkind"], [("id", "=", 0)], 2), [])
+        # Domains Odoo knows to be empty, searched without a query
+        self.assertEqual(get_id_ranges(self.env["g2p.entitlement.inkind"], [("state", "in", [])], 2), [])
+        self.assertEqual(get_id_ranges(self.env["g2p.entitlement.inkind"], [("id", "in", [])], 2), [])
+
+    def test_02_split_id_ranges(self):
+        self.assertEqual(split_id_ranges([9, 3, 5, 7, 1], 2), [(1, 3), (5, 7), (9, 9)])
+        self.assertEqual(split_id_ranges([], 2), [])
+
+    def test_03_id_range_domain(self):
+        self.assertEqual(id_range_domain(), [])
+        self.assertEqual(id_range_domain(1, 5), [("id", ">=", 1), ("id", "<=", 5)])
+
+    def test_04_get_entitlements_by_id_range(self):
+        id_ranges = self.cycle.get_entitlement_id_ranges(
+            ["draft"], entitlement_model="g2p.entitlement.inkind", chunk_size=2
+        )
+        self.assertEqual(len(id_ranges), 3)
+        entitlements = self.env["g2p.entitlement.inkind"]
+        for min_id, max_id in id_ranges:
+            # Earlier ranges changing state must not shift the later ones
+            batch = self.cycle.get_entitlements(
+                ["draft"], entitlement_model="g2p.entitlement.inkind", min_id=min_id, max_id=max_id
+            )
+            batch.write({"state": "pending_validation"})
+            entitlements |= batch
+        self.assertEqual(entitlements, self.entitlements)
@@ -0,0 +1 @@
+from . import id_ranges
@@ -0,0 +1,47 @@
+from odoo.tools import SQL
+
+
+def get_id_ranges(model, domain, chunk_size):
+    """Snapshot the records of ``model`` matching ``domain`` into id ranges.
+
+    Each range covers at most ``chunk_size`` of the records, so queue jobs can be given
+    explicit id bounds instead of an OFFSET that has to be skipped again, and that
+    shifts when earlier jobs change the records.
+
+    :return: list of ``(min_id, max_id)`` tuples, in id order
+    """
+    query = model._search(domain)
+    model.env.cr.execute(
+        SQL(
+            """
+            SELECT MIN(id), MAX(id)
+            FROM (
+                SELECT id, (ROW_NUMBER() OVER (ORDER BY id) - 1) / %(chunk_size)s AS chunk
+                FROM (%(query)s) AS records
+            ) AS numbered
+            GROUP BY chunk
+            ORDER BY chunk
+            """,
+            chunk_size=chunk_size,
+            # select() and not subselect(), which returns the ids themselves when the
+            # domain is known to be empty
+            query=query.select(SQL.identifier(model._table, "id")),
+        )
+    )
+    return [tuple(row) for row in model.env.cr.fetchall()]
+
+
+def split_id_ranges(ids, chunk_size):
+    """Same as :func:`get_id_ranges` for ids already known."""
+    ids = sorted(ids)
+    return [(chunk[0], chunk[-1]) for chunk in (ids[i : i + chunk_size] for i in range(0, len(ids), chunk_size))]
+
+
+def id_range_domain(min_id=None, max_id=None):
+    """Return the domain restricting a search to the given id bounds, both inclusive."""
+    domain = []
+    if min_id is not None:
+        domain.append(("id", ">=", min_id))
+    if max_id is not None:
+        domain.append(("id", "<=", max_id))
+    return domain
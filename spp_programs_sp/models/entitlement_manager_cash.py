@@ -18,6 +18,11 @@ class G2PCashEntitlementManagerCustomSP(models.Model):
 
     _inherit = "g2p.program.entitlement.manager.cash"
 
+    def _prefetch_addl_entitlement_fields(self, beneficiaries):
+        super()._prefetch_addl_entitlement_fields(beneficiaries)
+        if self.program_id.store_sp_in_entitlements:
+            beneficiaries.mapped("service_point_ids")
+
     def _get_addl_entitlement_fields(self, beneficiary_id):
         """
         Extends this function to include the service_point_ids if enabled in the program configuration.